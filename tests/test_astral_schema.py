@@ -1,34 +1,20 @@
 """
 Tests for astral schema tables and CRUD: astral_body_catalog, ephemeris_samples, ingestion_jobs, etc.
 """
-import tempfile
-import time
-from pathlib import Path
-
 import pytest
 
-from unified_semantic_archiver.db import ContinuumDb, get_connection, init_schema
+from unified_semantic_archiver.db import ContinuumDb
 
 
-@pytest.fixture
-def temp_db():
-    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
-        path = f.name
-    conn = get_connection(path)
-    init_schema(conn)
-    conn.close()
-    yield path
-    db_path = Path(path)
-    for _ in range(5):
-        try:
-            db_path.unlink(missing_ok=True)
-            break
-        except PermissionError:
-            time.sleep(0.05)
+@pytest.fixture(params=["memory", "file"])
+def temp_db(request, tmp_path):
+    db = ContinuumDb.from_memory() if request.param == "memory" else ContinuumDb(tmp_path / "continuum.db")
+    yield db
+    db.close()
 
 
 def test_astral_body_crud(temp_db):
-    db = ContinuumDb(temp_db)
+    db = temp_db
     db.astral_body_insert(
         body_id="earth",
         name="Earth",
@@ -47,7 +33,7 @@ def test_astral_body_crud(temp_db):
 
 
 def test_astral_observer_sites(temp_db):
-    db = ContinuumDb(temp_db)
+    db = temp_db
     db.astral_observer_site_insert(
         site_id="sea-tac",
         body_id="earth",
@@ -63,7 +49,7 @@ def test_astral_observer_sites(temp_db):
 
 
 def test_nasa_file_registry(temp_db):
-    db = ContinuumDb(temp_db)
+    db = temp_db
     fid = db.nasa_file_insert(
         file_type="horizons",
         local_path="/tmp/test_horizons.txt",
@@ -80,7 +66,7 @@ def test_nasa_file_registry(temp_db):
 
 
 def test_ephemeris_samples(temp_db):
-    db = ContinuumDb(temp_db)
+    db = temp_db
     db.ephemeris_sample_insert(
         body_id="earth",
         epoch_utc="2026-02-20T12:00:00",
@@ -100,7 +86,7 @@ def test_ephemeris_samples(temp_db):
 
 
 def test_occlusion_events(temp_db):
-    db = ContinuumDb(temp_db)
+    db = temp_db
     db.occlusion_event_insert(
         epoch_utc="2026-02-20T12:00:00",
         source_body_id="sun",
@@ -117,7 +103,7 @@ def test_occlusion_events(temp_db):
 
 
 def test_ingestion_job_lifecycle(temp_db):
-    db = ContinuumDb(temp_db)
+    db = temp_db
     job_id = db.ingestion_job_insert(
         job_type="horizons",
         source="/tmp/horizons.txt",
@@ -138,3 +124,164 @@ def test_ingestion_job_lifecycle(temp_db):
     job2 = db.ingestion_job_get(job_id2, "default")
     assert job2["status"] == "failed"
     assert "File not found" in (job2.get("error_text") or "")
+
+
+def test_ephemeris_sample_insert_many(temp_db):
+    db = temp_db
+    rows = [
+        ("mars", f"2026-02-2{i}T00:00:00", float(i), 0.0, 0.0, None, None, None, "J2000", None)
+        for i in range(3)
+    ]
+    assert db.ephemeris_sample_insert_many(rows, tenant_id="default") == 3
+    row = db.ephemeris_sample_get("mars", "2026-02-22T00:00:00", "default")
+    assert row is not None
+    assert row["position_x"] == 2.0
+    assert row["tenant_id"] == "default"
+
+
+def test_bulk_load_commits_and_rolls_back(temp_db):
+    db = temp_db
+    with db.bulk_load():
+        db.astral_body_insert("earth", "Earth", "planet")
+        db.astral_body_insert("mars", "Mars", "planet")
+    assert len(db.astral_body_list(tenant_id="default")) == 2
+    with pytest.raises(RuntimeError):
+        with db.bulk_load():
+            db.astral_body_insert("venus", "Venus", "planet")
+            raise RuntimeError("abort")
+    assert db.astral_body_get("venus", "default") is None
+
+
+def test_bulk_load_is_private_to_its_thread(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+
+    db = ContinuumDb(tmp_path / "continuum.db")
+    try:
+        with db.bulk_load(), ThreadPoolExecutor(max_workers=1) as pool:
+            db.astral_body_insert("earth", "Earth", "planet")
+            # Another thread reads through the pool and doesn't see the uncommitted row.
+            assert pool.submit(db.astral_body_list).result() == []
+        assert [b["body_id"] for b in db.astral_body_list()] == ["earth"]
+    finally:
+        db.close()
+
+
+def test_nested_bulk_mode_leaves_checkpoint_to_outer_transaction(tmp_path):
+    import time
+
+    db = ContinuumDb(tmp_path / "continuum.db")
+    try:
+        start = time.monotonic()
+        with db.bulk_load():
+            with db.bulk_mode():
+                db.astral_body_insert("earth", "Earth", "planet")
+            db.astral_body_insert("mars", "Mars", "planet")
+        # A nested checkpoint would wait out the busy timeout on the outer write lock.
+        assert time.monotonic() - start < 2.0
+        assert len(db.astral_body_list()) == 2
+    finally:
+        db.close()
+
+
+def test_file_db_pools_connections_across_threads(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+
+    db = ContinuumDb(tmp_path / "continuum.db", max_pool=2)
+    try:
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            list(pool.map(lambda i: db.astral_body_insert(f"b{i}", f"Body {i}", "moon"), range(20)))
+        assert len(db.astral_body_list(tenant_id="default")) == 20
+        assert db._pool._opened <= 2
+    finally:
+        db.close()
+
+
+def test_ephemeris_near_epoch_shapes(temp_db):
+    np = pytest.importorskip("numpy")
+    db = temp_db
+    db.ephemeris_sample_insert_many(
+        [
+            ("earth", f"2026-02-{d:02d}T00:00:00", float(d), 0.0, 0.0, None, None, None, "J2000", None)
+            for d in range(1, 11)
+        ]
+    )
+    near = db.ephemeris_sample_list_near_epoch("earth", "2026-02-05T06:00:00", limit=3)
+    assert sorted(r["epoch_utc"][:10] for r in near) == ["2026-02-04", "2026-02-05", "2026-02-06"]
+    rows = db.ephemeris_sample_list_near_epoch("earth", "2026-02-05T06:00:00", limit=3, as_rows=True)
+    assert [r["epoch_utc"] for r in rows] == [r["epoch_utc"] for r in near]
+    arrays = db.ephemeris_sample_list_near_epoch("earth", "2026-02-05T06:00:00", limit=3, as_arrays=True)
+    assert arrays["position_x"].dtype == np.float64
+    assert arrays["position_x"].tolist() == [r["position_x"] for r in near]
+    assert np.isnan(arrays["velocity_x"]).all()
+
+
+def test_ingestion_job_list_pages_by_before_id(temp_db):
+    db = temp_db
+    ids = [db.ingestion_job_insert(job_type="horizons", source=f"/tmp/{i}.txt") for i in range(5)]
+    page, next_before = db.list_page("ingestion_job_list", limit=2, job_type="horizons")
+    assert [r["id"] for r in page] == ids[:-3:-1]
+    page, next_before = db.list_page("ingestion_job_list", limit=2, before_id=next_before, job_type="horizons")
+    assert [r["id"] for r in page] == ids[2:0:-1]
+    page, next_before = db.list_page("ingestion_job_list", limit=2, before_id=next_before, job_type="horizons")
+    assert [r["id"] for r in page] == ids[:1] and next_before is None
+    with pytest.raises(ValueError):
+        db.list_page("astral_body_list")
+
+
+def test_async_db_runs_calls_concurrently(tmp_path):
+    import asyncio
+
+    from unified_semantic_archiver.db import AsyncContinuumDb
+
+    async def run():
+        async with AsyncContinuumDb.open(tmp_path / "continuum.db", max_pool=4) as adb:
+            await asyncio.gather(*(adb.astral_body_insert(f"b{i}", f"Body {i}", "moon") for i in range(12)))
+            bodies, body = await asyncio.gather(adb.astral_body_list(tenant_id="default"), adb.astral_body_get("b3"))
+            return bodies, body
+
+    bodies, body = asyncio.run(run())
+    assert len(bodies) == 12
+    assert body["name"] == "Body 3"
+    with pytest.raises(ValueError):
+        AsyncContinuumDb(ContinuumDb.from_memory())
+
+
+def test_meta_get_many_and_row_getters(temp_db):
+    db = temp_db
+    db.meta_set("engine.version", "2")
+    db.meta_set("engine.mode", "fast")
+    got = db.meta_get_many(["engine.version", "engine.mode", "missing"])
+    assert got == {"engine.version": "2", "engine.mode": "fast"}
+    assert db.meta_get_many([]) == {}
+    job_id = db.ingestion_job_insert(job_type="horizons", source="/tmp/x.txt")
+    row = db.ingestion_job_get(job_id, as_row=True)
+    assert row["status"] == row[3] == "pending"
+    assert db.ingestion_job_get(job_id + 1, as_row=True) is None
+
+
+def test_get_many_chunks_large_key_lists(temp_db):
+    db = temp_db
+    with db.bulk_load():
+        for i in range(1200):
+            db.astral_body_insert(f"b{i}", f"Body {i}", "moon")
+    wanted = [f"b{i}" for i in range(1200)] + ["b5", "missing"]
+    bodies = db.astral_body_get_many(wanted)
+    assert len(bodies) == 1200
+    assert bodies["b1100"]["name"] == "Body 1100"
+    assert db.astral_body_get_many(["b1"], tenant_id="team-b") == {}
+
+
+def test_shared_db_reuses_and_closes_evicted(tmp_path, monkeypatch):
+    from unified_semantic_archiver.db import close_shared_dbs, continuum_db, shared_db
+
+    monkeypatch.setattr(continuum_db, "_SHARED_DB_SIZE", 2)
+    try:
+        first = shared_db(tmp_path / "a.db")
+        first.astral_body_insert("earth", "Earth", "planet")
+        assert shared_db(tmp_path / "sub" / ".." / "a.db") is first
+        assert shared_db(tmp_path / "a.db", read_only=True) is not first
+        shared_db(tmp_path / "b.db")
+        assert first._pool._opened == 0
+        assert shared_db(tmp_path / "a.db") is not first
+    finally:
+        close_shared_dbs()
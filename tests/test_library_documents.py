@@ -1,34 +1,20 @@
 """
 Smoke tests for USC library_document_* API (insert and search with tenant_id).
 """
-import tempfile
-import time
-from pathlib import Path
-
 import pytest
 
-from unified_semantic_archiver.db import ContinuumDb, get_connection, init_schema
+from unified_semantic_archiver.db import ContinuumDb
 
 
-@pytest.fixture
-def temp_db():
-    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
-        path = f.name
-    conn = get_connection(path)
-    init_schema(conn)
-    conn.close()
-    yield path
-    db_path = Path(path)
-    for _ in range(5):
-        try:
-            db_path.unlink(missing_ok=True)
-            break
-        except PermissionError:
-            time.sleep(0.05)
+@pytest.fixture(params=["memory", "file"])
+def temp_db(request, tmp_path):
+    db = ContinuumDb.from_memory() if request.param == "memory" else ContinuumDb(tmp_path / "continuum.db")
+    yield db
+    db.close()
 
 
 def test_library_document_insert_and_search(temp_db):
-    db = ContinuumDb(temp_db)
+    db = temp_db
     doc_id = db.library_document_insert(
         document_type="document",
         type_metadata={"title": "Test"},
@@ -46,10 +32,116 @@ def test_library_document_insert_and_search(temp_db):
 
 
 def test_library_document_get_scoped_by_tenant(temp_db):
-    db = ContinuumDb(temp_db)
+    db = temp_db
     doc_id = db.library_document_insert(
         document_type="video",
         tenant_id="team-a",
     )
     assert db.library_document_get(doc_id, tenant_id="team-a") is not None
     assert db.library_document_get(doc_id, tenant_id="team-b") is None
+
+
+def test_library_document_search_by_distance(temp_db):
+    db = temp_db
+    # Seattle, Portland (~145 mi away), and a point across the antimeridian from Fiji.
+    seattle = db.library_document_insert(document_type="document", lat=47.6062, lon=-122.3321)
+    portland = db.library_document_insert(document_type="document", lat=45.5152, lon=-122.6784)
+    db.library_document_insert(document_type="document", lat=-17.7, lon=-179.9)
+    fiji = db.library_document_insert(document_type="document", lat=-17.7, lon=179.9)
+
+    near = db.library_document_search(lat=47.6, lon=-122.3, distance_mi=50)
+    assert [r["id"] for r in near] == [seattle]
+    both = db.library_document_search(lat=47.6, lon=-122.3, distance_mi=200)
+    assert [r["id"] for r in both] == [portland, seattle]
+    wrapped = db.library_document_search(lat=-17.7, lon=179.95, distance_mi=20)
+    assert len(wrapped) == 2 and wrapped[0]["id"] == fiji
+    bucket = db.library_document_search(lat=47.6062, lon=-122.3321, distance_mi=0)
+    assert [r["id"] for r in bucket] == [seattle]
+
+
+def test_haversine_mi_vec_matches_scalar():
+    np = pytest.importorskip("numpy")
+    from unified_semantic_archiver.db._geo_kernels import haversine_mi_vec
+    from unified_semantic_archiver.db.continuum_db import _haversine_mi
+
+    lats = np.array([47.6062, 45.5152, -17.7, 0.0])
+    lons = np.array([-122.3321, -122.6784, 179.9, 0.0])
+    got = haversine_mi_vec(47.6, -122.3, lats, lons)
+    want = [_haversine_mi(47.6, -122.3, a, b) for a, b in zip(lats, lons)]
+    assert got == pytest.approx(want, rel=1e-12)
+
+
+def test_library_document_search_by_meta_name(temp_db):
+    db = temp_db
+    atlas = db.library_document_insert(document_type="document", type_metadata={"name": "Atlas"})
+    db.library_document_insert(document_type="document", type_metadata="plain text, not JSON")
+    db.library_document_insert(document_type="document", type_metadata={"name": "Atlas"}, tenant_id="team-b")
+    rows = db.library_document_search(meta_name="Atlas")
+    assert [r["id"] for r in rows] == [atlas]
+
+
+def test_library_document_search_by_q_substring(temp_db):
+    db = temp_db
+    mars = db.library_document_insert(document_type="document", type_metadata={"name": "Atlas of Mars"})
+    rover = db.library_document_insert(document_type="document", url="https://example.org/MarsRover.pdf")
+    db.library_document_insert(document_type="document", type_metadata={"name": "Venus"})
+    assert [r["id"] for r in db.library_document_search(q="mars")] == [rover, mars]
+    assert [r["id"] for r in db.library_document_search(q="sRov")] == [rover]
+    assert [r["id"] for r in db.library_document_search(q="ma")] == [rover, mars]
+
+
+def test_library_document_insert_many_matches_single_insert(temp_db):
+    db = temp_db
+    points = [(47.6062, -122.3321), (-17.7, 179.9), (89.9, -180.0), (None, None)]
+    single = [db.library_document_insert(document_type="document", lat=a, lon=b) for a, b in points]
+    n = db.library_document_insert_many(
+        [("document", None, None, {"name": "bulk"}, None, a, b, None) for a, b in points]
+    )
+    assert n == len(points)
+    rows = {r["id"]: r for r in db.library_document_list(limit=10)}
+    assert [rows[i]["geohash"] for i in single] == [rows[i + len(points)]["geohash"] for i in single]
+    assert rows[single[0] + len(points)]["type_metadata"] == '{"name": "bulk"}'
+
+
+def test_document_blob_insert_many(temp_db):
+    db = temp_db
+    first = db.document_blob_insert("abc", "/in/a.txt")
+    n = db.document_blob_insert_many([("abc", "/in/b.txt", None), ("abc", "/in/c.bin", "application/octet-stream")])
+    assert n == 2
+    rows = db.document_blob_list(limit=10)
+    assert [r["path"] for r in rows if r["id"] > first] == ["/in/c.bin", "/in/b.txt"]
+
+
+def test_failed_fts_setup_rolls_back_and_leaves_schema_unstamped(monkeypatch):
+    import sqlite3
+
+    from unified_semantic_archiver.db import continuum_db
+
+    if not continuum_db._fts5_trigram_available():
+        pytest.skip("SQLite build lacks FTS5 trigram")
+    monkeypatch.setattr(continuum_db, "_FTS_SCHEMA_SQL", continuum_db._FTS_SCHEMA_SQL + "\nSELECT no_such_fn();")
+    conn = sqlite3.connect(":memory:")
+    continuum_db.init_schema(conn)
+    assert not continuum_db._has_fts(conn)
+    assert conn.execute("SELECT count(*) FROM sqlite_master WHERE name LIKE 'trg_libdoc_fts_%'").fetchone()[0] == 0
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == 0
+    conn.close()
+
+
+def test_schema_stamped_without_fts_is_upgraded_once_fts_is_available(monkeypatch):
+    import sqlite3
+
+    from unified_semantic_archiver.db import continuum_db
+
+    if not continuum_db._fts5_trigram_available():
+        pytest.skip("SQLite build lacks FTS5 trigram")
+    conn = sqlite3.connect(":memory:")
+    monkeypatch.setattr(continuum_db, "_fts5_trigram_available", lambda: False)
+    continuum_db.init_schema(conn)
+    assert not continuum_db._has_fts(conn)
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == continuum_db._SCHEMA_VERSION_NO_FTS
+    monkeypatch.undo()
+    continuum_db.init_schema(conn)
+    assert continuum_db._has_fts(conn)
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == continuum_db._SCHEMA_VERSION
+    conn.close()
@@ -1,13 +1,9 @@
 """
 Tests for NASA flat-file ingestion.
 """
-import tempfile
-import time
-from pathlib import Path
-
 import pytest
 
-from unified_semantic_archiver.db import ContinuumDb, get_connection, init_schema
+from unified_semantic_archiver.db import ContinuumDb
 from unified_semantic_archiver.etl import NasaIngestionRunner
 from unified_semantic_archiver.etl.nasa_ingestion import _parse_horizons_vectors
 
@@ -26,21 +22,11 @@ $$EOE
 """
 
 
-@pytest.fixture
-def temp_db():
-    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
-        path = f.name
-    conn = get_connection(path)
-    init_schema(conn)
-    conn.close()
-    yield path
-    db_path = Path(path)
-    for _ in range(5):
-        try:
-            db_path.unlink(missing_ok=True)
-            break
-        except PermissionError:
-            time.sleep(0.05)
+@pytest.fixture(params=["memory", "file"])
+def temp_db(request, tmp_path):
+    db = ContinuumDb.from_memory() if request.param == "memory" else ContinuumDb(tmp_path / "continuum.db")
+    yield db
+    db.close()
 
 
 @pytest.fixture
@@ -53,14 +39,25 @@ def horizons_file(tmp_path):
 def test_parse_horizons_vectors(horizons_file):
     samples = _parse_horizons_vectors(horizons_file, "earth")
     assert len(samples) == 2
-    assert samples[0]["body_id"] == "earth"
-    assert "position_x" in samples[0]
-    assert abs(samples[0]["position_x"] - (-0.2648865568995978)) < 1e-6
-    assert samples[0]["epoch_utc"].startswith("2000")
+    assert samples.body_id == "earth"
+    assert len(samples.vectors) == 12
+    assert abs(samples.column(0)[0] - (-0.2648865568995978)) < 1e-6
+    assert samples.column(5)[1] == pytest.approx(6.513800428141696e-07)
+    assert samples.epochs == ["2000-01-01T12:00:00", "2000-01-02T12:00:00"]
+
+
+def test_parse_horizons_vectors_fast_path_matches(horizons_file):
+    pytest.importorskip("numba")
+    from unified_semantic_archiver.etl import _horizons_fast
+
+    epochs, vecs = _horizons_fast.parse_horizons_vectors(horizons_file)
+    ref = _parse_horizons_vectors(horizons_file, "earth")
+    assert epochs == ref.epochs
+    assert vecs.ravel().tolist() == pytest.approx(ref.vectors.tolist(), rel=1e-15)
 
 
 def test_nasa_ingestion_register_and_validate(temp_db, horizons_file):
-    db = ContinuumDb(temp_db)
+    db = temp_db
     runner = NasaIngestionRunner(db, "default")
     fid = runner.register_file("horizons", horizons_file)
     assert fid >= 1
@@ -71,7 +68,7 @@ def test_nasa_ingestion_register_and_validate(temp_db, horizons_file):
 
 
 def test_nasa_ingestion_run_job(temp_db, horizons_file):
-    db = ContinuumDb(temp_db)
+    db = temp_db
     runner = NasaIngestionRunner(db, "default")
     job_id = db.ingestion_job_insert(
         job_type="horizons",
@@ -84,3 +81,29 @@ def test_nasa_ingestion_run_job(temp_db, horizons_file):
     assert result.samples_inserted == 2
     row = db.ephemeris_sample_get("earth", "2000-01-01T12:00:00", "default")
     assert row is not None
+
+
+def test_compute_occlusion_events(temp_db):
+    pytest.importorskip("numpy")
+    db = temp_db
+    db.astral_body_insert("sun", "Sun", "star", radius_m=6.957e8)
+    db.astral_body_insert("moon", "Moon", "moon", radius_m=1.7374e6)
+    au = 149_597_870_700.0
+    # Moon on the Earth-Sun line at epoch 1 (total), well off it at epoch 2 (no event).
+    db.ephemeris_sample_insert_many(
+        [
+            ("sun", "2000-01-01T00:00:00", 1.0, 0, 0, None, None, None, "J2000", None),
+            ("earth", "2000-01-01T00:00:00", 0, 0, 0, None, None, None, "J2000", None),
+            ("moon", "2000-01-01T00:00:00", 3.6e8 / au, 0, 0, None, None, None, "J2000", None),
+            ("sun", "2000-01-02T00:00:00", 1.0, 0, 0, None, None, None, "J2000", None),
+            ("earth", "2000-01-02T00:00:00", 0, 0, 0, None, None, None, "J2000", None),
+            ("moon", "2000-01-02T00:00:00", 0, 3.6e8 / au, 0, None, None, None, "J2000", None),
+        ]
+    )
+    runner = NasaIngestionRunner(db, "default")
+    assert runner.compute_occlusion_events("sun", "earth", "moon") == 1
+    rows = db.occlusion_event_list(target_body_id="earth", tenant_id="default")
+    assert len(rows) == 1
+    assert rows[0]["epoch_utc"] == "2000-01-01T00:00:00"
+    assert rows[0]["eclipse_type"] == "total"
+    assert rows[0]["occlusion_ratio"] == 1.0
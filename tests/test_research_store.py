@@ -0,0 +1,301 @@
+"""
+Tests for the research unique-chunk / unique-kernel stores.
+"""
+import pytest
+
+from unified_semantic_archiver.db import ContinuumDb
+from unified_semantic_archiver.research import (
+    UniqueKernelInserter,
+    add_unique_chunk,
+    get_kernels_for_research,
+    get_pending_kernels,
+    iter_kernels_for_research,
+    iter_pending_kernels,
+    promote_to_research,
+    record_kernel,
+)
+
+
+@pytest.fixture(params=["memory", "file"])
+def temp_db(request, tmp_path):
+    db = ContinuumDb.from_memory() if request.param == "memory" else ContinuumDb(tmp_path / "continuum.db")
+    yield db
+    db.close()
+
+
+def test_unique_kernel_inserter_batches_and_flushes(temp_db):
+    db = temp_db
+    chunk_ids = [db.semantic_chunk_insert("video", f"clip{i}.mp4") for i in range(4)]
+    assert add_unique_chunk(db, chunk_ids[0], "video") >= 1
+    with UniqueKernelInserter(db, batch_size=3) as inserter:
+        for chunk_id in chunk_ids:
+            assert add_unique_chunk(db, chunk_id, "video", inserter=inserter) is None
+        # The first three went out when the batch filled; the fourth is still buffered.
+        assert len(get_pending_kernels(db)) == 3
+        record_kernel(db, chunk_ids[0], "data", 0.9, inserter=inserter)
+    assert len(get_pending_kernels(db)) == 4
+    flagged = get_kernels_for_research(db)
+    assert [(k["source_compressor"], k["residual_metric"]) for k in flagged] == [("data", 0.9)]
+    assert inserter.flush() == 0
+
+
+def test_unique_kernel_insert_upserts_per_chunk_and_compressor(temp_db):
+    db = temp_db
+    first = record_kernel(db, 1, "video", 0.8, status="pending")
+    assert record_kernel(db, 1, "video", 0.9, status="pending") == first
+    assert record_kernel(db, 1, "video", 0.5) == first
+    # A flagged kernel stays flagged when a compressor re-reports it as pending.
+    assert add_unique_chunk(db, 1, "video", residual_metric=0.7) == first
+    assert record_kernel(db, 1, "audio", 0.6) != first
+    assert db.unique_kernel_insert_many([(1, "video", None, 0, "pending"), (2, "video", 0.4, 0, "pending")]) == 2
+    (kernel,) = [k for k in db.unique_kernel_list(limit=10) if k["id"] == first]
+    assert (kernel["attempt_count"], kernel["residual_metric"], kernel["status"]) == (4, 0.5, "flagged_research")
+    assert len(db.unique_kernel_list(limit=10)) == 3
+
+
+def test_opening_old_file_merges_duplicate_kernels(tmp_path):
+    import sqlite3
+
+    db_path = tmp_path / "old.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        """CREATE TABLE unique_kernels (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, chunk_id INTEGER, source_compressor TEXT NOT NULL,
+            residual_metric REAL, attempt_count INTEGER DEFAULT 0, status TEXT NOT NULL DEFAULT 'pending',
+            created_at TEXT DEFAULT (datetime('now')))"""
+    )
+    conn.executemany(
+        "INSERT INTO unique_kernels (chunk_id, source_compressor, residual_metric, attempt_count, status)"
+        " VALUES (?, ?, ?, ?, ?)",
+        [(1, "video", 0.8, 0, "pending"), (1, "video", 0.6, 3, "flagged_research"),
+         (1, "video", None, 1, "compressed"), (2, "video", 0.4, 2, "compressed")],
+    )
+    conn.commit()
+    conn.close()
+    with ContinuumDb(db_path) as db:
+        kernels = sorted(db.unique_kernel_list(limit=10), key=lambda k: k["id"])
+        assert [(k["id"], k["attempt_count"], k["residual_metric"], k["status"]) for k in kernels] == [
+            (1, 4, 0.6, "flagged_research"),
+            (4, 2, 0.4, "compressed"),
+        ]
+        assert record_kernel(db, 1, "video", 0.5) == 1
+
+
+def test_invoke_cursor_workflow_streams_context(tmp_path):
+    import json
+    import os
+
+    from unified_semantic_archiver.services import build_context, invoke_cursor_workflow
+
+    db_path = tmp_path / "continuum.db"
+    with ContinuumDb(db_path) as db:
+        chunk_id = db.semantic_chunk_insert("video", "clip.mp4")
+        record_kernel(db, chunk_id, "video", 0.8)
+        record_kernel(db, chunk_id + 1, "video", 0.7)
+        db.compression_run_insert("grid")
+    result = invoke_cursor_workflow(db_path)
+    assert result["kernel_count"] == 2
+    written = json.loads((tmp_path / "cursor_research_context.json").read_text(encoding="utf-8"))
+    assert written == build_context(db_path)
+    assert [c["chunk"]["chunk_key"] for c in written["chunks_with_kernels"]] == ["clip.mp4"]
+    # Same permissions a direct write would get, not the temp file's 0600.
+    umask = os.umask(0)
+    os.umask(umask)
+    for name in ("cursor_research_context.json", "cursor_research_context.json.digest"):
+        assert (tmp_path / name).stat().st_mode & 0o777 == 0o666 & ~umask
+
+
+def test_iter_pending_kernels_pages_by_id(temp_db):
+    db = temp_db
+    with UniqueKernelInserter(db) as inserter:
+        for chunk_id in range(1, 8):
+            add_unique_chunk(db, chunk_id, "video", inserter=inserter)
+    pages = iter_pending_kernels(db, chunk_size=3)
+    first = next(pages)
+    assert [k["chunk_id"] for k in first] == [7, 6, 5]
+    # Moving a later row out of "pending" mid-walk doesn't make the walk skip or repeat anything.
+    db.unique_kernel_update_status(first[-1]["id"] - 1, "compressed")
+    assert [[k["chunk_id"] for k in page] for page in pages] == [[3, 2, 1]]
+    assert list(iter_kernels_for_research(db)) == []
+
+
+def test_invoke_cursor_workflow_reuses_context_until_db_changes(tmp_path):
+    from unified_semantic_archiver.services import invoke_cursor_workflow
+    from unified_semantic_archiver.services.cursor_call_service import _clear_context_cache
+
+    db_path = tmp_path / "continuum.db"
+    steps = []
+
+    def run():
+        steps.clear()
+        result = invoke_cursor_workflow(db_path, progress_callback=lambda step, _v, _m: steps.append(step))
+        return result["kernel_count"], steps[0]
+
+    assert run() == (0, "build")
+    assert run() == (0, "cache")
+    with ContinuumDb(db_path) as db:
+        record_kernel(db, 1, "video", 0.8)
+    assert run() == (1, "build")
+    (tmp_path / "cursor_research_context.json").unlink()
+    assert run() == (1, "build")
+    # A fresh process has no in-memory entry but finds the digest sidecar; pending kernels aren't
+    # part of the context.
+    _clear_context_cache()
+    with ContinuumDb(db_path) as db:
+        record_kernel(db, 2, "video", 0.5, status="pending")
+    assert run() == (1, "cache")
+    with ContinuumDb(db_path) as db:
+        record_kernel(db, 1, "video", 0.4)
+    _clear_context_cache()
+    assert run() == (1, "build")
+
+
+def test_persist_suggestions_batch(tmp_path):
+    from unified_semantic_archiver.services import persist_suggestion, persist_suggestions
+
+    db_path = tmp_path / "continuum.db"
+    first = persist_suggestion(db_path, "cursor", "Try a wider grid")
+    n = persist_suggestions(db_path, [("cursor", "Cache residuals", None), ("manual", "Tune hop size", '{"k": 1}')])
+    assert n == 2
+    with ContinuumDb(db_path) as db:
+        rows = db.research_suggestion_list()
+    assert [(r["source"], r["recommendation_text"], r["context_json"], r["status"]) for r in rows] == [
+        ("manual", "Tune hop size", '{"k": 1}', "pending"),
+        ("cursor", "Cache residuals", None, "pending"),
+        ("cursor", "Try a wider grid", None, "pending"),
+    ]
+    assert rows[-1]["id"] == first
+    # Re-issued suggestions (same source and text) are not stored again.
+    assert persist_suggestion(db_path, "cursor", "Try a wider grid", '{"run": 2}') == first
+    assert persist_suggestions(db_path, [("cursor", "Cache residuals", None), ("cursor", "Tune hop size", None)]) == 1
+    with ContinuumDb(db_path) as db:
+        assert len(db.research_suggestion_list()) == 4
+
+
+def test_invoke_cursor_workflow_pipes_context_to_command(tmp_path):
+    import sys
+
+    from unified_semantic_archiver.services import invoke_cursor_workflow
+
+    db_path = tmp_path / "continuum.db"
+    piped = tmp_path / "piped.json"
+    copy_stdin = f"import shutil, sys; shutil.copyfileobj(sys.stdin.buffer, open({str(piped)!r}, 'wb'))"
+    for _ in range(2):  # built, then served from the context cache
+        piped.unlink(missing_ok=True)
+        result = invoke_cursor_workflow(db_path, cursor_command=[sys.executable, "-c", copy_stdin])
+        assert result["cursor_returncode"] == 0
+        assert piped.read_bytes() == (tmp_path / "cursor_research_context.json").read_bytes()
+    assert invoke_cursor_workflow(db_path)["cursor_returncode"] is None
+
+
+def test_invoke_cursor_workflow_times_out_command_that_ignores_stdin(tmp_path, monkeypatch):
+    import sys
+
+    from unified_semantic_archiver.services import cursor_call_service, invoke_cursor_workflow
+
+    db_path = tmp_path / "continuum.db"
+    with ContinuumDb(db_path) as db:
+        for i in range(20):
+            chunk_id = db.semantic_chunk_insert("video", f"clip{i}.mp4", description_text="x" * 8192)
+            record_kernel(db, chunk_id, "video", 0.8)
+    monkeypatch.setattr(cursor_call_service, "_CURSOR_TIMEOUT_S", 0.5)
+    # Context well past a pipe buffer, and a command that never reads it: the write must not hang.
+    result = invoke_cursor_workflow(db_path, cursor_command=[sys.executable, "-c", "import time; time.sleep(30)"])
+    assert result["cursor_returncode"] != 0
+    assert (tmp_path / "cursor_research_context.json").stat().st_size > 1 << 17
+
+
+def test_read_only_continuum_db_rejects_writes(tmp_path):
+    import sqlite3
+
+    db_path = tmp_path / "continuum.db"
+    with ContinuumDb(db_path) as db:
+        record_kernel(db, 1, "video", 0.8)
+    with ContinuumDb(db_path, read_only=True) as db:
+        assert len(get_kernels_for_research(db)) == 1
+        with pytest.raises(sqlite3.OperationalError):
+            record_kernel(db, 2, "video", 0.9)
+
+
+def test_invoke_cursor_workflow_async_matches_sync(tmp_path):
+    from unified_semantic_archiver.services import invoke_cursor_workflow_async
+
+    db_path = tmp_path / "continuum.db"
+    with ContinuumDb(db_path) as db:
+        record_kernel(db, 1, "video", 0.8)
+    futures = [invoke_cursor_workflow_async(db_path, context_output_path=tmp_path / f"ctx{i}.json") for i in range(3)]
+    assert [f.result(timeout=30)["kernel_count"] for f in futures] == [1, 1, 1]
+
+
+def test_invoke_cursor_workflow_compressed_context(tmp_path, monkeypatch):
+    zstandard = pytest.importorskip("zstandard")
+    import json
+
+    from unified_semantic_archiver.services import build_context, invoke_cursor_workflow
+
+    monkeypatch.setenv("USC_CURSOR_CONTEXT_COMPRESS", "1")
+    db_path = tmp_path / "continuum.db"
+    with ContinuumDb(db_path) as db:
+        record_kernel(db, 1, "video", 0.8)
+    result = invoke_cursor_workflow(db_path)
+    assert result["context_path"].endswith("cursor_research_context.json.zst")
+    with open(result["context_path"], "rb") as f:
+        written = json.loads(zstandard.ZstdDecompressor().stream_reader(f).read())
+    assert written == build_context(db_path)
+
+
+def test_promote_to_research_updates_in_chunks(temp_db, monkeypatch):
+    from unified_semantic_archiver.db import continuum_db
+
+    db = temp_db
+    monkeypatch.setattr(continuum_db, "_IN_CHUNK", 2)
+    ids = [add_unique_chunk(db, chunk_id, "video") for chunk_id in range(1, 6)]
+    assert promote_to_research(db, [ids[0], ids[2], ids[3], ids[4], ids[0]]) == 4
+    assert [k["id"] for k in get_pending_kernels(db)] == [ids[1]]
+    assert [k["id"] for k in get_kernels_for_research(db)] == [ids[4], ids[3], ids[2], ids[0]]
+    assert all(k["attempt_count"] == 0 for k in get_kernels_for_research(db))
+    assert promote_to_research(db, []) == 0
+
+
+def test_invoke_cursor_workflow_recreates_removed_output_dir(tmp_path):
+    import shutil
+
+    from unified_semantic_archiver.services import invoke_cursor_workflow
+
+    out = tmp_path / "ctx" / "context.json"
+    assert invoke_cursor_workflow(tmp_path / "continuum.db", context_output_path=out)["context_path"] == str(out)
+    shutil.rmtree(out.parent)
+    invoke_cursor_workflow(tmp_path / "continuum.db", context_output_path=out)
+    assert out.exists() and out.with_name("context.json.digest").exists()
+
+
+def test_invoke_cursor_workflow_zst_path_without_flag_is_plain_json(tmp_path, monkeypatch):
+    import json
+
+    from unified_semantic_archiver.services import build_context, invoke_cursor_workflow
+
+    monkeypatch.delenv("USC_CURSOR_CONTEXT_COMPRESS", raising=False)
+    db_path = tmp_path / "continuum.db"
+    out = tmp_path / "context.json.zst"
+    assert invoke_cursor_workflow(db_path, context_output_path=out)["context_path"] == str(out)
+    assert json.loads(out.read_bytes()) == build_context(db_path)
+
+
+def test_context_digest_tracks_emitted_rows(temp_db):
+    from unified_semantic_archiver.research.improvement_feed import improvement_context_digest
+
+    db = temp_db
+    a = db.semantic_chunk_insert("video", "a.mp4", description_text="old")
+    b = db.semantic_chunk_insert("video", "b.mp4")
+    ka = record_kernel(db, a, "video", 0.5)
+    kb = record_kernel(db, b, "video", 0.5, status="pending")
+    before = improvement_context_digest(db)
+    # Same count, newest id and totals, but a different kernel is flagged.
+    db.unique_kernel_set_status([ka], "pending")
+    db.unique_kernel_set_status([kb], "flagged_research")
+    swapped = improvement_context_digest(db)
+    assert swapped != before
+    with db._conn() as c:
+        c.execute("UPDATE semantic_chunks SET description_text = 'new' WHERE id = ?", (b,))
+        c.commit()
+    assert improvement_context_digest(db) != swapped
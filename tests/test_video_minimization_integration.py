@@ -3,7 +3,13 @@ import sys
 import types
 from pathlib import Path
 
-from unified_semantic_archiver.compressors.video_compressor import video_compress
+from unified_semantic_archiver.compressors import video_compressor
+from unified_semantic_archiver.compressors.video_compressor import (
+    _keyframe_intervals,
+    batch_video_compress,
+    image_compress,
+    video_compress,
+)
 from unified_semantic_archiver.media import UscMediaService
 
 
@@ -116,3 +122,110 @@ def test_media_service_attaches_minimization_metadata(tmp_path: Path):
     assert "minimization" in manifest
     assert manifest["minimization"]["enabled"] is True
     assert len(manifest["minimization"]["unique_chunk_refs"]) > 0
+
+
+def test_batch_video_compress_runs_each_video(tmp_path: Path):
+    _install_fake_video_storage_tool(tmp_path)
+    videos = []
+    for name in ("a.mp4", "b.mp4", "c.mp4"):
+        v = tmp_path / name
+        v.write_bytes(b"in")
+        videos.append(v)
+    results = batch_video_compress(videos, tmp_path / "out", config={"minimization": {"enabled": False}})
+    assert [Path(r["script_path"]).parent.name for r in results] == ["a", "b", "c"]
+    assert all(Path(r["diff_path"]).exists() for r in results)
+
+
+def test_batch_video_compress_stores_all_rows(tmp_path: Path):
+    _install_fake_video_storage_tool(tmp_path)
+    from unified_semantic_archiver.db import ContinuumDb
+
+    db = ContinuumDb(tmp_path / "continuum.db")
+    videos = []
+    for name in ("a.mp4", "b.mp4"):
+        v = tmp_path / name
+        v.write_bytes(b"in")
+        videos.append(v)
+    results = batch_video_compress(
+        videos, tmp_path / "out", db=db, config={"minimization": {"enabled": True, "threshold": 0.2}}
+    )
+    chunks = db.semantic_chunk_list(media_type="video")
+    assert sorted(c["chunk_key"] for c in chunks) == ["a.mp4", "b.mp4"]
+    # One pending kernel per chunk that has unique refs (see _store_to_db), however many refs it has.
+    kernels = db.unique_kernel_list(status="pending", limit=1000)
+    assert len(kernels) == sum(bool(r["unique_chunk_refs"]) for r in results)
+    assert all(k["attempt_count"] == 0 for k in kernels)
+
+
+def test_image_compress_skips_audio(tmp_path: Path):
+    _install_fake_video_storage_tool(tmp_path)
+    image = tmp_path / "photo.png"
+    image.write_bytes(b"png")
+    result = image_compress(image, tmp_path / "out", config={"minimization": {"enabled": False}})
+    assert not (tmp_path / "out" / "audio.aac").exists()
+    assert Path(result["script_path"]).exists()
+    assert result["diff_path"] is not None
+
+
+def test_video_compress_redoes_step_without_done_marker(tmp_path: Path):
+    _install_fake_video_storage_tool(tmp_path)
+    video = tmp_path / "input.mp4"
+    video.write_bytes(b"in")
+    out = tmp_path / "out"
+    out.mkdir()
+    (out / "resultant.mp4").write_bytes(b"partial")
+    video_compress(video, out, config={"minimization": {"enabled": False}})
+    assert (out / "resultant.mp4").read_bytes() == b"video"
+    assert (out / "resultant.mp4.done").exists()
+
+
+def test_t2v_cache_is_opt_in_and_uses_configured_dir(tmp_path: Path):
+    _install_fake_video_storage_tool(tmp_path)
+    video = tmp_path / "input.mp4"
+    video.write_bytes(b"in")
+    video_compress(video, tmp_path / "plain", config={"minimization": {"enabled": False}})
+    assert not (tmp_path / ".t2v_cache").exists()
+    cache = tmp_path / "cache" / "t2v"
+    pipeline = {"reuse_t2v": True, "t2v_cache_dir": str(cache)}
+    video_compress(video, tmp_path / "a", config={"minimization": {"enabled": False}, "pipeline": pipeline})
+    (cached,) = cache.iterdir()
+    # Same script and t2v settings: the second run links the cached resultant instead of generating.
+    video_compress(video, tmp_path / "b", config={"minimization": {"enabled": False}, "pipeline": pipeline})
+    assert (tmp_path / "b" / "resultant.mp4").samefile(cached)
+    video_compressor._trim_cache(cache, 0)
+    assert list(cache.iterdir()) == []
+
+
+def test_keyframe_intervals_snap_to_keyframes():
+    assert _keyframe_intervals([0.0, 2.0, 4.0, 6.0, 8.0, 10.0, 12.0, 14.0], 4) == [
+        (0.0, 4.0),
+        (4.0, 8.0),
+        (8.0, 12.0),
+        (12.0, None),
+    ]
+    assert _keyframe_intervals([0.0, 1.0, 2.0], 8) == [(0.0, 1.0), (1.0, 2.0), (2.0, None)]
+
+
+def test_parallel_diff_falls_back_when_segments_misalign(tmp_path: Path, monkeypatch):
+    def fake_split(src, cuts, seg_root, prefix, ffmpeg):
+        pieces = [seg_root / f"{prefix}_{i:03d}.mp4" for i in range(len(cuts) + 1)]
+        for piece in pieces:
+            piece.write_bytes(b"")
+        return pieces
+
+    # The resultant's first cut landed on a later keyframe: 4.0s vs 4.5s.
+    durations = {"a_000.mp4": 4.0, "a_001.mp4": 6.0, "b_000.mp4": 4.5, "b_001.mp4": 5.5}
+    monkeypatch.setattr(video_compressor, "_ffmpeg_split", fake_split)
+    monkeypatch.setattr(video_compressor, "_media_duration", lambda path, *_a: durations[path.name])
+    calls = []
+
+    def compute_diff(a, b, out_dir, **_kw):
+        calls.append((a.name, b.name))
+        return out_dir / "diff.mp4"
+
+    result = video_compressor._parallel_diff(
+        compute_diff, Path("orig.mp4"), Path("res.mp4"), tmp_path, 2, {}, keyframes=[0.0, 4.0, 8.0]
+    )
+    assert result == tmp_path / "diff.mp4"
+    assert calls == [("orig.mp4", "res.mp4")]
+    assert not (tmp_path / "diff_segments").exists()
@@ -10,6 +10,7 @@ from __future__ import annotations
 import argparse
 import json
 import sys
+from datetime import date, time
 from pathlib import Path
 
 # Ensure package on path (parent of Scripts)
@@ -20,15 +21,33 @@ if str(_repo_root) not in sys.path:
 
 from unified_semantic_archiver.db import ContinuumDb
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps(obj: object) -> str:
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj)
+
 
 def _row_to_json_serializable(r: dict) -> dict:
-    out = {}
-    for k, v in r.items():
-        if hasattr(v, "isoformat"):
-            out[k] = v.isoformat() if v else None
-        else:
-            out[k] = v
-    return out
+    # date covers datetime (subclass); isinstance is a C-level check, unlike per-value hasattr.
+    return {k: (v.isoformat() if isinstance(v, (date, time)) else v) for k, v in r.items()}
+
+
+def _write_json_rows(rows, out=None) -> None:
+    """Stream rows as a JSON array, one row per line; output starts before the last row is converted."""
+    out = out or sys.stdout
+    out.write("[")
+    sep = "\n"
+    for r in rows:
+        out.write(sep)
+        out.write(_dumps(_row_to_json_serializable(r)))
+        sep = ",\n"
+    out.write("\n]\n")
 
 
 def main() -> int:
@@ -46,6 +65,7 @@ def main() -> int:
     ap.add_argument("--distance_mi", help="Miles for location filter: 0=same bucket, number, or 'infinite'")
     ap.add_argument("--document_type", help="Filter library_documents by type (video, document, audio, image, program, data)")
     ap.add_argument("-q", "--query", dest="q", help="Text search in library_documents (type_metadata, url)")
+    ap.add_argument("--meta_name", help="Exact type_metadata name match in library_documents (indexed)")
     ap.add_argument("--tenant", default="default", help="Tenant id for library_documents (default: default)")
     args = ap.parse_args()
 
@@ -85,6 +105,7 @@ def main() -> int:
                 distance_mi=distance_mi,
                 tenant_id=args.tenant,
                 limit=args.limit,
+                meta_name=args.meta_name,
             )
         else:
             print(json.dumps({"error": f"Unknown table: {args.table}"}))
@@ -93,8 +114,7 @@ def main() -> int:
         print(json.dumps({"error": "Provide --table, --sql, or --sql-file"}))
         return 1
 
-    out = [_row_to_json_serializable(r) for r in rows]
-    print(json.dumps(out, indent=2))
+    _write_json_rows(rows)
     return 0
 
 
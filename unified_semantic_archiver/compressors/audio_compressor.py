@@ -8,7 +8,10 @@ from __future__ import annotations
 
 import logging
 from pathlib import Path
-from typing import Callable
+from typing import TYPE_CHECKING, Callable
+
+if TYPE_CHECKING:
+    from unified_semantic_archiver.db import ContinuumDb
 
 log = logging.getLogger("unified_semantic_archiver.audio_compressor")
 
@@ -18,6 +21,7 @@ def audio_compress(
     out_dir: Path,
     *,
     db_path: Path | None = None,
+    db: ContinuumDb | None = None,
     config: dict | None = None,
     progress_callback: Callable[[str, float, str], None] | None = None,
 ) -> dict:
@@ -38,21 +42,23 @@ def audio_compress(
 
     cb("describe", 0.6, "Generating textual description…")
     script_path = out_dir / "script.txt"
-    script_path.write_text(f"[Audio stub: {audio_path.name}. Sound description library integration pending.]", encoding="utf-8")
+    description = f"[Audio stub: {audio_path.name}. Sound description library integration pending.]"
+    script_path.write_text(description, encoding="utf-8")
 
     cb("store", 0.9, "Storing…")
     diff_path = out_dir / "diff.raw"
     if not diff_path.exists():
         diff_path.write_bytes(b"")  # Empty residual stub
 
-    if db_path:
-        from unified_semantic_archiver.db import ContinuumDb
+    if db is None and db_path:
+        from unified_semantic_archiver.db import shared_db
 
-        db = ContinuumDb(db_path)
+        db = shared_db(db_path)
+    if db is not None:
         chunk_id = db.semantic_chunk_insert(
             media_type="audio",
             chunk_key=audio_path.name,
-            description_text=script_path.read_text(encoding="utf-8"),
+            description_text=description,
             diff_blob_ref=str(diff_path),
         )
 
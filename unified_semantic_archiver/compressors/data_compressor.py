@@ -5,20 +5,35 @@ Primary focus: unique kernels — dedicated attempts on chunks that resist other
 
 from __future__ import annotations
 
+import codecs
 import hashlib
+import itertools
 import json
 import logging
 from pathlib import Path
-from typing import Callable
+from typing import IO, TYPE_CHECKING, Callable
+
+if TYPE_CHECKING:
+    from unified_semantic_archiver.db import ContinuumDb
 
 log = logging.getLogger("unified_semantic_archiver.data_compressor")
 
+_HASH_CHUNK = 1 << 20
+_SNIFF_BYTES = 256
+# Bytes a UTF-8 JSON document can start with (after whitespace / BOM).
+_JSON_LEADING = frozenset(b'{["-0123456789tfn')
+# json.load only produces these types; hash lookup instead of type().__name__ per value.
+_TYPE_NAME = {str: "str", int: "int", float: "float", bool: "bool", list: "list", dict: "dict", type(None): "NoneType"}
+# Same output as json.dumps defaults; iterencode lets _exemplar_stub stop early.
+_EXEMPLAR_ENCODER = json.JSONEncoder()
+
 
 def data_compress(
     data_path: Path,
     out_dir: Path,
     *,
     db_path: Path | None = None,
+    db: ContinuumDb | None = None,
     config: dict | None = None,
     progress_callback: Callable[[str, float, str], None] | None = None,
 ) -> dict:
@@ -32,21 +47,28 @@ def data_compress(
     cb = progress_callback or (lambda _p, _v, _m: None)
 
     cb("describe", 0.3, "Describing data…")
-    raw = data_path.read_bytes()
-    try:
-        obj = json.loads(raw.decode("utf-8"))
-        schema = _infer_schema_stub(obj)
-        desc = json.dumps({"schema": schema, "exemplar": _exemplar_stub(obj)}, indent=2)
-    except (json.JSONDecodeError, UnicodeDecodeError):
-        desc = f"Binary/unknown: len={len(raw)}, sha256={hashlib.sha256(raw).hexdigest()[:16]}"
+    file_size = data_path.stat().st_size
+    desc = None
+    with open(data_path, "rb") as f:
+        if _looks_like_json(f):
+            f.seek(0)
+            try:
+                obj = json.load(f)
+                schema = _infer_schema_stub(obj)
+                desc = json.dumps({"schema": schema, "exemplar": _exemplar_stub(obj)}, indent=2)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                pass
+    if desc is None:
+        desc = f"Binary/unknown: len={file_size}, sha256={_file_sha256(data_path)[:16]}"
 
     script_path = out_dir / "script.txt"
     script_path.write_text(desc[:50000], encoding="utf-8")
 
-    if db_path:
-        from unified_semantic_archiver.db import ContinuumDb
+    if db is None and db_path:
+        from unified_semantic_archiver.db import shared_db
 
-        db = ContinuumDb(db_path)
+        db = shared_db(db_path)
+    if db is not None:
         db.semantic_chunk_insert(
             media_type="data",
             chunk_key=data_path.name,
@@ -59,46 +81,84 @@ def data_compress(
 
 
 def compress_unique_kernels(
-    db_path: Path,
+    db_path: Path | None,
     *,
+    db: ContinuumDb | None = None,
     limit: int = 10,
     progress_callback: Callable[[str, float, str], None] | None = None,
 ) -> dict:
     """
     Primary sticking point: attempt to compress unique kernels from other compressors.
     Consume unique_kernel store; for each, try schema inference, exemplar extraction, etc.
+    Pass an open db to reuse its connection across passes.
     """
-    from unified_semantic_archiver.db import ContinuumDb
+    if db is None:
+        from unified_semantic_archiver.db import shared_db
 
-    db = ContinuumDb(db_path)
+        db = shared_db(db_path)
     kernels = db.unique_kernel_list(status="pending", limit=limit)
     cb = progress_callback or (lambda _p, _v, _m: None)
     compressed = 0
     flagged = 0
-    for i, k in enumerate(kernels):
-        cb("kernel", (i + 1) / max(len(kernels), 1), f"Processing kernel {k.get('id')}…")
-        attempt_count = k.get("attempt_count") or 0
-        # Stub: mark as compressed after 1 attempt; real impl would run compression
-        if attempt_count >= 2:
-            db.unique_kernel_update_status(k["id"], "flagged_research", residual_metric=1.0)
-            flagged += 1
-        else:
-            db.unique_kernel_update_status(k["id"], "compressed", residual_metric=0.5)
-            compressed += 1
+    inv_n = 1.0 / max(len(kernels), 1)
+    # One transaction for all status updates instead of a commit per kernel.
+    with db.bulk_load():
+        for i, (kid, attempt_count) in enumerate(
+            ((k["id"], k.get("attempt_count") or 0) for k in kernels), start=1
+        ):
+            cb("kernel", i * inv_n, f"Processing kernel {kid}…")
+            # Stub: mark as compressed after 1 attempt; real impl would run compression
+            if attempt_count >= 2:
+                db.unique_kernel_update_status(kid, "flagged_research", residual_metric=1.0)
+                flagged += 1
+            else:
+                db.unique_kernel_update_status(kid, "compressed", residual_metric=0.5)
+                compressed += 1
     cb("done", 1.0, f"Processed {len(kernels)} kernels: {compressed} compressed, {flagged} flagged.")
     return {"compressed": compressed, "flagged_research": flagged}
 
 
+def _looks_like_json(f: IO[bytes]) -> bool:
+    """
+    Cheap sniff of f's first non-whitespace byte so binary blobs skip the speculative decode + JSON
+    parse. Leading whitespace of any length is read past, _SNIFF_BYTES at a time.
+    """
+    head = f.read(_SNIFF_BYTES).removeprefix(codecs.BOM_UTF8)
+    while head:
+        if b"\x00" in head:
+            return False
+        head = head.lstrip()
+        if head:
+            return head[0] in _JSON_LEADING
+        head = f.read(_SNIFF_BYTES)
+    return False
+
+
+def _file_sha256(path: Path) -> str:
+    """SHA-256 of a file, streamed in 1 MiB blocks so memory stays flat for large blobs."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(_HASH_CHUNK), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
 def _infer_schema_stub(obj: object) -> dict:
     """Stub: infer simple schema from JSON object."""
     if isinstance(obj, dict):
-        return {k: type(v).__name__ for k, v in list(obj.items())[:50]}
+        return {k: _TYPE_NAME.get(v.__class__) or v.__class__.__name__ for k, v in itertools.islice(obj.items(), 50)}
     if isinstance(obj, list):
         return {"type": "array", "item": type(obj[0]).__name__ if obj else "any"}
     return {"type": type(obj).__name__}
 
 
 def _exemplar_stub(obj: object, max_len: int = 500) -> object:
-    """Stub: return truncated exemplar."""
-    s = json.dumps(obj)[:max_len]
-    return s + ("..." if len(json.dumps(obj)) > max_len else "")
+    """Stub: return truncated exemplar. Encodes incrementally and stops once past max_len."""
+    parts = []
+    size = 0
+    for chunk in _EXEMPLAR_ENCODER.iterencode(obj):
+        parts.append(chunk)
+        size += len(chunk)
+        if size > max_len:
+            return "".join(parts)[:max_len] + "..."
+    return "".join(parts)
@@ -4,18 +4,30 @@ Library code compressor: parse AST, recurse from unique nodes with simpler gramm
 
 from __future__ import annotations
 
+import ast
+import functools
 import logging
 from pathlib import Path
-from typing import Callable
+from typing import TYPE_CHECKING, Callable
+
+if TYPE_CHECKING:
+    from unified_semantic_archiver.db import ContinuumDb
 
 log = logging.getLogger("unified_semantic_archiver.library_compressor")
 
 
+@functools.lru_cache(maxsize=128)
+def _ast_dump_cached(source_bytes: bytes) -> str:
+    """ast.dump of the parsed source; keyed by content so ring retries on the same file skip re-parsing."""
+    return ast.dump(ast.parse(source_bytes.decode("utf-8")))
+
+
 def library_compress(
     source_path: Path,
     out_dir: Path,
     *,
     db_path: Path | None = None,
+    db: ContinuumDb | None = None,
     config: dict | None = None,
     progress_callback: Callable[[str, float, str], None] | None = None,
 ) -> dict:
@@ -29,32 +41,32 @@ def library_compress(
     cb = progress_callback or (lambda _p, _v, _m: None)
 
     cb("parse", 0.2, "Parsing AST…")
+    source_bytes = source_path.read_bytes()
     try:
-        import ast
-        source_text = source_path.read_text(encoding="utf-8")
-        tree = ast.parse(source_text)
         # Stub: dump AST as simplified description
-        desc = ast.dump(tree)
+        desc = _ast_dump_cached(source_bytes)
     except Exception as e:
         log.warning("AST parse failed (%s), using raw text", e)
-        desc = source_path.read_text(encoding="utf-8")[:50000]
+        desc = source_bytes.decode("utf-8")[:50000]
 
     cb("recurse", 0.5, "Applying simpler grammar…")
     script_path = out_dir / "script.txt"
-    script_path.write_text(desc[:50000], encoding="utf-8")
+    desc = desc[:50000]
+    script_path.write_text(desc, encoding="utf-8")
 
     cb("store", 0.9, "Storing…")
     diff_path = out_dir / "diff.patch"
     diff_path.write_text("", encoding="utf-8")
 
-    if db_path:
-        from unified_semantic_archiver.db import ContinuumDb
+    if db is None and db_path:
+        from unified_semantic_archiver.db import shared_db
 
-        db = ContinuumDb(db_path)
+        db = shared_db(db_path)
+    if db is not None:
         db.semantic_chunk_insert(
             media_type="library",
             chunk_key=source_path.name,
-            description_text=script_path.read_text(encoding="utf-8"),
+            description_text=desc,
             diff_blob_ref=str(diff_path),
         )
 
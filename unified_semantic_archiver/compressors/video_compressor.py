@@ -5,113 +5,673 @@ Extends video_storage_tool; stores altered script + diff in continuum DB.
 
 from __future__ import annotations
 
+import functools
+import hashlib
+import importlib
+import importlib.util
+import json
 import logging
+import os
+import queue
+import shutil
+import subprocess
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Callable
+from types import ModuleType, SimpleNamespace
+from typing import TYPE_CHECKING, Callable, Iterator
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
 
 from unified_semantic_archiver.media.minimization import MinimizationContext, run_minimization
 
+if TYPE_CHECKING:
+    from unified_semantic_archiver.db import ContinuumDb
+
 log = logging.getLogger("unified_semantic_archiver.video_compressor")
+# Bound once; these are called per video, and batch_video_compress runs many videos per call.
+_warn = log.warning
+_info = log.info
+_debug = log.debug
 
-# Add video_storage_tool to path
-_scripts = Path(__file__).resolve().parent.parent.parent
-if str(_scripts) not in sys.path:
-    sys.path.insert(0, str(_scripts))
+# Script excerpt stored with each semantic chunk; same 50000 cap as before, now counted in bytes.
+_SCRIPT_EXCERPT_BYTES = 50000
 
+# linux/fs.h FICLONE: share extents between two files (copy-on-write).
+_FICLONE = 0x40049409
 
-def video_compress(
-    video_path: Path,
-    out_dir: Path,
-    *,
-    grid_size: int = 4,
-    db_path: Path | None = None,
-    config: dict | None = None,
-    progress_callback: Callable[[str, float, str], None] | None = None,
-) -> dict:
+# Checkout of video_storage_tool next to this package, used when it is not installed.
+_VST_ROOT = Path(__file__).resolve().parent.parent.parent / "video_storage_tool"
+
+
+@dataclass
+class _VideoJob:
+    """One video moving through the describe/generate/diff stages."""
+
+    video_path: Path
+    out_dir: Path
+    audio_path: Path | None = None
+    script_path: Path | None = None
+    resultant_path: Path | None = None
+    diff_path: Path | str | None = None
+    content_hash: str | None = None
+    keyframes: list[float] | None = None
+    error: Exception | None = None
+
+
+@dataclass
+class _Stage:
+    name: str
+    fn: Callable[[_VideoJob], None]
+
+
+def _import_vst(name: str) -> ModuleType:
     """
-    Compress video: chunk -> describe -> generate -> diff -> minimize -> store.
-    Uses video_storage_tool for describe (Whisper + visual) and diff.
-    Returns dict with chunk_keys, script_path, diff_path, unique_chunk_refs.
+    video_storage_tool.<name>. If the package is not importable, load it from _VST_ROOT by file
+    location and register it in sys.modules; sys.path is left alone.
     """
-    config = config or {}
-    out_dir = Path(out_dir)
-    out_dir.mkdir(parents=True, exist_ok=True)
-    cb = progress_callback or (lambda _p, _v, _m: None)
+    if "video_storage_tool" not in sys.modules and importlib.util.find_spec("video_storage_tool") is None:
+        init = _VST_ROOT / "__init__.py"
+        if not init.is_file():
+            raise ImportError(f"video_storage_tool is not installed and not found at {_VST_ROOT}")
+        spec = importlib.util.spec_from_file_location(
+            "video_storage_tool", init, submodule_search_locations=[str(_VST_ROOT)]
+        )
+        pkg = importlib.util.module_from_spec(spec)
+        sys.modules["video_storage_tool"] = pkg
+        try:
+            spec.loader.exec_module(pkg)
+        except BaseException:
+            del sys.modules["video_storage_tool"]
+            raise
+    return importlib.import_module(f"video_storage_tool.{name}")
+
+
+@functools.lru_cache(maxsize=1)
+def _load_vst() -> SimpleNamespace:
+    """video_storage_tool entry points, imported once. ImportError is not cached, so a later install is picked up."""
+    return SimpleNamespace(
+        extract_and_compress_audio=_import_vst("audio").extract_and_compress_audio,
+        video_to_script=_import_vst("video_to_script").video_to_script,
+        script_to_video=_import_vst("script_to_video").script_to_video,
+        compute_diff=_import_vst("diff").compute_diff,
+    )
 
+
+def _load_video_tools() -> SimpleNamespace | None:
+    """_load_vst() or None (logged) when video_storage_tool is not importable."""
     try:
-        from video_storage_tool.video_to_script import video_to_script
-        from video_storage_tool.diff import compute_diff
-        from video_storage_tool.script_to_video import script_to_video
-        from video_storage_tool.audio import extract_and_compress_audio
+        return _load_vst()
     except ImportError as e:
-        log.warning("video_storage_tool not available: %s. Using stub.", e)
-        return _stub_compress(video_path, out_dir, grid_size, db_path, cb)
+        _warn("video_storage_tool not available: %s. Using stub.", e)
+        return None
+
+
+def _get_db(db_path: Path) -> ContinuumDb:
+    """The process-wide shared_db() for db_path, so init_schema runs once rather than per compress call."""
+    from unified_semantic_archiver.db import shared_db
+
+    return shared_db(db_path)
+
+
+def _t2v_cache_key(script_path: Path, t2v_cfg: dict) -> str:
+    """SHA-256 over script bytes and t2v settings (backend, model_id, ...)."""
+    h = hashlib.sha256(Path(script_path).read_bytes())
+    h.update(json.dumps(t2v_cfg, sort_keys=True, default=str).encode("utf-8"))
+    return h.hexdigest()
+
+
+def _t2v_cache_dir(job: _VideoJob, pipeline_cfg: dict) -> Path | None:
+    """pipeline.t2v_cache_dir (default out_dir.parent/.t2v_cache) when pipeline.reuse_t2v is on, else None."""
+    if not pipeline_cfg.get("reuse_t2v", False):
+        return None
+    cache_dir = pipeline_cfg.get("t2v_cache_dir")
+    return Path(cache_dir) if cache_dir else job.out_dir.parent / ".t2v_cache"
+
+
+def _trim_cache(cache_dir: Path, max_bytes: int) -> None:
+    """Delete the least recently used files (oldest mtime) in cache_dir until it holds at most max_bytes."""
+    entries = []
+    for path in cache_dir.iterdir():
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        entries.append((st.st_mtime_ns, st.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+
+
+def _file_sha256(path: Path) -> str:
+    with open(path, "rb") as f:
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        h = hashlib.sha256()
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+        return h.hexdigest()
+
+
+def _reflink(src: Path, dst: Path) -> bool:
+    """Copy-on-write clone (btrfs/xfs FICLONE); False where unsupported."""
+    if fcntl is None:
+        return False
+    try:
+        with open(src, "rb") as fs, open(dst, "wb") as fd:
+            fcntl.ioctl(fd.fileno(), _FICLONE, fs.fileno())
+        return True
+    except OSError:
+        Path(dst).unlink(missing_ok=True)
+        return False
+
+
+def _link_or_copy(src: Path, dst: Path) -> None:
+    """Hardlink src to dst (no data copy); reflink, then copy, when linking is not possible."""
+    try:
+        os.link(src, dst)
+    except FileExistsError:
+        pass
+    except OSError:
+        if not _reflink(src, dst):
+            shutil.copy2(src, dst)
+
+
+def _artifact_cache_dir(job: _VideoJob, kind: str, cfg: object) -> Path:
+    """out_dir.parent/.artifact_cache/<sha256(video content, kind, cfg)>; hashes the video once per job."""
+    if job.content_hash is None:
+        job.content_hash = _file_sha256(job.video_path)
+    h = hashlib.sha256(f"{job.content_hash}:{kind}:".encode("utf-8"))
+    h.update(json.dumps(cfg, sort_keys=True, default=str).encode("utf-8"))
+    return job.out_dir.parent / ".artifact_cache" / h.hexdigest()
+
+
+def _reuse_artifact(cache_dir: Path, out_dir: Path) -> Path | None:
+    """Link a previously cached artifact into out_dir; None on a miss."""
+    if cache_dir.is_dir():
+        for cached in cache_dir.iterdir():
+            dst = out_dir / cached.name
+            # Anything already at dst is a leftover from an unfinished step.
+            dst.unlink(missing_ok=True)
+            _link_or_copy(cached, dst)
+            return dst
+    return None
+
+
+def _store_artifact(path: Path | None, cache_dir: Path) -> None:
+    if path is None or not Path(path).is_file():
+        return
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        _link_or_copy(Path(path), cache_dir / Path(path).name)
+    except OSError as e:
+        _debug("Artifact cache store failed: %s", e)
+
+
+def _done_marker(path: Path) -> Path:
+    return path.with_name(path.name + ".done")
+
+
+def _is_done(path: Path) -> bool:
+    """path was fully written by a finished step (not left partial by a crashed one)."""
+    return path.exists() and _done_marker(path).exists()
+
+
+def _mark_done(path: Path | str | None) -> None:
+    if path is not None and Path(path).exists():
+        _done_marker(Path(path)).touch()
+
+
+@contextmanager
+def _step_lock(lock_path: Path) -> Iterator[None]:
+    """
+    Exclusive flock on lock_path so two processes compressing into the same out_dir do not run the
+    same step twice: the second waits, then finds the step done. No-op where fcntl is unavailable.
+    """
+    if fcntl is None:
+        yield
+        return
+    with open(lock_path, "a+b") as f:
+        try:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            _info("Waiting for %s held by another process", lock_path)
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+@contextmanager
+def _staging_dir(out_dir: Path, step: str) -> Iterator[Path]:
+    """
+    Scratch directory for a step's helper to write into. On success every file it wrote is moved
+    into out_dir with os.replace, so out_dir (and anything hardlinking from it) never sees a
+    half-written artifact; on failure the scratch directory is discarded.
+    """
+    stage = out_dir / f".{step}.part"
+    shutil.rmtree(stage, ignore_errors=True)
+    stage.mkdir()
+    try:
+        yield stage
+        for p in stage.iterdir():
+            dst = out_dir / p.name
+            if p.is_dir() and dst.is_dir():
+                shutil.rmtree(dst)
+            os.replace(p, dst)
+    finally:
+        shutil.rmtree(stage, ignore_errors=True)
+
+
+def _unstage(path: Path | str | None, stage: Path, out_dir: Path) -> Path | None:
+    """Where a path returned from inside a staging dir ended up after _staging_dir moved it."""
+    if path is None:
+        return None
+    path = Path(path)
+    return out_dir / path.relative_to(stage) if path.is_relative_to(stage) else path
+
+
+def _video_stages(
+    tools: SimpleNamespace,
+    config: dict,
+    cb: Callable[[str, float, str], None],
+    progress_callback: Callable[[str, float, str], None] | None,
+) -> list[_Stage]:
+    """Steps 1-4 of video_compress as stages that fill in a _VideoJob."""
+    # Reuse audio/script from an earlier run on identical video content (opt-in: hashes each input).
+    reuse = bool(config.get("pipeline", {}).get("reuse_artifacts", False))
+    # Resultants cached by script + t2v settings (opt-in), trimmed to t2v_cache_max_mb after each store.
+    t2v_cache_max_bytes = int(float(config.get("pipeline", {}).get("t2v_cache_max_mb", 2048)) * (1 << 20))
 
     # Step 1: extract audio
-    cb("extracting_audio", 0.1, "Extracting audio…")
-    audio_path = out_dir / "audio.aac"
-    if not audio_path.exists():
-        audio_cfg = config.get("audio", {})
-        audio_path = extract_and_compress_audio(
-            video_path,
-            out_dir,
-            format=audio_cfg.get("format", "aac"),
-            max_mb=audio_cfg.get("max_mb", 5.0),
-            ffmpeg_path=audio_cfg.get("ffmpeg_path"),
-        )
+    def extract(job: _VideoJob) -> None:
+        cb("extracting_audio", 0.1, "Extracting audio…")
+        job.audio_path = job.out_dir / "audio.aac"
+        with _step_lock(job.out_dir / "extract.lock"):
+            if _is_done(job.audio_path):
+                return
+            audio_cfg = config.get("audio", {})
+            cache_dir = _artifact_cache_dir(job, "audio", audio_cfg) if reuse else None
+            reused = _reuse_artifact(cache_dir, job.out_dir) if cache_dir else None
+            if reused is not None:
+                job.audio_path = reused
+                _mark_done(reused)
+                return
+            with _staging_dir(job.out_dir, "extract") as stage:
+                produced = tools.extract_and_compress_audio(
+                    job.video_path,
+                    stage,
+                    format=audio_cfg.get("format", "aac"),
+                    max_mb=audio_cfg.get("max_mb", 5.0),
+                    ffmpeg_path=audio_cfg.get("ffmpeg_path"),
+                )
+            job.audio_path = _unstage(produced, stage, job.out_dir)
+            _mark_done(job.audio_path)
+            if cache_dir:
+                _store_artifact(job.audio_path, cache_dir)
 
     # Step 2: describe (script = transcript + visual)
-    cb("describing", 0.25, "Video to script…")
-    script_path = out_dir / "script.txt"
-    if not script_path.exists():
-        script_path = video_to_script(
-            video_path,
-            audio_path,
-            out_dir,
-            backend=config.get("script", {}).get("backend", "whisper"),
-            config=config,
-            progress_callback=progress_callback,
-        )
+    def describe(job: _VideoJob) -> None:
+        cb("describing", 0.25, "Video to script…")
+        job.script_path = job.out_dir / "script.txt"
+        with _step_lock(job.out_dir / "describe.lock"):
+            if _is_done(job.script_path):
+                return
+            # video_to_script sees the whole config, so all of it goes into the key.
+            cache_dir = _artifact_cache_dir(job, "script", config) if reuse else None
+            reused = _reuse_artifact(cache_dir, job.out_dir) if cache_dir else None
+            if reused is not None:
+                job.script_path = reused
+                _mark_done(reused)
+                return
+            with _staging_dir(job.out_dir, "describe") as stage:
+                produced = tools.video_to_script(
+                    job.video_path,
+                    job.audio_path,
+                    stage,
+                    backend=config.get("script", {}).get("backend", "whisper"),
+                    config=config,
+                    progress_callback=progress_callback,
+                )
+            job.script_path = _unstage(produced, stage, job.out_dir)
+            _mark_done(job.script_path)
+            if cache_dir:
+                _store_artifact(job.script_path, cache_dir)
 
     # Step 3: generate proximal (script -> resultant video)
-    cb("generating", 0.5, "Script to resultant video…")
-    resultant_path = out_dir / "resultant.mp4"
-    if not resultant_path.exists():
-        t2v_cfg = config.get("t2v", {})
-        script_to_video(
-            script_path,
-            out_dir,
-            backend=t2v_cfg.get("backend", "stub"),
-            model_path=t2v_cfg.get("model_path"),
-            model_id=t2v_cfg.get("model_id"),
-            config=t2v_cfg,
-            progress_callback=progress_callback,
-            ffmpeg_path=config.get("audio", {}).get("ffmpeg_path"),
-        )
-        resultant_path = out_dir / "resultant.mp4"
+    def generate(job: _VideoJob) -> None:
+        cb("generating", 0.5, "Script to resultant video…")
+        job.resultant_path = job.out_dir / "resultant.mp4"
+        with _step_lock(job.out_dir / "generate.lock"):
+            # The backend picks the container, so a finished resultant may not be .mp4.
+            for marker in job.out_dir.glob("resultant.*.done"):
+                if _is_done(marker.with_suffix("")):
+                    job.resultant_path = marker.with_suffix("")
+                    return
+            t2v_cfg = config.get("t2v", {})
+            # Identical script + t2v settings give the same resultant; reuse it instead of re-running the model.
+            cache_dir = _t2v_cache_dir(job, config.get("pipeline", {}))
+            key = _t2v_cache_key(job.script_path, t2v_cfg) if cache_dir else None
+            cached = next(cache_dir.glob(f"{key}.*"), None) if cache_dir and cache_dir.is_dir() else None
+            if cached is not None:
+                job.resultant_path = job.out_dir / f"resultant{cached.suffix}"
+                job.resultant_path.unlink(missing_ok=True)
+                _link_or_copy(cached, job.resultant_path)
+                # A hit counts as a use, so trimming evicts it last.
+                try:
+                    os.utime(cached)
+                except OSError:
+                    pass
+                _mark_done(job.resultant_path)
+                return
+            with _staging_dir(job.out_dir, "generate") as stage:
+                produced = tools.script_to_video(
+                    job.script_path,
+                    stage,
+                    backend=t2v_cfg.get("backend", "stub"),
+                    model_path=t2v_cfg.get("model_path"),
+                    model_id=t2v_cfg.get("model_id"),
+                    config=t2v_cfg,
+                    progress_callback=progress_callback,
+                    ffmpeg_path=config.get("audio", {}).get("ffmpeg_path"),
+                )
+            job.resultant_path = _unstage(produced, stage, job.out_dir) or job.resultant_path
+            _mark_done(job.resultant_path)
+            if cache_dir and job.resultant_path.is_file():
+                try:
+                    cache_dir.mkdir(parents=True, exist_ok=True)
+                    _link_or_copy(job.resultant_path, cache_dir / f"{key}{job.resultant_path.suffix}")
+                    _trim_cache(cache_dir, t2v_cache_max_bytes)
+                except OSError as e:
+                    _debug("t2v cache store failed: %s", e)
 
     # Step 4: diff (original - resultant)
-    cb("diffing", 0.7, "Computing diff…")
-    diff_path = compute_diff(
-        video_path,
-        resultant_path,
-        out_dir,
-        enabled=True,
-        quality=config.get("diff", {}).get("quality", 6),
-        lossless=config.get("diff", {}).get("lossless", False),
-        ffmpeg_path=config.get("audio", {}).get("ffmpeg_path"),
+    def diff(job: _VideoJob) -> None:
+        cb("diffing", 0.7, "Computing diff…")
+        diff_cfg = config.get("diff", {})
+        kwargs = _diff_kwargs(config)
+        segments = int(diff_cfg.get("segments", 1) or 1)
+        if segments > 1:
+            job.diff_path = _parallel_diff(
+                tools.compute_diff,
+                job.video_path,
+                job.resultant_path,
+                job.out_dir,
+                segments,
+                kwargs,
+                job.keyframes,
+            )
+        else:
+            job.diff_path = tools.compute_diff(job.video_path, job.resultant_path, job.out_dir, **kwargs)
+
+    return [
+        _Stage("extract", extract),
+        _Stage("describe", describe),
+        _Stage("generate", generate),
+        _Stage("diff", diff),
+    ]
+
+
+def _diff_kwargs(config: dict) -> dict:
+    diff_cfg = config.get("diff", {})
+    return {
+        "enabled": True,
+        "quality": diff_cfg.get("quality", 6),
+        "lossless": diff_cfg.get("lossless", False),
+        "ffmpeg_path": config.get("audio", {}).get("ffmpeg_path"),
+    }
+
+
+def _image_diff(image: Path, resultant: Path, out_dir: Path, ffmpeg: str) -> Path:
+    """
+    Single-frame |image - resultant| as diff.png; the resultant's first frame is scaled to the
+    image size. One still PNG instead of compute_diff's encoded video.
+    """
+    out = out_dir / "diff.png"
+    graph = "[1:v][0:v]scale2ref[res][orig];[orig][res]blend=all_mode=difference"
+    cmd = [ffmpeg, "-y", "-v", "error", "-i", str(image), "-i", str(resultant)]
+    cmd += ["-filter_complex", graph, "-frames:v", "1", "-update", "1", str(out)]
+    subprocess.run(cmd, capture_output=True, check=True, timeout=120)
+    return out
+
+
+def _ffprobe_for(ffmpeg: str) -> str:
+    """ffprobe next to a configured ffmpeg binary, else from PATH."""
+    return str(Path(ffmpeg).with_name("ffprobe")) if Path(ffmpeg).name != ffmpeg else "ffprobe"
+
+
+def _prepare_diff(job: _VideoJob, config: dict) -> None:
+    """Diff prep that needs only the original video; runs while text-to-video is generating."""
+    if int(config.get("diff", {}).get("segments", 1) or 1) > 1:
+        ffmpeg = config.get("audio", {}).get("ffmpeg_path") or "ffmpeg"
+        try:
+            job.keyframes = _keyframe_times(job.video_path, _ffprobe_for(ffmpeg))
+        except (OSError, subprocess.SubprocessError, ValueError) as e:
+            _debug("Keyframe probe failed: %s", e)
+
+
+def _keyframe_times(video_path: Path, ffprobe: str) -> list[float]:
+    """Keyframe timestamps (seconds) of the first video stream; decodes keyframes only."""
+    proc = subprocess.run(
+        [
+            ffprobe,
+            "-v",
+            "error",
+            "-select_streams",
+            "v:0",
+            "-skip_frame",
+            "nokey",
+            "-show_entries",
+            "frame=pts_time",
+            "-of",
+            "csv=p=0",
+            str(video_path),
+        ],
+        capture_output=True,
+        check=True,
+        text=True,
+        timeout=120,
     )
+    times = []
+    for line in proc.stdout.split():
+        t = line.strip(",")
+        if t and t != "N/A":
+            times.append(float(t))
+    return times
 
+
+def _keyframe_intervals(keyframes: list[float], c: int) -> list[tuple[float, float | None]]:
+    """Split at up to c-1 keyframes spread evenly by index; last interval is open-ended."""
+    cuts = sorted({keyframes[i * len(keyframes) // c] for i in range(1, c)} - {keyframes[0]})
+    starts = [0.0] + cuts
+    return [(a, b) for a, b in zip(starts, cuts + [None])]
+
+
+def _ffmpeg_split(src: Path, cuts: list[float], seg_root: Path, prefix: str, ffmpeg: str) -> list[Path]:
+    """
+    Stream-copy src into len(cuts)+1 pieces with one ffmpeg process (segment muxer), instead of one
+    process per piece. Stream copy can only cut at src's own keyframes, so each piece starts at the
+    first keyframe at or after its cut time: exact when the cuts are src's keyframes, not otherwise.
+    """
+    pattern = seg_root / f"{prefix}_%03d{src.suffix}"
+    cmd = [ffmpeg, "-y", "-v", "error", "-i", str(src), "-map", "0", "-c", "copy"]
+    cmd += ["-f", "segment", "-segment_times", ",".join(f"{t:.6f}" for t in cuts), "-reset_timestamps", "1"]
+    subprocess.run([*cmd, str(pattern)], capture_output=True, check=True, timeout=600)
+    pieces = sorted(seg_root.glob(f"{prefix}_[0-9][0-9][0-9]{src.suffix}"))
+    if len(pieces) != len(cuts) + 1:
+        raise RuntimeError(f"expected {len(cuts) + 1} segments of {src.name}, got {len(pieces)}")
+    return pieces
+
+
+# Largest piece-duration difference (seconds) accepted between the two inputs' segments: about a
+# frame at 24 fps. Beyond it the cuts landed on different frames and the segments would not line up.
+_SEGMENT_DURATION_TOLERANCE_S = 0.042
+
+
+def _media_duration(path: Path, ffprobe: str) -> float:
+    """Container duration in seconds."""
+    proc = subprocess.run(
+        [ffprobe, "-v", "error", "-show_entries", "format=duration", "-of", "csv=p=0", str(path)],
+        capture_output=True,
+        check=True,
+        text=True,
+        timeout=120,
+    )
+    return float(proc.stdout.strip())
+
+
+def _check_segments_aligned(pieces_a: list[Path], pieces_b: list[Path], ffprobe: str) -> None:
+    """
+    Raise RuntimeError unless each pair of pieces has the same duration. Pieces run back to back
+    from 0, so equal durations mean every cut fell at the same time in both inputs.
+    """
+    for i, (a, b) in enumerate(zip(pieces_a, pieces_b)):
+        da, db = _media_duration(a, ffprobe), _media_duration(b, ffprobe)
+        if abs(da - db) > _SEGMENT_DURATION_TOLERANCE_S:
+            raise RuntimeError(f"segment {i} is {da:.3f}s in the original but {db:.3f}s in the resultant")
+
+
+def _parallel_diff(
+    compute_diff: Callable,
+    video_a: Path,
+    video_b: Path,
+    out_dir: Path,
+    c: int,
+    diff_kwargs: dict,
+    keyframes: list[float] | None = None,
+) -> Path | str | None:
+    """
+    compute_diff over c keyframe-aligned segments at once, concatenated into out_dir.
+    Each input is stream-copied (no re-encode) into segments at the original's keyframes by a single
+    ffmpeg process; compute_diff shells out to ffmpeg, so threads are enough to keep c decoders busy.
+    The resultant can only be cut at its own keyframes, so the pieces' durations are compared first.
+    Falls back to one compute_diff call if probing, cutting or concatenation fails. The pieces and
+    per-segment diffs under out_dir/diff_segments are removed either way.
+    """
+    ffmpeg = diff_kwargs.get("ffmpeg_path") or "ffmpeg"
+    seg_root = out_dir / "diff_segments"
+    try:
+        if keyframes is None:
+            keyframes = _keyframe_times(video_a, _ffprobe_for(ffmpeg))
+        intervals = _keyframe_intervals(keyframes, c) if len(keyframes) > 1 else []
+        if len(intervals) < 2:
+            return compute_diff(video_a, video_b, out_dir, **diff_kwargs)
+        seg_root.mkdir(parents=True, exist_ok=True)
+        cuts = [start for start, _end in intervals[1:]]
+        pieces_a = _ffmpeg_split(video_a, cuts, seg_root, "a", ffmpeg)
+        pieces_b = _ffmpeg_split(video_b, cuts, seg_root, "b", ffmpeg)
+        _check_segments_aligned(pieces_a, pieces_b, _ffprobe_for(ffmpeg))
+
+        def run_segment(i: int, a: Path, b: Path) -> Path:
+            seg_dir = seg_root / f"{i:03d}"
+            seg_dir.mkdir(parents=True, exist_ok=True)
+            seg_diff = compute_diff(a, b, seg_dir, **diff_kwargs)
+            if not seg_diff:
+                raise RuntimeError(f"no diff for segment {i}")
+            return Path(seg_diff)
+
+        with ThreadPoolExecutor(max_workers=len(intervals)) as pool:
+            seg_diffs = list(pool.map(run_segment, range(len(intervals)), pieces_a, pieces_b))
+        list_path = seg_root / "concat.txt"
+        list_path.write_text("".join(f"file '{p.resolve()}'\n" for p in seg_diffs), encoding="utf-8")
+        merged = out_dir / seg_diffs[0].name
+        subprocess.run(
+            [ffmpeg, "-y", "-v", "error", "-f", "concat", "-safe", "0", "-i", str(list_path), "-c", "copy", str(merged)],
+            capture_output=True,
+            check=True,
+            timeout=600,
+        )
+        return merged
+    except (OSError, subprocess.SubprocessError, RuntimeError, ValueError) as e:
+        _warn("Segmented diff failed (%s); diffing whole video", e)
+        return compute_diff(video_a, video_b, out_dir, **diff_kwargs)
+    finally:
+        shutil.rmtree(seg_root, ignore_errors=True)
+
+
+def _run_pipeline(jobs: list[_VideoJob], stages: list[_Stage], prefetch: int = 2) -> Iterator[_VideoJob]:
+    """
+    Run each stage on its own thread, linked by bounded queues, so stage N works on video i while
+    stage N-1 works on video i+1. Yields jobs in input order as they leave the last stage; a stage
+    error is recorded on the job and later stages skip it.
+    """
+    queues: list[queue.Queue] = [queue.Queue(maxsize=prefetch) for _ in range(len(stages) + 1)]
+
+    def work(stage: _Stage, in_q: queue.Queue, out_q: queue.Queue) -> None:
+        while (job := in_q.get()) is not None:
+            if job.error is None:
+                try:
+                    stage.fn(job)
+                except Exception as e:
+                    job.error = e
+            out_q.put(job)
+        out_q.put(None)
+
+    def feed() -> None:
+        for job in jobs:
+            queues[0].put(job)
+        queues[0].put(None)
+
+    threads = [threading.Thread(target=feed, name="video-feed", daemon=True)]
+    threads += [
+        threading.Thread(target=work, args=(st, queues[i], queues[i + 1]), name=f"video-{st.name}", daemon=True)
+        for i, st in enumerate(stages)
+    ]
+    for t in threads:
+        t.start()
+    while (job := queues[-1].get()) is not None:
+        yield job
+    for t in threads:
+        t.join()
+
+
+def _locked_callback(
+    progress_callback: Callable[[str, float, str], None] | None,
+) -> Callable[[str, float, str], None] | None:
+    """Serialize a progress callback shared by pipeline threads."""
+    if progress_callback is None:
+        return None
+    lock = threading.Lock()
+
+    def cb(phase: str, value: float, message: str) -> None:
+        with lock:
+            progress_callback(phase, value, message)
+
+    return cb
+
+
+def _finish_video_job(
+    job: _VideoJob,
+    grid_size: int,
+    db_path: Path | None,
+    db: ContinuumDb | None,
+    config: dict,
+    cb: Callable[[str, float, str], None],
+    pending: list[tuple] | None = None,
+) -> dict:
+    """
+    Steps 5-6 (minimize, store) on the calling thread, then the video_compress result dict.
+    With pending, the DB row is appended there for the caller to flush instead of stored now.
+    """
     # Step 5: minimize via ETL adapters (feature-gated)
     cb("minimizing", 0.85, "Minimizing toward unique chunks…")
     mini = run_minimization(
         MinimizationContext(
-            video_path=video_path,
-            resultant_path=resultant_path,
-            diff_path=Path(diff_path) if diff_path else None,
-            script_path=script_path,
-            out_dir=out_dir,
+            video_path=job.video_path,
+            resultant_path=job.resultant_path,
+            diff_path=Path(job.diff_path) if job.diff_path else None,
+            script_path=job.script_path,
+            out_dir=job.out_dir,
             grid_size=grid_size,
             config=config,
             source="compressor",
@@ -121,37 +681,160 @@ def video_compress(
     unique_refs = mini.unique_chunk_refs
 
     # Step 6: store in continuum DB
-    if db_path:
-        _store_to_db(db_path, video_path, script_path, diff_path, unique_refs, "video")
+    if db is not None or db_path:
+        row = (job.video_path, job.script_path, job.diff_path, unique_refs, "video")
+        if pending is None:
+            _store_to_db(db_path, [row], db=db)
+        else:
+            pending.append(row)
 
     cb("done", 1.0, "Video compression complete.")
     return {
-        "script_path": str(script_path),
-        "resultant_path": str(resultant_path),
-        "diff_path": str(diff_path) if diff_path else None,
+        "script_path": str(job.script_path),
+        "resultant_path": str(job.resultant_path),
+        "diff_path": str(job.diff_path) if job.diff_path else None,
         "unique_chunk_refs": unique_refs,
     }
 
+
+def video_compress(
+    video_path: Path,
+    out_dir: Path,
+    *,
+    grid_size: int = 4,
+    db_path: Path | None = None,
+    db: ContinuumDb | None = None,
+    config: dict | None = None,
+    progress_callback: Callable[[str, float, str], None] | None = None,
+) -> dict:
+    """
+    Compress video: chunk -> describe -> generate -> diff -> minimize -> store.
+    Uses video_storage_tool for describe (Whisper + visual) and diff.
+    Returns dict with chunk_keys, script_path, diff_path, unique_chunk_refs.
+    """
+    config = config or {}
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    cb = progress_callback or (lambda _p, _v, _m: None)
+
+    tools = _load_video_tools()
+    if tools is None:
+        return _stub_compress(video_path, out_dir, grid_size, db_path, cb, db=db)
+
+    # A single video has nothing to overlap with across videos, so run the stages inline. With
+    # pipeline.overlap_t2v, text-to-video runs on a worker while diff inputs are prepared here.
+    overlap_t2v = bool(config.get("pipeline", {}).get("overlap_t2v", False))
+    job = _VideoJob(video_path, out_dir)
+    for stage in _video_stages(tools, config, cb, progress_callback):
+        if overlap_t2v and stage.name == "generate":
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                pending = pool.submit(stage.fn, job)
+                _prepare_diff(job, config)
+                pending.result()
+        else:
+            stage.fn(job)
+    return _finish_video_job(job, grid_size, db_path, db, config, cb)
+
+
+def batch_video_compress(
+    video_paths: list[Path],
+    out_root: Path,
+    *,
+    grid_size: int = 4,
+    db_path: Path | None = None,
+    db: ContinuumDb | None = None,
+    config: dict | None = None,
+    progress_callback: Callable[[str, float, str], None] | None = None,
+    prefetch: int = 2,
+) -> list[dict]:
+    """
+    video_compress over many videos with extract/describe/generate/diff overlapped across videos.
+    Each video writes to out_root/<stem>. Results are in input order; a video that fails gets
+    {"error": ..., "unique_chunk_refs": []} and does not stop the others. DB rows for the whole
+    batch are written in one transaction at the end.
+    """
+    config = config or {}
+    out_root = Path(out_root)
+    locked = _locked_callback(progress_callback)
+    cb = locked or (lambda _p, _v, _m: None)
+    if db is None and db_path:
+        db = _get_db(Path(db_path))
+
+    jobs = []
+    seen: dict[str, int] = {}
+    for p in video_paths:
+        p = Path(p)
+        n = seen[p.stem] = seen.get(p.stem, 0) + 1
+        out_dir = out_root / (p.stem if n == 1 else f"{p.stem}_{n}")
+        out_dir.mkdir(parents=True, exist_ok=True)
+        jobs.append(_VideoJob(p, out_dir))
+
+    tools = _load_video_tools()
+    if tools is None:
+        return [_stub_compress(j.video_path, j.out_dir, grid_size, db_path, cb, db=db) for j in jobs]
+
+    results = []
+    pending: list[tuple] = []
+    for job in _run_pipeline(jobs, _video_stages(tools, config, cb, locked), prefetch=prefetch):
+        if job.error is None:
+            try:
+                results.append(_finish_video_job(job, grid_size, db_path, db, config, cb, pending))
+                continue
+            except Exception as e:
+                job.error = e
+        _warn("video_compress failed for %s: %s", job.video_path, job.error)
+        results.append({"error": str(job.error), "unique_chunk_refs": []})
+    if pending:
+        _store_to_db(db_path, pending, db=db)
+    return results
+
+
 def _store_to_db(
-    db_path: Path,
-    source_path: Path,
-    script_path: Path,
-    diff_path: Path | None,
-    unique_refs: list[str],
-    media_type: str,
+    db_path: Path | None,
+    rows: list[tuple[Path, Path, Path | str | None, list[str], str]],
+    db: ContinuumDb | None = None,
 ) -> None:
-    from unified_semantic_archiver.db import ContinuumDb
+    """
+    Store (source_path, script_path, diff_path, unique_refs, media_type) rows: a semantic chunk per
+    row plus a pending unique kernel for each row with unique refs, all in one transaction.
+
+    One kernel per chunk, not per ref: unique_kernels has no column for the ref, so per-ref rows
+    were identical copies, and since unique_kernels became unique on (chunk_id, source_compressor)
+    further copies would only upsert into the first one (bumping attempt_count as if the chunk had
+    been retried). The refs themselves stay in the compress result's unique_chunk_refs.
+    """
+    if db is None:
+        db = _get_db(Path(db_path))
+    with db.bulk_load():
+        kernels = []
+        for source_path, script_path, diff_path, unique_refs, media_type in rows:
+            script_text = _script_excerpt(script_path) if script_path.exists() else ""
+            chunk_id = db.semantic_chunk_insert(
+                media_type=media_type,
+                chunk_key=source_path.name,
+                description_text=script_text,
+                diff_blob_ref=str(diff_path) if diff_path else None,
+            )
+            if unique_refs:
+                kernels.append((chunk_id, "video", None, 0, "pending"))
+        db.unique_kernel_insert_many(kernels)
 
-    db = ContinuumDb(db_path)
-    script_text = script_path.read_text(encoding="utf-8") if script_path.exists() else ""
-    chunk_id = db.semantic_chunk_insert(
-        media_type=media_type,
-        chunk_key=source_path.name,
-        description_text=script_text[:50000],
-        diff_blob_ref=str(diff_path) if diff_path else None,
-    )
-    for ref in unique_refs:
-        db.unique_kernel_insert(chunk_id=chunk_id, source_compressor="video", status="pending")
+
+def _script_excerpt(script_path: Path) -> str:
+    """First _SCRIPT_EXCERPT_BYTES of the script, cut back to a UTF-8 character boundary and decoded once."""
+    with open(script_path, "rb") as f:
+        buf = memoryview(f.read(_SCRIPT_EXCERPT_BYTES))
+    if len(buf) == _SCRIPT_EXCERPT_BYTES:
+        # Back up over continuation bytes (10xxxxxx) to the lead byte of the last character and
+        # drop that character if the cut left it incomplete.
+        i = len(buf) - 1
+        while i > 0 and len(buf) - i < 4 and buf[i] & 0xC0 == 0x80:
+            i -= 1
+        lead = buf[i]
+        need = 1 if lead < 0x80 else 2 if lead >> 5 == 0b110 else 3 if lead >> 4 == 0b1110 else 4
+        if len(buf) - i < need:
+            buf = buf[:i]
+    return str(buf, "utf-8", "replace")
 
 
 def _stub_compress(
@@ -160,13 +843,14 @@ def _stub_compress(
     grid_size: int,
     db_path: Path | None,
     cb: Callable[[str, float, str], None],
+    db: ContinuumDb | None = None,
 ) -> dict:
     """Fallback when video_storage_tool not available."""
     cb("stub", 1.0, "Video compressor stub (install video_storage_tool for full pipeline).")
     script_path = out_dir / "script.txt"
     script_path.write_text(f"[Stub: {video_path.name}]", encoding="utf-8")
-    if db_path:
-        _store_to_db(db_path, video_path, script_path, None, [], "video")
+    if db is not None or db_path:
+        _store_to_db(db_path, [(video_path, script_path, None, [], "video")], db=db)
     return {"script_path": str(script_path), "resultant_path": None, "diff_path": None, "unique_chunk_refs": []}
 
 
@@ -175,16 +859,33 @@ def image_compress(
     out_dir: Path,
     *,
     db_path: Path | None = None,
+    db: ContinuumDb | None = None,
     config: dict | None = None,
     progress_callback: Callable[[str, float, str], None] | None = None,
 ) -> dict:
-    """Image compressor: same pipeline as video but single frame. (Plan 3.1.1)"""
-    # Treat single image as 1-frame video; reuse video_compress with grid_size=1
-    return video_compress(
-        image_path,
-        out_dir,
-        grid_size=1,
-        db_path=db_path,
-        config=config,
-        progress_callback=progress_callback,
-    )
+    """
+    Image compressor: same pipeline as video but single frame. (Plan 3.1.1)
+    Skips audio extraction and diffs the image against the resultant's first frame into a PNG;
+    falls back to compute_diff when ffmpeg cannot produce the still diff.
+    """
+    config = config or {}
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    cb = progress_callback or (lambda _p, _v, _m: None)
+
+    tools = _load_video_tools()
+    if tools is None:
+        return _stub_compress(image_path, out_dir, 1, db_path, cb, db=db)
+
+    job = _VideoJob(image_path, out_dir)
+    stages = {st.name: st for st in _video_stages(tools, config, cb, progress_callback)}
+    stages["describe"].fn(job)
+    stages["generate"].fn(job)
+    cb("diffing", 0.7, "Computing image diff…")
+    kwargs = _diff_kwargs(config)
+    try:
+        job.diff_path = _image_diff(image_path, job.resultant_path, out_dir, kwargs["ffmpeg_path"] or "ffmpeg")
+    except (OSError, subprocess.SubprocessError) as e:
+        _warn("Image diff failed (%s); using compute_diff", e)
+        job.diff_path = tools.compute_diff(image_path, job.resultant_path, out_dir, **kwargs)
+    return _finish_video_job(job, 1, db_path, db, config, cb)
@@ -1,3 +1,4 @@
-from .continuum_db import ContinuumDb, get_connection, init_schema
+from .async_db import AsyncContinuumDb
+from .continuum_db import ContinuumDb, close_shared_dbs, get_connection, init_schema, shared_db
 
-__all__ = ["ContinuumDb", "get_connection", "init_schema"]
+__all__ = ["AsyncContinuumDb", "ContinuumDb", "close_shared_dbs", "get_connection", "init_schema", "shared_db"]
@@ -0,0 +1,100 @@
+"""
+Vectorized geo helpers for continuum_db: great-circle distance for the library_document_search
+refine pass (compiled with Numba, parallel over points, when installed; otherwise the same formula
+as NumPy array expressions) and batch geohash cells for library_document_insert_many (likewise
+a parallel Numba loop when installed).
+"""
+
+from __future__ import annotations
+
+import math
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None  # type: ignore[assignment]
+
+try:
+    from numba import njit, prange
+except ImportError:  # pragma: no cover - exercised only without numba
+    njit = None  # type: ignore[assignment]
+    prange = range
+
+# Same radius as continuum_db._haversine_mi, so both paths agree on the cut-off.
+EARTH_RADIUS_MI = 3958.8
+
+
+def _haversine_mi_loop(lat0, lon0, lats, lons, out):
+    """out[i] = distance in miles from (lat0, lon0) to (lats[i], lons[i]); same formula as _haversine_mi."""
+    rlat0 = math.radians(lat0)
+    rlon0 = math.radians(lon0)
+    c0 = math.cos(rlat0)
+    for i in prange(out.shape[0]):
+        rlat = math.radians(lats[i])
+        sa = math.sin((rlat - rlat0) * 0.5)
+        sb = math.sin((math.radians(lons[i]) - rlon0) * 0.5)
+        x = sa * sa + c0 * math.cos(rlat) * sb * sb
+        out[i] = 2 * EARTH_RADIUS_MI * math.asin(math.sqrt(min(1.0, x)))
+
+
+if njit is not None:
+    _haversine_mi_jit = njit(parallel=True, cache=True)(_haversine_mi_loop)
+
+
+def haversine_mi_vec(lat0: float, lon0: float, lats, lons):
+    """Distances in miles from one point to arrays of points; float64 array shaped like lats."""
+    if np is None:
+        raise RuntimeError("numpy is not installed")
+    lats = np.ascontiguousarray(lats, dtype=np.float64)
+    lons = np.ascontiguousarray(lons, dtype=np.float64)
+    if njit is not None:
+        out = np.empty_like(lats)
+        _haversine_mi_jit(float(lat0), float(lon0), lats, lons, out)
+        return out
+    rlats = np.radians(lats)
+    sa = np.sin((rlats - math.radians(lat0)) * 0.5)
+    sb = np.sin((np.radians(lons) - math.radians(lon0)) * 0.5)
+    x = sa * sa + math.cos(math.radians(lat0)) * np.cos(rlats) * sb * sb
+    return 2 * EARTH_RADIUS_MI * np.arcsin(np.sqrt(np.minimum(1.0, x)))
+
+
+def _geohash_cells_loop(lats, lons, precision, out):
+    """out[i, k] = geohash cell k of point i (lon3 << 2 | lat2), one row per point."""
+    lon_bits = 3 * precision
+    lat_bits = 2 * precision
+    lon_max = (1 << lon_bits) - 1
+    lat_max = (1 << lat_bits) - 1
+    for i in prange(out.shape[0]):
+        lon_i = min(max(int((lons[i] + 180.0) / 360.0 * (1 << lon_bits)), 0), lon_max)
+        lat_i = min(max(int((lats[i] + 90.0) / 180.0 * (1 << lat_bits)), 0), lat_max)
+        for k in range(precision):
+            lon3 = (lon_i >> (lon_bits - 3 * (k + 1))) & 7
+            lat2 = (lat_i >> (lat_bits - 2 * (k + 1))) & 3
+            out[i, k] = lon3 << 2 | lat2
+
+
+if njit is not None:
+    _geohash_cells_jit = njit(parallel=True, cache=True)(_geohash_cells_loop)
+
+
+def geohash_cells(lats, lons, precision: int):
+    """
+    Per-character geohash cells for arrays of points, as continuum_db._geohash_encode computes them:
+    integer (N, precision) array of lon3 << 2 | lat2, i.e. indices into its _GEOHASH_CHARS table.
+    """
+    if np is None:
+        raise RuntimeError("numpy is not installed")
+    lats = np.ascontiguousarray(lats, dtype=np.float64)
+    lons = np.ascontiguousarray(lons, dtype=np.float64)
+    if njit is not None:
+        out = np.empty((lats.shape[0], precision), dtype=np.uint8)
+        _geohash_cells_jit(lats, lons, precision, out)
+        return out
+    lon_bits, lat_bits = 3 * precision, 2 * precision
+    # Same float expression as the scalar encoder, so both truncate to the same cell.
+    lon_i = np.clip((lons + 180.0) / 360.0 * (1 << lon_bits), 0, (1 << lon_bits) - 1).astype(np.int64)
+    lat_i = np.clip((lats + 90.0) / 180.0 * (1 << lat_bits), 0, (1 << lat_bits) - 1).astype(np.int64)
+    k = np.arange(1, precision + 1, dtype=np.int64)
+    lon3 = (lon_i[:, None] >> (lon_bits - 3 * k)) & 7
+    lat2 = (lat_i[:, None] >> (lat_bits - 2 * k)) & 3
+    return lon3 << 2 | lat2
@@ -0,0 +1,73 @@
+"""
+asyncio front end for ContinuumDb: each call runs on a worker thread that checks out its own pooled
+connection, so concurrent awaits proceed in parallel up to the pool size (sqlite3 releases the GIL
+while SQLite works, and WAL lets readers run alongside a writer).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Coroutine
+
+from .continuum_db import _DEFAULT_MAX_POOL, ContinuumDb
+
+# Context-manager, lifecycle and generator methods that don't make sense as a single awaited call
+# (a generator's queries would run on the event loop thread as it is iterated).
+_NOT_DELEGATED = frozenset({"bulk_load", "bulk_mode", "close", "from_memory", "iter_pages", "unique_kernel_iter"})
+
+
+class AsyncContinuumDb:
+    """
+    Awaitable versions of every public ContinuumDb method, e.g.
+    `await adb.library_document_get(doc_id, tenant_id="team-a")`. File-backed databases only: the
+    in-memory connection cannot be shared across threads.
+    """
+
+    def __init__(self, db: ContinuumDb, max_workers: int | None = None):
+        if db._pool is None:
+            raise ValueError("AsyncContinuumDb needs a file-backed ContinuumDb")
+        self._db = db
+        # More workers than pooled connections would only queue inside the pool.
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or db._pool._max_pool, thread_name_prefix="continuum-db"
+        )
+
+    @classmethod
+    def open(cls, db_path: str | Path, max_pool: int = _DEFAULT_MAX_POOL) -> AsyncContinuumDb:
+        """Open (and schema-initialize) db_path with one worker thread per pooled connection."""
+        return cls(ContinuumDb(db_path, max_pool=max_pool))
+
+    @property
+    def db(self) -> ContinuumDb:
+        """The wrapped synchronous instance."""
+        return self._db
+
+    def __getattr__(self, name: str) -> Callable[..., Coroutine[Any, Any, Any]]:
+        if name.startswith("_") or name in _NOT_DELEGATED:
+            raise AttributeError(name)
+        method = getattr(self._db, name)
+        if not callable(method):
+            raise AttributeError(name)
+
+        @functools.wraps(method)
+        async def call(*args: Any, **kwargs: Any) -> Any:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, functools.partial(method, *args, **kwargs))
+
+        # Cache the wrapper so later lookups skip __getattr__.
+        setattr(self, name, call)
+        return call
+
+    async def close(self) -> None:
+        """Wait for in-flight calls, then close the pooled connections."""
+        await asyncio.get_running_loop().run_in_executor(None, self._executor.shutdown)
+        self._db.close()
+
+    async def __aenter__(self) -> AsyncContinuumDb:
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
@@ -5,13 +5,36 @@ Lightweight CRUD over SQLite; no heavy migrations.
 
 from __future__ import annotations
 
+import functools
+import hashlib
 import json
 import math
+import queue
 import sqlite3
+import threading
+import zlib
+from contextlib import AbstractContextManager, contextmanager
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable, Iterator, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None  # type: ignore[assignment]
+
+from ._geo_kernels import geohash_cells, haversine_mi_vec
 
 _SCHEMA_PATH = Path(__file__).resolve().parent / "schema.sql"
+_SCHEMA_SQL = _SCHEMA_PATH.read_text(encoding="utf-8")
+# Optional FTS5 index over library_documents; skipped on SQLite builds without FTS5 trigram.
+_FTS_SCHEMA_SQL = (_SCHEMA_PATH.parent / "schema_fts.sql").read_text(encoding="utf-8")
+# Stamped into PRAGMA user_version once the schema has run, so reopening an up-to-date file skips the DDL.
+# A file set up without FTS gets its own stamp, so opening it on a build with FTS5 adds the index.
+_SCHEMA_VERSION = zlib.crc32((_SCHEMA_SQL + _FTS_SCHEMA_SQL).encode("utf-8")) & 0x7FFFFFFF
+_SCHEMA_VERSION_NO_FTS = zlib.crc32(_SCHEMA_SQL.encode("utf-8")) & 0x7FFFFFFF
+# trigram FTS needs at least three characters; shorter q values use LIKE.
+_FTS_MIN_QUERY = 3
 
 # Geohash base32 alphabet (standard)
 _GEOHASH_ALPHABET = "0123456789bcdefghjkmnopqrstuvwxyz"
@@ -20,36 +43,53 @@ _GEOHASH_ALPHABET = "0123456789bcdefghjkmnopqrstuvwxyz"
 _EARTH_RADIUS_MI = 3958.8
 
 
+def _geohash_char(lon3: int, lat2: int) -> str:
+    bits = (lon3 & 4) << 2 | (lat2 & 2) << 2 | (lon3 & 2) << 1 | (lat2 & 1) << 1 | (lon3 & 1)
+    return _GEOHASH_ALPHABET[bits]
+
+
+# Each character packs 3 lon bits and 2 lat bits, interleaved lon-first; index = lon3 << 2 | lat2.
+# Kept as ASCII bytes so encoders index ints into a bytearray (or a numpy uint8 view) and decode once.
+_GEOHASH_CHARS = "".join(_geohash_char(i >> 2, i & 3) for i in range(32)).encode("ascii")
+
+
+@functools.lru_cache(maxsize=4096)
 def _geohash_encode(lat: float, lon: float, precision: int = 7) -> str:
-    """Encode lat/lon to base32 geohash (precision = character count)."""
-    lat_lo, lat_hi = -90.0, 90.0
-    lon_lo, lon_hi = -180.0, 180.0
-    bits = 0
-    bit = 0
-    result = []
-    while len(result) < precision:
-        if bit % 2 == 0:
-            mid = (lon_lo + lon_hi) / 2
-            if lon >= mid:
-                lon_lo = mid
-                bits = (bits << 1) + 1
-            else:
-                lon_hi = mid
-                bits <<= 1
-        else:
-            mid = (lat_lo + lat_hi) / 2
-            if lat >= mid:
-                lat_lo = mid
-                bits = (bits << 1) + 1
-            else:
-                lat_hi = mid
-                bits <<= 1
-        bit += 1
-        if bit == 5:
-            result.append(_GEOHASH_ALPHABET[bits])
-            bits = 0
-            bit = 0
-    return "".join(result)
+    """
+    Encode lat/lon to base32 geohash (precision = character count).
+    Quantizes each axis once to its full bit width and reads the characters off by table, instead of
+    bisecting bit by bit; cached because inserts often repeat coordinates.
+    """
+    lon_bits = 3 * precision
+    lat_bits = 2 * precision
+    lon_i = min(max(int((lon + 180.0) / 360.0 * (1 << lon_bits)), 0), (1 << lon_bits) - 1)
+    lat_i = min(max(int((lat + 90.0) / 180.0 * (1 << lat_bits)), 0), (1 << lat_bits) - 1)
+    out = bytearray(precision)
+    for k in range(precision):
+        lon_shift = lon_bits - 3 * (k + 1)
+        lat_shift = lat_bits - 2 * (k + 1)
+        out[k] = _GEOHASH_CHARS[((lon_i >> lon_shift) & 7) << 2 | ((lat_i >> lat_shift) & 3)]
+    return out.decode("ascii")
+
+
+def _geohash_encode_many(lats: Sequence[float], lons: Sequence[float], precision: int = 7) -> list[str]:
+    """_geohash_encode over parallel sequences, computed as one array pass when numpy is installed."""
+    if np is None or len(lats) < 2:
+        return [_geohash_encode(lat, lon, precision) for lat, lon in zip(lats, lons)]
+    table = np.frombuffer(_GEOHASH_CHARS, dtype=np.uint8)
+    chars = np.ascontiguousarray(table[geohash_cells(lats, lons, precision)])
+    return [b.decode("ascii") for b in chars.view(f"S{precision}").ravel().tolist()]
+
+
+@functools.lru_cache(maxsize=256)
+def _norm_tenant(tenant_id: str | None) -> str:
+    """Stripped tenant id, "default" when blank. Tenants are few, so results are cached."""
+    return (tenant_id or "").strip() or "default"
+
+
+def _now_iso() -> str:
+    """Current UTC time in SQLite's datetime('now') format, for binding as a timestamp parameter."""
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
 
 
 def _haversine_mi(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
@@ -60,76 +100,630 @@ def _haversine_mi(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     return 2 * _EARTH_RADIUS_MI * math.asin(math.sqrt(min(1.0, x)))
 
 
-def get_connection(db_path: str | Path) -> sqlite3.Connection:
+def _haversine_mi_cached(cos_lat1: float, lat1_rad: float, lon1_rad: float, lat2: float, lon2: float) -> float:
+    """_haversine_mi with the fixed point's radians and cos(lat) precomputed by the caller."""
+    lat2_rad = math.radians(lat2)
+    a = lat2_rad - lat1_rad
+    sa = math.sin(a * 0.5)
+    sb = math.sin((math.radians(lon2) - lon1_rad) * 0.5)
+    x = sa * sa + cos_lat1 * math.cos(lat2_rad) * sb * sb
+    return 2 * _EARTH_RADIUS_MI * math.asin(math.sqrt(min(1.0, x)))
+
+
+def _bbox_predicate(lat: float, lon: float, distance_mi: float) -> tuple[str, list[float]]:
+    """
+    SQL predicate for the lat/lon box containing every point within distance_mi of (lat, lon)
+    (exact spherical bounds, widened near the poles and split across the antimeridian), answered
+    from libdoc_rtree. R*Tree coordinates are float32 rounded outward, so callers must still
+    refine the candidates by exact distance.
+    """
+    r = distance_mi / _EARTH_RADIUS_MI
+    if r >= math.pi:
+        return " AND lat IS NOT NULL AND lon IS NOT NULL", []
+    d_lat = math.degrees(r)
+    lat_min, lat_max = lat - d_lat, lat + d_lat
+    if lat_min <= -90.0 or lat_max >= 90.0:
+        # Box covers a pole: every longitude qualifies.
+        boxes = [(max(lat_min, -90.0), min(lat_max, 90.0), -180.0, 180.0)]
+    else:
+        d_lon = math.degrees(math.asin(min(1.0, math.sin(r) / math.cos(math.radians(lat)))))
+        lon_min, lon_max = lon - d_lon, lon + d_lon
+        if lon_min < -180.0:
+            boxes = [(lat_min, lat_max, lon_min + 360.0, 180.0), (lat_min, lat_max, -180.0, lon_max)]
+        elif lon_max > 180.0:
+            boxes = [(lat_min, lat_max, lon_min, 180.0), (lat_min, lat_max, -180.0, lon_max - 360.0)]
+        else:
+            boxes = [(lat_min, lat_max, lon_min, lon_max)]
+    # One rtree scan per box; an OR inside a single scan would defeat the R*Tree index.
+    sub = " UNION ALL ".join([_SQL_LIBDOC_RTREE_BOX] * len(boxes))
+    return f" AND id IN ({sub})", [v for box in boxes for v in box]
+
+
+# WAL lets readers proceed while a writer commits; synchronous=NORMAL is durable
+# across application crashes under WAL and avoids an fsync per commit.
+_CONNECTION_PRAGMAS = """
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+PRAGMA temp_store=MEMORY;
+PRAGMA mmap_size=268435456;
+PRAGMA cache_size=-65536;
+PRAGMA busy_timeout=5000;
+"""
+
+# bulk_mode() settings (synchronous and checkpointing can only change outside a transaction) and
+# the _CONNECTION_PRAGMAS / SQLite defaults they replace.
+_BULK_MODE_PRAGMAS = ("PRAGMA synchronous=OFF", "PRAGMA wal_autocheckpoint=0", "PRAGMA cache_size=-524288")
+_BULK_MODE_RESTORE = ("PRAGMA synchronous=NORMAL", "PRAGMA wal_autocheckpoint=1000", "PRAGMA cache_size=-65536")
+
+# Per-connection LRU of compiled statements; large enough for every CRUD query below plus the
+# generated search/filter variants and the common IN-list sizes.
+_CACHED_STATEMENTS = 512
+
+# Connections kept open per file-backed ContinuumDb; more concurrent callers wait for one to free up.
+_DEFAULT_MAX_POOL = 8
+
+# Hot-path statements, defined once so every call hands sqlite3 the same string object.
+# Inserts report their id via cur.lastrowid, which sqlite3 captures inside the same execute() call;
+# "RETURNING id" would add a row fetch per insert (measured ~2-3x slower) and need SQLite 3.35+.
+_SQL_SPATIAL_4D_INSERT = "INSERT INTO spatial_4d (bounds4_json, payload_type, payload_id) VALUES (?, ?, ?)"
+_SQL_DOCUMENT_BLOB_INSERT = "INSERT INTO document_blobs (tar_hash, path, mime_type) VALUES (?, ?, ?)"
+_SQL_SEMANTIC_CHUNK_INSERT = """INSERT INTO semantic_chunks
+    (media_type, chunk_key, description_text, diff_blob_ref, parent_id, quad_path)
+    VALUES (?, ?, ?, ?, ?, ?)"""
+# Re-flagging a (chunk_id, source_compressor) pair bumps its attempt_count and keeps the lower
+# residual (scalar min() is NULL if either side is); a flagged_research row stays flagged.
+_SQL_UNIQUE_KERNEL_INSERT = """INSERT INTO unique_kernels
+    (chunk_id, source_compressor, residual_metric, attempt_count, status)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT(chunk_id, source_compressor) DO UPDATE SET
+        attempt_count = unique_kernels.attempt_count + 1,
+        residual_metric = COALESCE(
+            MIN(unique_kernels.residual_metric, excluded.residual_metric),
+            unique_kernels.residual_metric, excluded.residual_metric),
+        status = CASE WHEN unique_kernels.status = 'flagged_research' THEN unique_kernels.status
+            ELSE excluded.status END"""
+# lastrowid is stale when the upsert takes the UPDATE branch, so the single-row form reads the id back.
+_SQL_UNIQUE_KERNEL_ID = "SELECT id FROM unique_kernels WHERE chunk_id = ? AND source_compressor = ?"
+_SQL_UNIQUE_KERNEL_SET_STATUS = "UPDATE unique_kernels SET status = ? WHERE id"
+_SQL_COMPRESSION_RUN_INSERT = """INSERT INTO compression_runs
+    (media_id, strategy, config_json, output_hash)
+    VALUES (?, ?, ?, ?)"""
+# A suggestion already on file (same source and text) is left as is rather than stored again.
+_SQL_RESEARCH_SUGGESTION_INSERT = """INSERT INTO research_suggestions
+    (source, context_json, recommendation_text, status, fingerprint)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT(fingerprint) DO NOTHING"""
+_SQL_RESEARCH_SUGGESTION_BY_FINGERPRINT = "SELECT id FROM research_suggestions WHERE fingerprint = ?"
+_SQL_LIBRARY_DOCUMENT_INSERT = """INSERT INTO library_documents
+    (document_type, blob_ref, url, type_metadata, owner_id, tenant_id, lat, lon, altitude_m, geohash, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, datetime('now'))"""
+# Same expression as idx_libdoc_meta_name in schema.sql, so the planner can seek on it.
+_SQL_LIBDOC_META_NAME = (
+    "(CASE WHEN json_valid(type_metadata) THEN json_extract(type_metadata, '$.name') END)"
+)
+_SQL_LIBDOC_RTREE_BOX = (
+    "SELECT id FROM libdoc_rtree WHERE max_lat >= ? AND min_lat <= ? AND max_lon >= ? AND min_lon <= ?"
+)
+_SQL_ASTRAL_BODY_INSERT = """INSERT INTO astral_body_catalog
+    (body_id, name, kind, mass_kg, radius_m, parent_body_id, frame_id, tenant_id, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, datetime('now'))"""
+_SQL_ASTRAL_OBSERVER_SITE_INSERT = """INSERT INTO astral_observer_sites
+    (site_id, body_id, lat_deg, lon_deg, altitude_m, reference_frame, tenant_id, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, datetime('now'))"""
+_SQL_NASA_FILE_INSERT = """INSERT INTO nasa_file_registry
+    (file_type, source_url, local_path, checksum, valid_from, valid_to, format_version, tenant_id, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, datetime('now'))"""
+_SQL_EPHEMERIS_SAMPLE_INSERT = """INSERT INTO ephemeris_samples
+    (body_id, epoch_utc, position_x, position_y, position_z, velocity_x, velocity_y, velocity_z,
+    frame_id, source_file_id, tenant_id)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+_SQL_EPHEMERIS_NEAR_EPOCH = """SELECT * FROM (
+        SELECT * FROM (SELECT * FROM ephemeris_samples
+            WHERE body_id = ? AND tenant_id = ? AND epoch_utc <= ? ORDER BY epoch_utc DESC LIMIT ?)
+        UNION ALL
+        SELECT * FROM (SELECT * FROM ephemeris_samples
+            WHERE body_id = ? AND tenant_id = ? AND epoch_utc > ? ORDER BY epoch_utc ASC LIMIT ?)
+    )
+    ORDER BY ABS(julianday(epoch_utc) - julianday(?)) ASC
+    LIMIT ?"""
+_SQL_OCCLUSION_EVENT_INSERT = """INSERT INTO occlusion_events
+    (epoch_utc, source_body_id, target_body_id, occluder_body_id, occlusion_ratio, eclipse_type, tenant_id)
+    VALUES (?, ?, ?, ?, ?, ?, ?)"""
+_SQL_META_GET = "SELECT value FROM continuum_meta WHERE key = ?"
+# In-place update on an existing key (keeps its id) instead of OR REPLACE's delete + re-insert.
+_SQL_META_SET = """INSERT INTO continuum_meta (key, value, updated_at) VALUES (?, ?, datetime('now'))
+    ON CONFLICT(key) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at"""
+_SQL_LIBRARY_DOCUMENT_GET = "SELECT * FROM library_documents WHERE id = ? AND tenant_id = ?"
+_SQL_ASTRAL_BODY_GET = "SELECT * FROM astral_body_catalog WHERE body_id = ? AND tenant_id = ?"
+_SQL_ASTRAL_OBSERVER_SITE_GET = "SELECT * FROM astral_observer_sites WHERE site_id = ? AND tenant_id = ?"
+_SQL_NASA_FILE_GET = "SELECT * FROM nasa_file_registry WHERE id = ? AND tenant_id = ?"
+_SQL_EPHEMERIS_SAMPLE_GET = """SELECT * FROM ephemeris_samples
+    WHERE body_id = ? AND epoch_utc = ? AND tenant_id = ?
+    ORDER BY id DESC LIMIT 1"""
+_SQL_INGESTION_JOB_GET = "SELECT * FROM ingestion_jobs WHERE id = ? AND tenant_id = ?"
+_SQL_ENTROPY_RING_NODE_GET = "SELECT * FROM entropy_ring_nodes WHERE node_id = ?"
+_SQL_ENTROPY_CREDITS_GET = "SELECT * FROM entropy_credits WHERE tenant_id = ?"
+# Ingestion-job timestamps are bound (?1 = _now_iso()) rather than computed with datetime('now'),
+# so a loop of state transitions can share one timestamp string.
+_SQL_INGESTION_JOB_INSERT = """INSERT INTO ingestion_jobs (job_type, source, status, payload_json, tenant_id, updated_at)
+    VALUES (?2, ?3, ?4, ?5, ?6, ?1)"""
+_SQL_INGESTION_JOB_START = """UPDATE ingestion_jobs
+    SET status = 'running', started_at = COALESCE(started_at, ?1),
+    attempt_count = attempt_count + 1, updated_at = ?1
+    WHERE id = ?2 AND tenant_id = ?3 AND status IN ('pending','failed')"""
+_SQL_INGESTION_JOB_COMPLETE = """UPDATE ingestion_jobs
+    SET status = 'completed', finished_at = ?1, error_text = NULL, updated_at = ?1
+    WHERE id = ?2 AND tenant_id = ?3"""
+_SQL_INGESTION_JOB_FAIL = """UPDATE ingestion_jobs
+    SET status = 'failed', finished_at = ?1, error_text = ?2, updated_at = ?1
+    WHERE id = ?3 AND tenant_id = ?4"""
+
+
+# Dynamic-WHERE queries: one string per combination of filters, built once and reused so the
+# per-connection statement cache is hit without re-building and re-hashing the SQL each call.
+def _where_variants(
+    select: str, filters: Sequence[str], tail: str, required: Sequence[str] = ()
+) -> tuple[str, ...]:
+    """
+    All 2**len(filters) queries, indexed by a bitmask (bit i set = filters[i] present). Filters and
+    required are predicates ("status = ?"); required ones are in every variant, ahead of the rest.
+    """
+    variants = []
+    for mask in range(1 << len(filters)):
+        preds = [*required, *(f for i, f in enumerate(filters) if mask >> i & 1)]
+        variants.append(select + (" WHERE " + " AND ".join(preds) if preds else "") + tail)
+    return tuple(variants)
+
+
+# Newest-first pages; "id < ?" (before_id) seeks past the previous page instead of using OFFSET.
+_PAGE_TAIL = " ORDER BY id DESC LIMIT ?"
+# mask: 1 = before_id
+_SQL_SPATIAL_4D_LIST = _where_variants("SELECT * FROM spatial_4d", ("id < ?",), _PAGE_TAIL)
+_SQL_DOCUMENT_BLOB_LIST = _where_variants("SELECT * FROM document_blobs", ("id < ?",), _PAGE_TAIL)
+_SQL_COMPRESSION_RUN_LIST = _where_variants("SELECT * FROM compression_runs", ("id < ?",), _PAGE_TAIL)
+# fingerprint is left out: it is an internal dedup key, and bytes would not survive the JSON writers.
+_SQL_RESEARCH_SUGGESTION_LIST = _where_variants(
+    "SELECT id, source, context_json, recommendation_text, status, created_at FROM research_suggestions",
+    ("id < ?",),
+    _PAGE_TAIL,
+)
+# mask: 1 = media_type, 2 = before_id
+_SQL_SEMANTIC_CHUNK_LIST = _where_variants("SELECT * FROM semantic_chunks", ("media_type = ?", "id < ?"), _PAGE_TAIL)
+# mask: 1 = status, 2 = before_id
+_SQL_UNIQUE_KERNEL_LIST = _where_variants("SELECT * FROM unique_kernels", ("status = ?", "id < ?"), _PAGE_TAIL)
+# mask: 1 = document_type, 2 = before_id
+_SQL_LIBRARY_DOCUMENT_LIST = _where_variants(
+    "SELECT * FROM library_documents", ("document_type = ?", "id < ?"), _PAGE_TAIL, ("tenant_id = ?",)
+)
+# mask: 1 = file_type, 2 = before_id
+_SQL_NASA_FILE_LIST = _where_variants(
+    "SELECT * FROM nasa_file_registry", ("file_type = ?", "id < ?"), _PAGE_TAIL, ("tenant_id = ?",)
+)
+# mask: 1 = epoch_utc, 2 = target_body_id, 4 = before_id
+_SQL_OCCLUSION_EVENT_LIST = _where_variants(
+    "SELECT * FROM occlusion_events", ("epoch_utc = ?", "target_body_id = ?", "id < ?"), _PAGE_TAIL, ("tenant_id = ?",)
+)
+# mask: 1 = status, 2 = job_type, 4 = before_id
+_SQL_INGESTION_JOB_LIST = _where_variants(
+    "SELECT * FROM ingestion_jobs", ("status = ?", "job_type = ?", "id < ?"), _PAGE_TAIL, ("tenant_id = ?",)
+)
+
+# list_page() targets: list methods ordered by id DESC that take before_id.
+_PAGED_LISTS = frozenset({
+    "spatial_4d_list",
+    "document_blob_list",
+    "semantic_chunk_list",
+    "unique_kernel_list",
+    "compression_run_list",
+    "research_suggestion_list",
+    "library_document_list",
+    "nasa_file_list",
+    "occlusion_event_list",
+    "ingestion_job_list",
+})
+
+
+# Location fragments vary with the bounding-box shape, so these are built on first use instead.
+@functools.lru_cache(maxsize=64)
+def _sql_library_document_search(by_type: bool, by_meta_name: bool, q_mode: str, location: str, limited: bool) -> str:
+    """q_mode is "" (none), "fts" or "like"; location is "" (none), "geohash", or a _bbox_predicate fragment."""
+    sql = "SELECT * FROM library_documents WHERE tenant_id = ?"
+    if by_type:
+        sql += " AND document_type = ?"
+    if by_meta_name:
+        sql += f" AND {_SQL_LIBDOC_META_NAME} = ?"
+    if q_mode == "fts":
+        sql += " AND id IN (SELECT rowid FROM library_documents_fts WHERE library_documents_fts MATCH ?)"
+    elif q_mode == "like":
+        sql += " AND (type_metadata LIKE ? OR url LIKE ?)"
+    if location == "geohash":
+        sql += " AND geohash = ?"
+    else:
+        sql += location
+    sql += " ORDER BY id DESC"
+    return sql + " LIMIT ?" if limited else sql
+
+
+class _SharedConnection(sqlite3.Connection):
+    """
+    Connection reused across ContinuumDb calls (in-memory databases, the thread inside bulk_load()).
+    While defer_commit is set, per-method commits and `with` exits defer to the outer COMMIT.
+    """
+
+    defer_commit = False
+
+    def commit(self) -> None:
+        if not self.defer_commit:
+            super().commit()
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        if self.defer_commit:
+            return False
+        return super().__exit__(exc_type, exc, tb)
+
+
+def get_connection(
+    db_path: str | Path,
+    factory: type[sqlite3.Connection] = sqlite3.Connection,
+    check_same_thread: bool = True,
+) -> sqlite3.Connection:
     """Open connection to continuum DB; ensures schema exists."""
-    conn = sqlite3.connect(db_path)
+    conn = sqlite3.connect(
+        db_path, cached_statements=_CACHED_STATEMENTS, factory=factory, check_same_thread=check_same_thread
+    )
     conn.row_factory = sqlite3.Row
+    if not str(db_path).endswith(":memory:"):
+        conn.executescript(_CONNECTION_PRAGMAS)
     return conn
 
 
+class _Pool:
+    """
+    Up to max_pool open connections to one database file, handed out one caller at a time so each
+    keeps its page cache and statement cache warm between calls.
+    """
+
+    def __init__(self, db_path: Path, max_pool: int = _DEFAULT_MAX_POOL, read_only: bool = False):
+        self._db_path = db_path
+        self._max_pool = max_pool
+        self._read_only = read_only
+        self._idle: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+
+    def _checkout(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            grow = self._opened < self._max_pool
+            if grow:
+                self._opened += 1
+        if not grow:
+            return self._idle.get()
+        try:
+            # Checked out by one thread at a time, but not always the thread that opened it.
+            conn = get_connection(self._db_path, check_same_thread=False)
+            if self._read_only:
+                conn.execute("PRAGMA query_only=1")
+            return conn
+        except BaseException:
+            with self._lock:
+                self._opened -= 1
+            raise
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Check out a connection; commits (or rolls back on error) like `with conn:`, then returns it."""
+        conn = self._checkout()
+        try:
+            with conn:
+                yield conn
+        finally:
+            self._idle.put(conn)
+
+    def close(self) -> None:
+        """Close idle connections; ones checked out at the time are closed by the garbage collector."""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._opened -= 1
+
+
+def _begin_immediate(conn: sqlite3.Connection) -> None:
+    """
+    Take the write lock before a bulk insert, unless a transaction (e.g. bulk_load) is already open.
+    The implicit deferred BEGIN would take it at the first INSERT and can fail with SQLITE_BUSY
+    partway through if another writer got there first; waiting for it up front is retried under busy_timeout.
+    """
+    if not conn.in_transaction:
+        conn.execute("BEGIN IMMEDIATE")
+
+
+def _fetch_dicts(cur: sqlite3.Cursor) -> list[dict[str, Any]]:
+    """Materialize rows as dicts, resolving column names once per query instead of per Row key."""
+    cols = [d[0] for d in cur.description]
+    return [dict(zip(cols, r)) for r in cur.fetchall()]
+
+
+# Keys per IN (...) list in the *_get_many methods: SQLite builds before 3.32 cap a statement at
+# 999 parameters, and the fixed filters (tenant, body) need a few of those.
+_IN_CHUNK = 990
+
+
+@functools.lru_cache(maxsize=16)
+def _sql_in_list(select: str, n: int, tail: str = "") -> str:
+    """select + " IN (?, ?, ...)" with n placeholders + tail; cached since chunk sizes repeat."""
+    return f"{select} IN ({', '.join('?' * n)}){tail}"
+
+
+def _fetch_in_chunks(
+    conn: sqlite3.Connection, select: str, fixed: Sequence[Any], keys: Iterable[Any], tail: str = ""
+) -> Iterator[sqlite3.Row]:
+    """Rows for `select IN (keys)`, one query per _IN_CHUNK distinct keys; fixed params come first."""
+    keys = list(dict.fromkeys(keys))
+    for i in range(0, len(keys), _IN_CHUNK):
+        chunk = keys[i : i + _IN_CHUNK]
+        yield from conn.execute(_sql_in_list(select, len(chunk), tail), (*fixed, *chunk))
+
+
+# ephemeris_samples columns returned as float64 by _ephemeris_arrays (NULL -> nan).
+_EPHEMERIS_FLOAT_COLUMNS = frozenset(
+    ("position_x", "position_y", "position_z", "velocity_x", "velocity_y", "velocity_z")
+)
+
+
+def _ephemeris_arrays(cur: sqlite3.Cursor) -> dict[str, Any]:
+    """
+    ephemeris_samples rows as one array per column (structure of arrays): positions/velocities as
+    float64, epoch_utc as fixed-width unicode, other columns as object arrays.
+    """
+    if np is None:
+        raise RuntimeError("numpy is not installed")
+    names = [d[0] for d in cur.description]
+    rows = cur.fetchall()
+    columns = zip(*rows) if rows else ((),) * len(names)
+    out: dict[str, Any] = {}
+    for name, values in zip(names, columns):
+        if name in _EPHEMERIS_FLOAT_COLUMNS:
+            out[name] = np.array(values, dtype=np.float64)
+        elif name == "epoch_utc":
+            out[name] = np.array(values, dtype="U32")
+        else:
+            out[name] = np.array(values, dtype=object)
+    return out
+
+
+# Columns added to tables after they first shipped. CREATE TABLE IF NOT EXISTS only covers new files,
+# so init_schema adds these to older ones before schema.sql (which may index them) runs.
+_ADDED_COLUMNS = (("research_suggestions", "fingerprint", "BLOB"),)
+
+
+def _add_missing_columns(conn: sqlite3.Connection) -> None:
+    for table, column, decl in _ADDED_COLUMNS:
+        columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        if columns and column not in columns:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+
+
+def _suggestion_fingerprint(source: str, recommendation_text: str) -> bytes:
+    """Dedup key for research_suggestions: 128-bit blake2b of source, NUL, recommendation_text."""
+    return hashlib.blake2b(f"{source}\x00{recommendation_text}".encode("utf-8"), digest_size=16).digest()
+
+
 def init_schema(conn: sqlite3.Connection) -> None:
-    """Run schema.sql to create tables if not exist."""
-    with open(_SCHEMA_PATH, encoding="utf-8") as f:
-        conn.executescript(f.read())
+    """
+    Run schema.sql (all DDL) as one executescript to create tables if not exist, then schema_fts.sql
+    where the SQLite build supports it. Skipped when the database's user_version says this exact
+    schema, with or without FTS, already ran against it; left unstamped when the FTS script fails so the next open retries.
+    """
+    fts = _fts5_trigram_available()
+    version = _SCHEMA_VERSION if fts else _SCHEMA_VERSION_NO_FTS
+    if conn.execute("PRAGMA user_version").fetchone()[0] == version:
+        return
+    _add_missing_columns(conn)
+    conn.executescript(_SCHEMA_SQL)
+    if fts:
+        # executescript commits statement by statement; the explicit transaction lets a failure
+        # take the FTS table and its triggers back out together.
+        try:
+            conn.executescript(f"BEGIN;\n{_FTS_SCHEMA_SQL}\nCOMMIT;")
+        except sqlite3.OperationalError:
+            conn.rollback()
+            return
+    conn.execute(f"PRAGMA user_version = {version}")
     conn.commit()
 
 
+@functools.lru_cache(maxsize=1)
+def _fts5_trigram_available() -> bool:
+    """Whether the loaded SQLite library can build an FTS5 table with the trigram tokenizer (3.34+)."""
+    probe = sqlite3.connect(":memory:")
+    try:
+        probe.execute("CREATE VIRTUAL TABLE fts_probe USING fts5(x, tokenize='trigram')")
+        return True
+    except sqlite3.OperationalError:
+        return False
+    finally:
+        probe.close()
+
+
+def _has_fts(conn: sqlite3.Connection) -> bool:
+    """Whether schema_fts.sql created library_documents_fts in this database."""
+    row = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'library_documents_fts'").fetchone()
+    return row is not None
+
+
 class ContinuumDb:
     """Micro ORM for continuum SQLite database."""
 
-    def __init__(self, db_path: str | Path):
+    def __init__(self, db_path: str | Path, max_pool: int = _DEFAULT_MAX_POOL, read_only: bool = False):
+        """
+        Open (and schema-initialize) db_path. With read_only the pooled connections run with
+        PRAGMA query_only, so a reader such as the research context builder can never take the
+        write lock; any write method raises sqlite3.OperationalError.
+        """
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         conn = get_connection(self.db_path)
         init_schema(conn)
+        self._fts = _has_fts(conn)
         conn.close()
-
-    def _conn(self) -> sqlite3.Connection:
-        return get_connection(self.db_path)
+        self._pool: _Pool | None = _Pool(self.db_path, max_pool, read_only)
+        self._shared_conn: _SharedConnection | None = None
+        # bulk_load()'s connection, seen only by the thread that opened it; others keep using the pool.
+        self._bulk_local = threading.local()
+
+    @classmethod
+    def from_memory(cls) -> ContinuumDb:
+        """Schema-initialized in-memory database; its single connection lives as long as the instance."""
+        db = cls.__new__(cls)
+        db.db_path = Path(":memory:")
+        db._pool = None
+        conn = get_connection(":memory:", factory=_SharedConnection)
+        init_schema(conn)
+        db._fts = _has_fts(conn)
+        db._shared_conn = conn
+        db._bulk_local = threading.local()
+        return db
+
+    def close(self) -> None:
+        """Close the in-memory connection or the pooled file connections."""
+        if self._shared_conn is not None:
+            self._shared_conn.close()
+            self._shared_conn = None
+        if self._pool is not None:
+            self._pool.close()
+
+    def __enter__(self) -> ContinuumDb:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def _conn(self) -> AbstractContextManager[sqlite3.Connection]:
+        if self._shared_conn is not None:
+            return self._shared_conn
+        bulk = getattr(self._bulk_local, "conn", None)
+        if bulk is not None:
+            return bulk
+        return self._pool.connection()
+
+    def bulk_load(self) -> AbstractContextManager[ContinuumDb]:
+        """
+        Run every call this thread makes on this instance inside one BEGIN IMMEDIATE transaction.
+        Rolls back if the block raises. On a file-backed database, calls from other threads keep using
+        pooled connections (and wait on the write lock).
+        """
+        return self._bulk()
+
+    @contextmanager
+    def bulk_mode(self) -> Iterator[ContinuumDb]:
+        """
+        bulk_load() with durability traded for ingest speed: synchronous=OFF, WAL auto-checkpoints
+        off and a 512 MiB page cache until the transaction ends, then one truncating checkpoint.
+        Only for re-runnable ingestion: an OS crash or power loss can lose or corrupt the batch.
+        Inside an enclosing bulk_load()/bulk_mode() it just joins that transaction and leaves the
+        checkpoint to it.
+        """
+        enclosing = self._shared_conn or getattr(self._bulk_local, "conn", None)
+        nested = enclosing is not None and enclosing.defer_commit
+        with self._bulk(_BULK_MODE_PRAGMAS, _BULK_MODE_RESTORE):
+            yield self
+        # A nested exit runs while the outer transaction still holds the write lock.
+        if not nested and self._pool is not None:
+            with self._pool.connection() as c:
+                c.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    @contextmanager
+    def _bulk(self, pragmas: Sequence[str] = (), restore: Sequence[str] = ()) -> Iterator[ContinuumDb]:
+        """One transaction for this thread's calls on this instance; pragmas apply before BEGIN, restore after."""
+        shared = self._shared_conn or getattr(self._bulk_local, "conn", None)
+        if shared is not None and shared.defer_commit:
+            yield self
+            return
+        conn = shared or get_connection(self.db_path, factory=_SharedConnection)
+        for pragma in pragmas:
+            conn.execute(pragma)
+        conn.execute("BEGIN IMMEDIATE")
+        conn.defer_commit = True
+        if shared is None:
+            self._bulk_local.conn = conn
+        try:
+            yield self
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.defer_commit = False
+            if shared is None:
+                self._bulk_local.conn = None
+                conn.close()
+            else:
+                for pragma in restore:
+                    conn.execute(pragma)
 
     # --- continuum_meta ---
     def meta_get(self, key: str) -> str | None:
         with self._conn() as c:
-            row = c.execute("SELECT value FROM continuum_meta WHERE key = ?", (key,)).fetchone()
-            return row["value"] if row else None
+            row = c.execute(_SQL_META_GET, (key,)).fetchone()
+            return row[0] if row else None
+
+    def meta_get_many(self, keys: Iterable[str]) -> dict[str, str | None]:
+        """Values for the given keys in one query; keys that are not set are absent from the result."""
+        with self._conn() as c:
+            return {k: v for k, v in _fetch_in_chunks(c, "SELECT key, value FROM continuum_meta WHERE key", (), keys)}
 
     def meta_set(self, key: str, value: str) -> None:
         with self._conn() as c:
-            c.execute(
-                "INSERT OR REPLACE INTO continuum_meta (key, value, updated_at) VALUES (?, ?, datetime('now'))",
-                (key, value),
-            )
+            c.execute(_SQL_META_SET, (key, value))
             c.commit()
 
     # --- spatial_4d ---
     def spatial_4d_insert(self, bounds4_json: str, payload_type: str | None = None, payload_id: int | None = None) -> int:
         with self._conn() as c:
             cur = c.execute(
-                "INSERT INTO spatial_4d (bounds4_json, payload_type, payload_id) VALUES (?, ?, ?)",
+                _SQL_SPATIAL_4D_INSERT,
                 (bounds4_json, payload_type, payload_id),
             )
             c.commit()
             return cur.lastrowid
 
-    def spatial_4d_list(self, limit: int = 100) -> list[dict[str, Any]]:
+    def spatial_4d_list(self, limit: int = 100, before_id: int | None = None) -> list[dict[str, Any]]:
+        params = [] if before_id is None else [before_id]
+        params.append(limit)
         with self._conn() as c:
-            rows = c.execute("SELECT * FROM spatial_4d ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
-            return [dict(r) for r in rows]
+            return _fetch_dicts(c.execute(_SQL_SPATIAL_4D_LIST[before_id is not None], params))
 
     # --- document_blobs ---
     def document_blob_insert(self, tar_hash: str, path: str, mime_type: str | None = None) -> int:
         with self._conn() as c:
             cur = c.execute(
-                "INSERT INTO document_blobs (tar_hash, path, mime_type) VALUES (?, ?, ?)",
+                _SQL_DOCUMENT_BLOB_INSERT,
                 (tar_hash, path, mime_type),
             )
             c.commit()
             return cur.lastrowid
 
-    def document_blob_list(self, limit: int = 100) -> list[dict[str, Any]]:
+    def document_blob_insert_many(self, rows: Iterable[Sequence[Any]]) -> int:
+        """Bulk insert document blobs in one transaction. Each row is (tar_hash, path, mime_type)."""
         with self._conn() as c:
-            rows = c.execute("SELECT * FROM document_blobs ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
-            return [dict(r) for r in rows]
+            _begin_immediate(c)
+            cur = c.executemany(_SQL_DOCUMENT_BLOB_INSERT, rows)
+            c.commit()
+            return cur.rowcount
+
+    def document_blob_list(self, limit: int = 100, before_id: int | None = None) -> list[dict[str, Any]]:
+        params = [] if before_id is None else [before_id]
+        params.append(limit)
+        with self._conn() as c:
+            return _fetch_dicts(c.execute(_SQL_DOCUMENT_BLOB_LIST[before_id is not None], params))
 
     # --- semantic_chunks ---
     def semantic_chunk_insert(
@@ -143,23 +737,30 @@ class ContinuumDb:
     ) -> int:
         with self._conn() as c:
             cur = c.execute(
-                """INSERT INTO semantic_chunks (media_type, chunk_key, description_text, diff_blob_ref, parent_id, quad_path)
-                   VALUES (?, ?, ?, ?, ?, ?)""",
+                _SQL_SEMANTIC_CHUNK_INSERT,
                 (media_type, chunk_key, description_text, diff_blob_ref, parent_id, quad_path),
             )
             c.commit()
             return cur.lastrowid
 
-    def semantic_chunk_list(self, media_type: str | None = None, limit: int = 100) -> list[dict[str, Any]]:
+    def semantic_chunk_list(
+        self, media_type: str | None = None, limit: int = 100, before_id: int | None = None
+    ) -> list[dict[str, Any]]:
+        params: list[Any] = []
+        if media_type:
+            params.append(media_type)
+        if before_id is not None:
+            params.append(before_id)
+        params.append(limit)
+        mask = bool(media_type) | (before_id is not None) << 1
         with self._conn() as c:
-            if media_type:
-                rows = c.execute(
-                    "SELECT * FROM semantic_chunks WHERE media_type = ? ORDER BY id DESC LIMIT ?",
-                    (media_type, limit),
-                ).fetchall()
-            else:
-                rows = c.execute("SELECT * FROM semantic_chunks ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
-            return [dict(r) for r in rows]
+            return _fetch_dicts(c.execute(_SQL_SEMANTIC_CHUNK_LIST[mask], params))
+
+    def semantic_chunk_get_many(self, chunk_ids: Iterable[int]) -> dict[int, dict[str, Any]]:
+        """Semantic chunks by id, keyed by id; ids not found are absent."""
+        with self._conn() as c:
+            rows = _fetch_in_chunks(c, "SELECT * FROM semantic_chunks WHERE id", (), chunk_ids)
+            return {r["id"]: dict(r) for r in rows}
 
     # --- unique_kernels ---
     def unique_kernel_insert(
@@ -170,25 +771,54 @@ class ContinuumDb:
         attempt_count: int = 0,
         status: str = "pending",
     ) -> int:
+        """
+        Insert a unique kernel, or re-flag the existing row for (chunk_id, source_compressor).
+        Returns the row's id either way.
+        """
         with self._conn() as c:
             cur = c.execute(
-                """INSERT INTO unique_kernels (chunk_id, source_compressor, residual_metric, attempt_count, status)
-                   VALUES (?, ?, ?, ?, ?)""",
+                _SQL_UNIQUE_KERNEL_INSERT,
                 (chunk_id, source_compressor, residual_metric, attempt_count, status),
             )
+            # A NULL chunk_id never conflicts, so only a keyed row can have been updated in place.
+            kernel_id = (
+                cur.lastrowid
+                if chunk_id is None
+                else c.execute(_SQL_UNIQUE_KERNEL_ID, (chunk_id, source_compressor)).fetchone()[0]
+            )
             c.commit()
-            return cur.lastrowid
+            return kernel_id
+
+    def unique_kernel_insert_many(self, rows: Iterable[Sequence[Any]]) -> int:
+        """
+        Bulk insert unique kernels in one transaction, upserting like unique_kernel_insert.
+        Each row is (chunk_id, source_compressor, residual_metric, attempt_count, status).
+        Returns number of rows inserted or re-flagged.
+        """
+        with self._conn() as c:
+            _begin_immediate(c)
+            cur = c.executemany(_SQL_UNIQUE_KERNEL_INSERT, rows)
+            c.commit()
+            return cur.rowcount
 
-    def unique_kernel_list(self, status: str | None = None, limit: int = 100) -> list[dict[str, Any]]:
+    def unique_kernel_list(
+        self, status: str | None = None, limit: int = 100, before_id: int | None = None
+    ) -> list[dict[str, Any]]:
+        params: list[Any] = []
+        if status:
+            params.append(status)
+        if before_id is not None:
+            params.append(before_id)
+        params.append(limit)
+        mask = bool(status) | (before_id is not None) << 1
         with self._conn() as c:
-            if status:
-                rows = c.execute(
-                    "SELECT * FROM unique_kernels WHERE status = ? ORDER BY id DESC LIMIT ?",
-                    (status, limit),
-                ).fetchall()
-            else:
-                rows = c.execute("SELECT * FROM unique_kernels ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
-            return [dict(r) for r in rows]
+            return _fetch_dicts(c.execute(_SQL_UNIQUE_KERNEL_LIST[mask], params))
+
+    def unique_kernel_iter(
+        self, status: str | None = None, chunk_size: int = 100, before_id: int | None = None
+    ) -> Iterator[list[dict[str, Any]]]:
+        """unique_kernel_list in newest-first batches of chunk_size, fetched as the caller consumes them."""
+        return self.iter_pages("unique_kernel_list", chunk_size, before_id, status=status)
 
     def unique_kernel_update_status(self, kernel_id: int, status: str, residual_metric: float | None = None) -> None:
         with self._conn() as c:
@@ -204,6 +834,23 @@ class ContinuumDb:
                 )
             c.commit()
 
+    def unique_kernel_set_status(self, kernel_ids: Iterable[int], status: str) -> int:
+        """
+        Set status on many kernels in one transaction, one UPDATE ... WHERE id IN (...) per _IN_CHUNK
+        ids. Unlike unique_kernel_update_status, attempt_count is left alone. Returns rows updated.
+        """
+        keys = list(dict.fromkeys(kernel_ids))
+        if not keys:
+            return 0
+        n = 0
+        with self._conn() as c:
+            _begin_immediate(c)
+            for i in range(0, len(keys), _IN_CHUNK):
+                chunk = keys[i : i + _IN_CHUNK]
+                n += c.execute(_sql_in_list(_SQL_UNIQUE_KERNEL_SET_STATUS, len(chunk)), (status, *chunk)).rowcount
+            c.commit()
+        return n
+
     # --- compression_runs ---
     def compression_run_insert(
         self,
@@ -214,16 +861,17 @@ class ContinuumDb:
     ) -> int:
         with self._conn() as c:
             cur = c.execute(
-                "INSERT INTO compression_runs (media_id, strategy, config_json, output_hash) VALUES (?, ?, ?, ?)",
+                _SQL_COMPRESSION_RUN_INSERT,
                 (media_id, strategy, config_json, output_hash),
             )
             c.commit()
             return cur.lastrowid
 
-    def compression_run_list(self, limit: int = 100) -> list[dict[str, Any]]:
+    def compression_run_list(self, limit: int = 100, before_id: int | None = None) -> list[dict[str, Any]]:
+        params = [] if before_id is None else [before_id]
+        params.append(limit)
         with self._conn() as c:
-            rows = c.execute("SELECT * FROM compression_runs ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
-            return [dict(r) for r in rows]
+            return _fetch_dicts(c.execute(_SQL_COMPRESSION_RUN_LIST[before_id is not None], params))
 
     # --- research_suggestions ---
     def research_suggestion_insert(
@@ -233,18 +881,44 @@ class ContinuumDb:
         context_json: str | None = None,
         status: str = "pending",
     ) -> int:
+        """
+        Insert a suggestion and return its id. If the same source already made the same
+        recommendation, nothing is written and the existing row's id is returned.
+        """
+        fingerprint = _suggestion_fingerprint(source, recommendation_text)
         with self._conn() as c:
             cur = c.execute(
-                "INSERT INTO research_suggestions (source, context_json, recommendation_text, status) VALUES (?, ?, ?, ?)",
-                (source, context_json, recommendation_text, status),
+                _SQL_RESEARCH_SUGGESTION_INSERT,
+                (source, context_json, recommendation_text, status, fingerprint),
+            )
+            if cur.rowcount:
+                c.commit()
+                return cur.lastrowid
+            return c.execute(_SQL_RESEARCH_SUGGESTION_BY_FINGERPRINT, (fingerprint,)).fetchone()[0]
+
+    def research_suggestion_insert_many(self, rows: Iterable[Sequence[Any]]) -> int:
+        """
+        Bulk insert research suggestions in one transaction, skipping ones already on file as
+        research_suggestion_insert does. Each row is (source, recommendation_text, context_json, status),
+        as research_suggestion_insert takes them. Returns number of rows inserted.
+        """
+        with self._conn() as c:
+            _begin_immediate(c)
+            cur = c.executemany(
+                _SQL_RESEARCH_SUGGESTION_INSERT,
+                (
+                    (source, context_json, text, status, _suggestion_fingerprint(source, text))
+                    for source, text, context_json, status in rows
+                ),
             )
             c.commit()
-            return cur.lastrowid
+            return cur.rowcount
 
-    def research_suggestion_list(self, limit: int = 100) -> list[dict[str, Any]]:
+    def research_suggestion_list(self, limit: int = 100, before_id: int | None = None) -> list[dict[str, Any]]:
+        params = [] if before_id is None else [before_id]
+        params.append(limit)
         with self._conn() as c:
-            rows = c.execute("SELECT * FROM research_suggestions ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
-            return [dict(r) for r in rows]
+            return _fetch_dicts(c.execute(_SQL_RESEARCH_SUGGESTION_LIST[before_id is not None], params))
 
     # --- library_documents ---
     def library_document_insert(
@@ -262,46 +936,81 @@ class ContinuumDb:
         geohash = None
         if lat is not None and lon is not None:
             geohash = _geohash_encode(lat, lon, 7)
-        tenant = (tenant_id or "").strip() or "default"
+        tenant = _norm_tenant(tenant_id)
         meta_str = json.dumps(type_metadata) if isinstance(type_metadata, dict) else type_metadata
         with self._conn() as c:
             cur = c.execute(
-                """INSERT INTO library_documents
-                   (document_type, blob_ref, url, type_metadata, owner_id, tenant_id, lat, lon, altitude_m, geohash, updated_at)
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, datetime('now'))""",
+                _SQL_LIBRARY_DOCUMENT_INSERT,
                 (document_type, blob_ref, url, meta_str, owner_id, tenant, lat, lon, altitude_m, geohash),
             )
             c.commit()
             return cur.lastrowid
 
-    def library_document_get(self, doc_id: int, tenant_id: str = "default") -> dict[str, Any] | None:
-        tenant = (tenant_id or "").strip() or "default"
+    def library_document_insert_many(
+        self,
+        rows: Iterable[Sequence[Any]],
+        tenant_id: str = "default",
+    ) -> int:
+        """
+        Bulk insert library documents in one transaction, geohashing all located rows in one pass.
+        Each row is (document_type, blob_ref, url, type_metadata, owner_id, lat, lon, altitude_m);
+        type_metadata may be a dict. Returns number of rows inserted.
+        """
+        tenant = _norm_tenant(tenant_id)
+        rows = list(rows)
+        located = [i for i, r in enumerate(rows) if r[5] is not None and r[6] is not None]
+        geohashes: list[str | None] = [None] * len(rows)
+        lats = [rows[i][5] for i in located]
+        lons = [rows[i][6] for i in located]
+        for i, gh in zip(located, _geohash_encode_many(lats, lons)):
+            geohashes[i] = gh
+        params = (
+            (doc_type, blob_ref, url, json.dumps(meta) if isinstance(meta, dict) else meta, owner_id, tenant,
+             lat, lon, altitude_m, gh)
+            for (doc_type, blob_ref, url, meta, owner_id, lat, lon, altitude_m), gh in zip(rows, geohashes)
+        )
+        with self._conn() as c:
+            _begin_immediate(c)
+            cur = c.executemany(_SQL_LIBRARY_DOCUMENT_INSERT, params)
+            c.commit()
+            return cur.rowcount
+
+    def library_document_get(
+        self, doc_id: int, tenant_id: str = "default", as_row: bool = False
+    ) -> dict[str, Any] | sqlite3.Row | None:
+        tenant = _norm_tenant(tenant_id)
         with self._conn() as c:
-            row = c.execute(
-                "SELECT * FROM library_documents WHERE id = ? AND tenant_id = ?",
-                (doc_id, tenant),
-            ).fetchone()
-            return dict(row) if row else None
+            row = c.execute(_SQL_LIBRARY_DOCUMENT_GET, (doc_id, tenant)).fetchone()
+            return row if as_row or row is None else dict(row)
+
+    def library_document_get_many(
+        self, doc_ids: Iterable[int], tenant_id: str = "default"
+    ) -> dict[int, dict[str, Any]]:
+        """library_document_get for several ids at once, keyed by id; ids not found are absent."""
+        tenant = _norm_tenant(tenant_id)
+        with self._conn() as c:
+            rows = _fetch_in_chunks(c, "SELECT * FROM library_documents WHERE tenant_id = ? AND id", (tenant,), doc_ids)
+            return {r["id"]: dict(r) for r in rows}
 
     def library_document_list(
         self,
         document_type: str | None = None,
         tenant_id: str = "default",
         limit: int = 100,
-    ) -> list[dict[str, Any]]:
-        tenant = (tenant_id or "").strip() or "default"
+        as_rows: bool = False,
+        before_id: int | None = None,
+    ) -> list[dict[str, Any]] | list[sqlite3.Row]:
+        tenant = _norm_tenant(tenant_id)
+        params: list[Any] = [tenant]
+        if document_type:
+            params.append(document_type)
+        if before_id is not None:
+            params.append(before_id)
+        params.append(limit)
+        mask = bool(document_type) | (before_id is not None) << 1
         with self._conn() as c:
-            if document_type:
-                rows = c.execute(
-                    "SELECT * FROM library_documents WHERE tenant_id = ? AND document_type = ? ORDER BY id DESC LIMIT ?",
-                    (tenant, document_type, limit),
-                ).fetchall()
-            else:
-                rows = c.execute(
-                    "SELECT * FROM library_documents WHERE tenant_id = ? ORDER BY id DESC LIMIT ?",
-                    (tenant, limit),
-                ).fetchall()
-            return [dict(r) for r in rows]
+            cur = c.execute(_SQL_LIBRARY_DOCUMENT_LIST[mask], params)
+            return cur.fetchall() if as_rows else _fetch_dicts(cur)
 
     def library_document_search(
         self,
@@ -312,39 +1021,75 @@ class ContinuumDb:
         distance_mi: float | str | None = None,
         tenant_id: str = "default",
         limit: int = 100,
-    ) -> list[dict[str, Any]]:
-        tenant = (tenant_id or "").strip() or "default"
-        with self._conn() as c:
-            sql = "SELECT * FROM library_documents WHERE tenant_id = ?"
-            params: list[Any] = [tenant]
-            if document_type:
-                sql += " AND document_type = ?"
-                params.append(document_type)
-            if q:
-                sql += " AND (type_metadata LIKE ? OR url LIKE ?)"
-                params.extend([f"%{q}%", f"%{q}%"])
-            sql += " ORDER BY id DESC"
-            rows = c.execute(sql, params).fetchall()
-            rows = [dict(r) for r in rows]
-
-        # Location filter in Python (Haversine / same bucket)
+        meta_name: str | None = None,
+        as_rows: bool = False,
+    ) -> list[dict[str, Any]] | list[sqlite3.Row]:
+        """
+        Tenant documents, newest first. meta_name matches type_metadata's "name" exactly through
+        an index; q is a case-insensitive substring match over type_metadata and url, served by
+        library_documents_fts when available (LIKE scan otherwise, or for q under 3 characters).
+        as_rows returns the sqlite3.Row objects instead of copying each into a dict.
+        """
+        tenant = _norm_tenant(tenant_id)
+        params: list[Any] = [tenant]
+        if document_type:
+            params.append(document_type)
+        if meta_name is not None:
+            params.append(meta_name)
+        q_mode = ""
+        if q and self._fts and len(q) >= _FTS_MIN_QUERY:
+            q_mode = "fts"
+            params.append('"' + q.replace('"', '""') + '"')
+        elif q:
+            q_mode = "like"
+            params.extend([f"%{q}%", f"%{q}%"])
+
+        # Location filter: geohash bucket or bounding box in SQL, exact Haversine on what survives.
+        dist = None
         if lat is not None and lon is not None and distance_mi is not None and distance_mi != "infinite":
             try:
                 dist = float(distance_mi)
             except (TypeError, ValueError):
                 dist = None
-            if dist is not None:
-                if dist == 0:
-                    bucket = _geohash_encode(lat, lon, 7)
-                    rows = [r for r in rows if r.get("geohash") == bucket]
-                else:
-                    rows = [
-                        r for r in rows
-                        if r.get("lat") is not None and r.get("lon") is not None
-                        and _haversine_mi(lat, lon, float(r["lat"]), float(r["lon"])) <= dist
-                    ]
-
-        return rows[:limit]
+        location = ""
+        refine = False
+        if dist is not None:
+            if dist == 0:
+                location = "geohash"
+                params.append(_geohash_encode(lat, lon, 7))
+            else:
+                location, box_params = _bbox_predicate(lat, lon, dist)
+                params.extend(box_params)
+                refine = True
+        if not refine:
+            params.append(limit)
+        sql = _sql_library_document_search(bool(document_type), meta_name is not None, q_mode, location, not refine)
+
+        with self._conn() as c:
+            cur = c.execute(sql, params)
+            if not refine:
+                return cur.fetchall() if as_rows else _fetch_dicts(cur)
+            cols = [d[0] for d in cur.description]
+            i_lat, i_lon = cols.index("lat"), cols.index("lon")
+            if np is None:
+                lat_rad, lon_rad = math.radians(lat), math.radians(lon)
+                cos_lat = math.cos(lat_rad)
+                rows = []
+                for r in cur:
+                    if _haversine_mi_cached(cos_lat, lat_rad, lon_rad, float(r[i_lat]), float(r[i_lon])) <= dist:
+                        rows.append(r if as_rows else dict(zip(cols, r)))
+                        if len(rows) >= limit:
+                            break
+                return rows
+            candidates = cur.fetchall()
+        if not candidates:
+            return []
+        lats = np.fromiter((r[i_lat] for r in candidates), float, len(candidates))
+        lons = np.fromiter((r[i_lon] for r in candidates), float, len(candidates))
+        keep = np.flatnonzero(haversine_mi_vec(lat, lon, lats, lons) <= dist)[:limit]
+        if as_rows:
+            return [candidates[i] for i in keep.tolist()]
+        return [dict(zip(cols, candidates[i])) for i in keep.tolist()]
 
     # --- astral_body_catalog ---
     def astral_body_insert(
@@ -358,45 +1103,52 @@ class ContinuumDb:
         frame_id: str | None = None,
         tenant_id: str = "default",
     ) -> int:
-        tenant = (tenant_id or "").strip() or "default"
+        tenant = _norm_tenant(tenant_id)
         with self._conn() as c:
             cur = c.execute(
-                """INSERT INTO astral_body_catalog
-                   (body_id, name, kind, mass_kg, radius_m, parent_body_id, frame_id, tenant_id, updated_at)
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, datetime('now'))""",
+                _SQL_ASTRAL_BODY_INSERT,
                 (body_id, name, kind, mass_kg, radius_m, parent_body_id, frame_id, tenant),
             )
             c.commit()
             return cur.lastrowid
 
-    def astral_body_get(self, body_id: str, tenant_id: str = "default") -> dict[str, Any] | None:
-        tenant = (tenant_id or "").strip() or "default"
+    def astral_body_get(
+        self, body_id: str, tenant_id: str = "default", as_row: bool = False
+    ) -> dict[str, Any] | sqlite3.Row | None:
+        tenant = _norm_tenant(tenant_id)
         with self._conn() as c:
-            row = c.execute(
-                "SELECT * FROM astral_body_catalog WHERE body_id = ? AND tenant_id = ?",
-                (body_id, tenant),
-            ).fetchone()
-            return dict(row) if row else None
+            row = c.execute(_SQL_ASTRAL_BODY_GET, (body_id, tenant)).fetchone()
+            return row if as_row or row is None else dict(row)
+
+    def astral_body_get_many(self, body_ids: Iterable[str], tenant_id: str = "default") -> dict[str, dict[str, Any]]:
+        """astral_body_get for several bodies at once, keyed by body_id; ids not found are absent."""
+        tenant = _norm_tenant(tenant_id)
+        with self._conn() as c:
+            rows = _fetch_in_chunks(
+                c, "SELECT * FROM astral_body_catalog WHERE tenant_id = ? AND body_id", (tenant,), body_ids
+            )
+            return {r["body_id"]: dict(r) for r in rows}
 
     def astral_body_list(
         self,
         kind: str | None = None,
         tenant_id: str = "default",
         limit: int = 500,
-    ) -> list[dict[str, Any]]:
-        tenant = (tenant_id or "").strip() or "default"
+        as_rows: bool = False,
+    ) -> list[dict[str, Any]] | list[sqlite3.Row]:
+        tenant = _norm_tenant(tenant_id)
         with self._conn() as c:
             if kind:
-                rows = c.execute(
+                cur = c.execute(
                     "SELECT * FROM astral_body_catalog WHERE tenant_id = ? AND kind = ? ORDER BY body_id LIMIT ?",
                     (tenant, kind, limit),
-                ).fetchall()
+                )
             else:
-                rows = c.execute(
+                cur = c.execute(
                     "SELECT * FROM astral_body_catalog WHERE tenant_id = ? ORDER BY body_id LIMIT ?",
                     (tenant, limit),
-                ).fetchall()
-            return [dict(r) for r in rows]
+                )
+            return cur.fetchall() if as_rows else _fetch_dicts(cur)
 
     # --- astral_observer_sites ---
     def astral_observer_site_insert(
@@ -409,45 +1161,43 @@ class ContinuumDb:
         reference_frame: str | None = None,
         tenant_id: str = "default",
     ) -> int:
-        tenant = (tenant_id or "").strip() or "default"
+        tenant = _norm_tenant(tenant_id)
         with self._conn() as c:
             cur = c.execute(
-                """INSERT INTO astral_observer_sites
-                   (site_id, body_id, lat_deg, lon_deg, altitude_m, reference_frame, tenant_id, updated_at)
-                   VALUES (?, ?, ?, ?, ?, ?, ?, datetime('now'))""",
+                _SQL_ASTRAL_OBSERVER_SITE_INSERT,
                 (site_id, body_id, lat_deg, lon_deg, altitude_m, reference_frame, tenant),
             )
             c.commit()
             return cur.lastrowid
 
-    def astral_observer_site_get(self, site_id: str, tenant_id: str = "default") -> dict[str, Any] | None:
-        tenant = (tenant_id or "").strip() or "default"
+    def astral_observer_site_get(
+        self, site_id: str, tenant_id: str = "default", as_row: bool = False
+    ) -> dict[str, Any] | sqlite3.Row | None:
+        tenant = _norm_tenant(tenant_id)
         with self._conn() as c:
-            row = c.execute(
-                "SELECT * FROM astral_observer_sites WHERE site_id = ? AND tenant_id = ?",
-                (site_id, tenant),
-            ).fetchone()
-            return dict(row) if row else None
+            row = c.execute(_SQL_ASTRAL_OBSERVER_SITE_GET, (site_id, tenant)).fetchone()
+            return row if as_row or row is None else dict(row)
 
     def astral_observer_site_list(
         self,
         body_id: str | None = None,
         tenant_id: str = "default",
         limit: int = 200,
-    ) -> list[dict[str, Any]]:
-        tenant = (tenant_id or "").strip() or "default"
+        as_rows: bool = False,
+    ) -> list[dict[str, Any]] | list[sqlite3.Row]:
+        tenant = _norm_tenant(tenant_id)
         with self._conn() as c:
             if body_id:
-                rows = c.execute(
+                cur = c.execute(
                     "SELECT * FROM astral_observer_sites WHERE tenant_id = ? AND body_id = ? ORDER BY site_id LIMIT ?",
                     (tenant, body_id, limit),
-                ).fetchall()
+                )
             else:
-                rows = c.execute(
+                cur = c.execute(
                     "SELECT * FROM astral_observer_sites WHERE tenant_id = ? ORDER BY site_id LIMIT ?",
                     (tenant, limit),
-                ).fetchall()
-            return [dict(r) for r in rows]
+                )
+            return cur.fetchall() if as_rows else _fetch_dicts(cur)
 
     # --- nasa_file_registry ---
     def nasa_file_insert(
@@ -461,45 +1211,51 @@ class ContinuumDb:
         format_version: str | None = None,
         tenant_id: str = "default",
     ) -> int:
-        tenant = (tenant_id or "").strip() or "default"
+        tenant = _norm_tenant(tenant_id)
         with self._conn() as c:
             cur = c.execute(
-                """INSERT INTO nasa_file_registry
-                   (file_type, source_url, local_path, checksum, valid_from, valid_to, format_version, tenant_id, updated_at)
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, datetime('now'))""",
+                _SQL_NASA_FILE_INSERT,
                 (file_type, source_url, local_path, checksum, valid_from, valid_to, format_version, tenant),
             )
             c.commit()
             return cur.lastrowid
 
-    def nasa_file_get(self, file_id: int, tenant_id: str = "default") -> dict[str, Any] | None:
-        tenant = (tenant_id or "").strip() or "default"
+    def nasa_file_get(
+        self, file_id: int, tenant_id: str = "default", as_row: bool = False
+    ) -> dict[str, Any] | sqlite3.Row | None:
+        tenant = _norm_tenant(tenant_id)
         with self._conn() as c:
-            row = c.execute(
-                "SELECT * FROM nasa_file_registry WHERE id = ? AND tenant_id = ?",
-                (file_id, tenant),
-            ).fetchone()
-            return dict(row) if row else None
+            row = c.execute(_SQL_NASA_FILE_GET, (file_id, tenant)).fetchone()
+            return row if as_row or row is None else dict(row)
+
+    def nasa_file_get_many(self, file_ids: Iterable[int], tenant_id: str = "default") -> dict[int, dict[str, Any]]:
+        """nasa_file_get for several ids at once, keyed by id; ids not found are absent."""
+        tenant = _norm_tenant(tenant_id)
+        with self._conn() as c:
+            rows = _fetch_in_chunks(
+                c, "SELECT * FROM nasa_file_registry WHERE tenant_id = ? AND id", (tenant,), file_ids
+            )
+            return {r["id"]: dict(r) for r in rows}
 
     def nasa_file_list(
         self,
         file_type: str | None = None,
         tenant_id: str = "default",
         limit: int = 200,
-    ) -> list[dict[str, Any]]:
-        tenant = (tenant_id or "").strip() or "default"
+        as_rows: bool = False,
+        before_id: int | None = None,
+    ) -> list[dict[str, Any]] | list[sqlite3.Row]:
+        tenant = _norm_tenant(tenant_id)
+        params: list[Any] = [tenant]
+        if file_type:
+            params.append(file_type)
+        if before_id is not None:
+            params.append(before_id)
+        params.append(limit)
+        mask = bool(file_type) | (before_id is not None) << 1
         with self._conn() as c:
-            if file_type:
-                rows = c.execute(
-                    "SELECT * FROM nasa_file_registry WHERE tenant_id = ? AND file_type = ? ORDER BY id DESC LIMIT ?",
-                    (tenant, file_type, limit),
-                ).fetchall()
-            else:
-                rows = c.execute(
-                    "SELECT * FROM nasa_file_registry WHERE tenant_id = ? ORDER BY id DESC LIMIT ?",
-                    (tenant, limit),
-                ).fetchall()
-            return [dict(r) for r in rows]
+            cur = c.execute(_SQL_NASA_FILE_LIST[mask], params)
+            return cur.fetchall() if as_rows else _fetch_dicts(cur)
 
     # --- ephemeris_samples ---
     def ephemeris_sample_insert(
@@ -516,34 +1272,69 @@ class ContinuumDb:
         source_file_id: int | None = None,
         tenant_id: str = "default",
     ) -> int:
-        tenant = (tenant_id or "").strip() or "default"
+        tenant = _norm_tenant(tenant_id)
         with self._conn() as c:
             cur = c.execute(
-                """INSERT INTO ephemeris_samples
-                   (body_id, epoch_utc, position_x, position_y, position_z, velocity_x, velocity_y, velocity_z,
-                    frame_id, source_file_id, tenant_id)
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                _SQL_EPHEMERIS_SAMPLE_INSERT,
                 (body_id, epoch_utc, position_x, position_y, position_z, velocity_x, velocity_y, velocity_z,
                  frame_id, source_file_id, tenant),
             )
             c.commit()
             return cur.lastrowid
 
+    def ephemeris_sample_insert_many(
+        self,
+        rows: Iterable[Sequence[Any]],
+        tenant_id: str = "default",
+    ) -> int:
+        """
+        Bulk insert ephemeris samples in one transaction.
+        Each row is (body_id, epoch_utc, position_x, position_y, position_z,
+        velocity_x, velocity_y, velocity_z, frame_id, source_file_id).
+        Returns number of rows inserted.
+        """
+        tenant = _norm_tenant(tenant_id)
+        with self._conn() as c:
+            _begin_immediate(c)
+            cur = c.executemany(
+                _SQL_EPHEMERIS_SAMPLE_INSERT,
+                ((*r, tenant) for r in rows),
+            )
+            c.commit()
+            return cur.rowcount
+
     def ephemeris_sample_get(
         self,
         body_id: str,
         epoch_utc: str,
         tenant_id: str = "default",
-    ) -> dict[str, Any] | None:
-        tenant = (tenant_id or "").strip() or "default"
+        as_row: bool = False,
+    ) -> dict[str, Any] | sqlite3.Row | None:
+        tenant = _norm_tenant(tenant_id)
         with self._conn() as c:
-            row = c.execute(
-                """SELECT * FROM ephemeris_samples
-                   WHERE body_id = ? AND epoch_utc = ? AND tenant_id = ?
-                   ORDER BY id DESC LIMIT 1""",
-                (body_id, epoch_utc, tenant),
-            ).fetchone()
-            return dict(row) if row else None
+            row = c.execute(_SQL_EPHEMERIS_SAMPLE_GET, (body_id, epoch_utc, tenant)).fetchone()
+            return row if as_row or row is None else dict(row)
+
+    def ephemeris_sample_get_many(
+        self,
+        body_id: str,
+        epochs_utc: Iterable[str],
+        tenant_id: str = "default",
+    ) -> dict[str, dict[str, Any]]:
+        """
+        ephemeris_sample_get for several epochs of one body, keyed by epoch_utc; like the single
+        get, the newest row wins when an epoch was stored more than once.
+        """
+        tenant = _norm_tenant(tenant_id)
+        with self._conn() as c:
+            rows = _fetch_in_chunks(
+                c,
+                "SELECT * FROM ephemeris_samples WHERE tenant_id = ? AND body_id = ? AND epoch_utc",
+                (tenant, body_id),
+                epochs_utc,
+                " ORDER BY id",
+            )
+            return {r["epoch_utc"]: dict(r) for r in rows}
 
     def ephemeris_sample_list_near_epoch(
         self,
@@ -551,17 +1342,22 @@ class ContinuumDb:
         epoch_utc: str,
         tenant_id: str = "default",
         limit: int = 10,
-    ) -> list[dict[str, Any]]:
-        tenant = (tenant_id or "").strip() or "default"
+        as_rows: bool = False,
+        as_arrays: bool = False,
+    ) -> list[dict[str, Any]] | list[sqlite3.Row] | dict[str, Any]:
+        """
+        The limit samples closest in time to epoch_utc. Takes up to limit rows on each side of
+        epoch_utc from the (tenant_id, body_id, epoch_utc) index and ranks only those, so epochs
+        must share one ISO-8601 layout (text order = time order), as the ingestion writes them.
+        as_rows returns sqlite3.Row objects; as_arrays returns one NumPy array per column.
+        """
+        tenant = _norm_tenant(tenant_id)
         with self._conn() as c:
-            rows = c.execute(
-                """SELECT * FROM ephemeris_samples
-                   WHERE body_id = ? AND tenant_id = ?
-                   ORDER BY ABS(julianday(epoch_utc) - julianday(?)) ASC
-                   LIMIT ?""",
-                (body_id, tenant, epoch_utc, limit),
-            ).fetchall()
-            return [dict(r) for r in rows]
+            side = (body_id, tenant, epoch_utc, limit)
+            cur = c.execute(_SQL_EPHEMERIS_NEAR_EPOCH, side + side + (epoch_utc, limit))
+            if as_arrays:
+                return _ephemeris_arrays(cur)
+            return cur.fetchall() if as_rows else _fetch_dicts(cur)
 
     # --- occlusion_events ---
     def occlusion_event_insert(
@@ -574,38 +1370,57 @@ class ContinuumDb:
         eclipse_type: str | None = None,
         tenant_id: str = "default",
     ) -> int:
-        tenant = (tenant_id or "").strip() or "default"
+        tenant = _norm_tenant(tenant_id)
         with self._conn() as c:
             cur = c.execute(
-                """INSERT INTO occlusion_events
-                   (epoch_utc, source_body_id, target_body_id, occluder_body_id, occlusion_ratio, eclipse_type, tenant_id)
-                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                _SQL_OCCLUSION_EVENT_INSERT,
                 (epoch_utc, source_body_id, target_body_id, occluder_body_id, occlusion_ratio, eclipse_type, tenant),
             )
             c.commit()
             return cur.lastrowid
 
+    def occlusion_event_insert_many(
+        self,
+        rows: Iterable[Sequence[Any]],
+        tenant_id: str = "default",
+    ) -> int:
+        """
+        Bulk insert occlusion events in one transaction.
+        Each row is (epoch_utc, source_body_id, target_body_id, occluder_body_id, occlusion_ratio, eclipse_type).
+        Returns number of rows inserted.
+        """
+        tenant = _norm_tenant(tenant_id)
+        with self._conn() as c:
+            _begin_immediate(c)
+            cur = c.executemany(
+                _SQL_OCCLUSION_EVENT_INSERT,
+                ((*r, tenant) for r in rows),
+            )
+            c.commit()
+            return cur.rowcount
+
     def occlusion_event_list(
         self,
         epoch_utc: str | None = None,
         target_body_id: str | None = None,
         tenant_id: str = "default",
         limit: int = 200,
-    ) -> list[dict[str, Any]]:
-        tenant = (tenant_id or "").strip() or "default"
+        as_rows: bool = False,
+        before_id: int | None = None,
+    ) -> list[dict[str, Any]] | list[sqlite3.Row]:
+        tenant = _norm_tenant(tenant_id)
         with self._conn() as c:
-            sql = "SELECT * FROM occlusion_events WHERE tenant_id = ?"
             params: list[Any] = [tenant]
             if epoch_utc:
-                sql += " AND epoch_utc = ?"
                 params.append(epoch_utc)
             if target_body_id:
-                sql += " AND target_body_id = ?"
                 params.append(target_body_id)
-            sql += " ORDER BY id DESC LIMIT ?"
+            if before_id is not None:
+                params.append(before_id)
             params.append(limit)
-            rows = c.execute(sql, params).fetchall()
-            return [dict(r) for r in rows]
+            mask = bool(epoch_utc) | bool(target_body_id) << 1 | (before_id is not None) << 2
+            cur = c.execute(_SQL_OCCLUSION_EVENT_LIST[mask], params)
+            return cur.fetchall() if as_rows else _fetch_dicts(cur)
 
     # --- ingestion_jobs ---
     def ingestion_job_insert(
@@ -615,61 +1430,56 @@ class ContinuumDb:
         payload_json: str | dict | None = None,
         status: str = "pending",
         tenant_id: str = "default",
+        now_iso: str | None = None,
     ) -> int:
-        tenant = (tenant_id or "").strip() or "default"
+        """now_iso (see _now_iso) stamps updated_at; omitted, the current UTC time is used."""
+        tenant = _norm_tenant(tenant_id)
         payload_str = json.dumps(payload_json) if isinstance(payload_json, dict) else payload_json
         with self._conn() as c:
             cur = c.execute(
-                """INSERT INTO ingestion_jobs (job_type, source, status, payload_json, tenant_id, updated_at)
-                   VALUES (?, ?, ?, ?, ?, datetime('now'))""",
-                (job_type, source, status, payload_str, tenant),
+                _SQL_INGESTION_JOB_INSERT,
+                (now_iso or _now_iso(), job_type, source, status, payload_str, tenant),
             )
             c.commit()
             return cur.lastrowid
 
-    def ingestion_job_start(self, job_id: int, tenant_id: str = "default") -> bool:
-        tenant = (tenant_id or "").strip() or "default"
+    def ingestion_job_start(self, job_id: int, tenant_id: str = "default", now_iso: str | None = None) -> bool:
+        tenant = _norm_tenant(tenant_id)
         with self._conn() as c:
             cur = c.execute(
-                """UPDATE ingestion_jobs
-                   SET status = 'running', started_at = COALESCE(started_at, datetime('now')),
-                       attempt_count = attempt_count + 1, updated_at = datetime('now')
-                   WHERE id = ? AND tenant_id = ? AND status IN ('pending','failed')""",
-                (job_id, tenant),
+                _SQL_INGESTION_JOB_START,
+                (now_iso or _now_iso(), job_id, tenant),
             )
             c.commit()
             return cur.rowcount > 0
 
-    def ingestion_job_complete(self, job_id: int, tenant_id: str = "default") -> None:
-        tenant = (tenant_id or "").strip() or "default"
+    def ingestion_job_complete(self, job_id: int, tenant_id: str = "default", now_iso: str | None = None) -> None:
+        tenant = _norm_tenant(tenant_id)
         with self._conn() as c:
             c.execute(
-                """UPDATE ingestion_jobs
-                   SET status = 'completed', finished_at = datetime('now'), error_text = NULL, updated_at = datetime('now')
-                   WHERE id = ? AND tenant_id = ?""",
-                (job_id, tenant),
+                _SQL_INGESTION_JOB_COMPLETE,
+                (now_iso or _now_iso(), job_id, tenant),
             )
             c.commit()
 
-    def ingestion_job_fail(self, job_id: int, error_text: str, tenant_id: str = "default") -> None:
-        tenant = (tenant_id or "").strip() or "default"
+    def ingestion_job_fail(
+        self, job_id: int, error_text: str, tenant_id: str = "default", now_iso: str | None = None
+    ) -> None:
+        tenant = _norm_tenant(tenant_id)
         with self._conn() as c:
             c.execute(
-                """UPDATE ingestion_jobs
-                   SET status = 'failed', finished_at = datetime('now'), error_text = ?, updated_at = datetime('now')
-                   WHERE id = ? AND tenant_id = ?""",
-                (error_text, job_id, tenant),
+                _SQL_INGESTION_JOB_FAIL,
+                (now_iso or _now_iso(), error_text, job_id, tenant),
             )
             c.commit()
 
-    def ingestion_job_get(self, job_id: int, tenant_id: str = "default") -> dict[str, Any] | None:
-        tenant = (tenant_id or "").strip() or "default"
+    def ingestion_job_get(
+        self, job_id: int, tenant_id: str = "default", as_row: bool = False
+    ) -> dict[str, Any] | sqlite3.Row | None:
+        tenant = _norm_tenant(tenant_id)
         with self._conn() as c:
-            row = c.execute(
-                "SELECT * FROM ingestion_jobs WHERE id = ? AND tenant_id = ?",
-                (job_id, tenant),
-            ).fetchone()
-            return dict(row) if row else None
+            row = c.execute(_SQL_INGESTION_JOB_GET, (job_id, tenant)).fetchone()
+            return row if as_row or row is None else dict(row)
 
     def ingestion_job_list(
         self,
@@ -677,21 +1487,22 @@ class ContinuumDb:
         job_type: str | None = None,
         tenant_id: str = "default",
         limit: int = 100,
-    ) -> list[dict[str, Any]]:
-        tenant = (tenant_id or "").strip() or "default"
+        as_rows: bool = False,
+        before_id: int | None = None,
+    ) -> list[dict[str, Any]] | list[sqlite3.Row]:
+        tenant = _norm_tenant(tenant_id)
         with self._conn() as c:
-            sql = "SELECT * FROM ingestion_jobs WHERE tenant_id = ?"
             params: list[Any] = [tenant]
             if status:
-                sql += " AND status = ?"
                 params.append(status)
             if job_type:
-                sql += " AND job_type = ?"
                 params.append(job_type)
-            sql += " ORDER BY id DESC LIMIT ?"
+            if before_id is not None:
+                params.append(before_id)
             params.append(limit)
-            rows = c.execute(sql, params).fetchall()
-            return [dict(r) for r in rows]
+            mask = bool(status) | bool(job_type) << 1 | (before_id is not None) << 2
+            cur = c.execute(_SQL_INGESTION_JOB_LIST[mask], params)
+            return cur.fetchall() if as_rows else _fetch_dicts(cur)
 
     # --- entropy_ring_nodes ---
     def entropy_ring_node_insert(
@@ -710,10 +1521,10 @@ class ContinuumDb:
             c.commit()
             return cur.lastrowid
 
-    def entropy_ring_node_get(self, node_id: str) -> dict[str, Any] | None:
+    def entropy_ring_node_get(self, node_id: str, as_row: bool = False) -> dict[str, Any] | sqlite3.Row | None:
         with self._conn() as c:
-            row = c.execute("SELECT * FROM entropy_ring_nodes WHERE node_id = ?", (node_id,)).fetchone()
-            return dict(row) if row else None
+            row = c.execute(_SQL_ENTROPY_RING_NODE_GET, (node_id,)).fetchone()
+            return row if as_row or row is None else dict(row)
 
     def entropy_ring_node_update_status(
         self,
@@ -759,8 +1570,7 @@ class ContinuumDb:
                 sql += " AND tenant_id = ?"
                 params.append(tenant_id)
             sql += " ORDER BY id"
-            rows = c.execute(sql, params).fetchall()
-            return [dict(r) for r in rows]
+            return _fetch_dicts(c.execute(sql, params))
 
     def entropy_ring_node_delete(self, node_id: str) -> None:
         with self._conn() as c:
@@ -796,13 +1606,13 @@ class ContinuumDb:
     def entropy_warehouse_list(self, tenant_id: str | None = None) -> list[dict[str, Any]]:
         with self._conn() as c:
             if tenant_id:
-                rows = c.execute(
+                cur = c.execute(
                     "SELECT * FROM entropy_ring_warehouse WHERE tenant_id = ? ORDER BY id",
                     (tenant_id,),
-                ).fetchall()
+                )
             else:
-                rows = c.execute("SELECT * FROM entropy_ring_warehouse ORDER BY id").fetchall()
-            return [dict(r) for r in rows]
+                cur = c.execute("SELECT * FROM entropy_ring_warehouse ORDER BY id")
+            return _fetch_dicts(cur)
 
     def entropy_warehouse_delete(self, node_id: str) -> None:
         with self._conn() as c:
@@ -820,17 +1630,14 @@ class ContinuumDb:
             return cur.lastrowid
 
     # --- entropy_credits ---
-    def entropy_credits_get(self, tenant_id: str) -> dict[str, Any] | None:
-        tenant = (tenant_id or "").strip() or "default"
+    def entropy_credits_get(self, tenant_id: str, as_row: bool = False) -> dict[str, Any] | sqlite3.Row | None:
+        tenant = _norm_tenant(tenant_id)
         with self._conn() as c:
-            row = c.execute(
-                "SELECT * FROM entropy_credits WHERE tenant_id = ?",
-                (tenant,),
-            ).fetchone()
-            return dict(row) if row else None
+            row = c.execute(_SQL_ENTROPY_CREDITS_GET, (tenant,)).fetchone()
+            return row if as_row or row is None else dict(row)
 
     def entropy_credits_earn(self, tenant_id: str, amount: int) -> None:
-        tenant = (tenant_id or "").strip() or "default"
+        tenant = _norm_tenant(tenant_id)
         with self._conn() as c:
             existing = c.execute(
                 "SELECT earned FROM entropy_credits WHERE tenant_id = ?",
@@ -851,7 +1658,7 @@ class ContinuumDb:
 
     def entropy_credits_spend(self, tenant_id: str, amount: int) -> bool:
         """Debit credits. Returns True if successful, False if insufficient balance."""
-        tenant = (tenant_id or "").strip() or "default"
+        tenant = _norm_tenant(tenant_id)
         with self._conn() as c:
             row = c.execute(
                 "SELECT earned, spent FROM entropy_credits WHERE tenant_id = ?",
@@ -874,8 +1681,80 @@ class ContinuumDb:
             return True
 
     # --- raw SQL for explorer window ---
+    def list_page(
+        self, list_method: str, limit: int = 100, before_id: int | None = None, **filters: Any
+    ) -> tuple[list[dict[str, Any]], int | None]:
+        """
+        One newest-first page from an id-ordered list method (e.g. "ingestion_job_list"), plus the
+        before_id for the next page, or None once a page comes back short.
+        """
+        if list_method not in _PAGED_LISTS:
+            raise ValueError(f"{list_method!r} does not support keyset paging")
+        rows = getattr(self, list_method)(limit=limit, before_id=before_id, **filters)
+        return rows, (rows[-1]["id"] if rows and len(rows) >= limit else None)
+
+    def iter_pages(
+        self, list_method: str, page_size: int = 100, before_id: int | None = None, **filters: Any
+    ) -> Iterator[list[dict[str, Any]]]:
+        """
+        Walk list_page newest-first, yielding each non-empty page as it is fetched. Keyed on id, so
+        rows updated out of the filter (e.g. a status change) between pages don't shift later pages.
+        """
+        while True:
+            rows, before_id = self.list_page(list_method, page_size, before_id, **filters)
+            if rows:
+                yield rows
+            if before_id is None:
+                return
+
     def execute_read(self, sql: str, params: tuple[Any, ...] = ()) -> list[dict[str, Any]]:
         """Run read-only SQL; returns list of row dicts."""
         with self._conn() as c:
-            rows = c.execute(sql, params).fetchall()
-            return [dict(r) for r in rows]
+            return _fetch_dicts(c.execute(sql, params))
+
+
+# Instances kept open by shared_db(); the least recently used one is closed past this many.
+_SHARED_DB_SIZE = 8
+_shared_dbs: dict[tuple[str, bool], ContinuumDb] = {}
+_shared_dbs_lock = threading.Lock()
+
+
+def shared_db(db_path: str | Path, read_only: bool = False) -> ContinuumDb:
+    """
+    A process-wide ContinuumDb per resolved path (and read_only), so repeat callers reuse its pooled
+    connections instead of reconnecting and re-checking the schema. Safe to share between threads
+    (bulk_load() only captures the calling thread). Don't close it yourself: past _SHARED_DB_SIZE
+    instances the least recently used one is closed (a caller still holding it gets fresh pooled
+    connections on its next call).
+    """
+    key = (str(Path(db_path).resolve()), read_only)
+    with _shared_dbs_lock:
+        db = _shared_dbs.pop(key, None)
+        if db is not None:
+            _shared_dbs[key] = db
+            return db
+    db = ContinuumDb(key[0], read_only=read_only)
+    with _shared_dbs_lock:
+        existing = _shared_dbs.pop(key, None)
+        if existing is not None:
+            # Another thread opened it first; keep theirs.
+            _shared_dbs[key] = existing
+            evicted = [db]
+            db = existing
+        else:
+            _shared_dbs[key] = db
+            evicted = []
+            while len(_shared_dbs) > _SHARED_DB_SIZE:
+                evicted.append(_shared_dbs.pop(next(iter(_shared_dbs))))
+    for old in evicted:
+        old.close()
+    return db
+
+
+def close_shared_dbs() -> None:
+    """Close and forget every shared_db() instance (tests, shutdown)."""
+    with _shared_dbs_lock:
+        dbs = list(_shared_dbs.values())
+        _shared_dbs.clear()
+    for db in dbs:
+        db.close()
@@ -67,8 +67,10 @@ CREATE TABLE IF NOT EXISTS research_suggestions (
     context_json TEXT,
     recommendation_text TEXT NOT NULL,
     status TEXT DEFAULT 'pending',
-    created_at TEXT DEFAULT (datetime('now'))
+    created_at TEXT DEFAULT (datetime('now')),
+    fingerprint BLOB  -- blake2b-128 of source + NUL + recommendation_text; NULL on rows from older files
 );
+CREATE UNIQUE INDEX IF NOT EXISTS ux_research_suggestions_fingerprint ON research_suggestions(fingerprint);
 
 -- Library documents (upload/download, search by location and type)
 -- tenant_id: scope per game/team; use 'default' for local dev (see TENANT.md / CONTINUUM_AND_COMPRESSOR.md).
@@ -92,6 +94,36 @@ CREATE INDEX IF NOT EXISTS idx_library_documents_type ON library_documents(docum
 CREATE INDEX IF NOT EXISTS idx_library_documents_geohash ON library_documents(geohash);
 CREATE INDEX IF NOT EXISTS idx_library_documents_owner ON library_documents(owner_id);
 CREATE INDEX IF NOT EXISTS idx_library_documents_tenant_id ON library_documents(tenant_id);
+CREATE INDEX IF NOT EXISTS idx_libdoc_tenant_geohash ON library_documents(tenant_id, geohash);
+CREATE INDEX IF NOT EXISTS idx_libdoc_tenant_type ON library_documents(tenant_id, document_type);
+-- type_metadata "name" lookups (library_document_search meta_name=); the expression must match _SQL_LIBDOC_META_NAME.
+CREATE INDEX IF NOT EXISTS idx_libdoc_meta_name ON library_documents(
+    tenant_id, (CASE WHEN json_valid(type_metadata) THEN json_extract(type_metadata, '$.name') END)
+);
+
+-- Point R*Tree over library_documents lat/lon (radius search); kept in sync by the triggers below.
+CREATE VIRTUAL TABLE IF NOT EXISTS libdoc_rtree USING rtree(id, min_lat, max_lat, min_lon, max_lon);
+CREATE TRIGGER IF NOT EXISTS trg_libdoc_rtree_insert AFTER INSERT ON library_documents
+WHEN NEW.lat IS NOT NULL AND NEW.lon IS NOT NULL
+BEGIN
+    INSERT INTO libdoc_rtree VALUES (NEW.id, NEW.lat, NEW.lat, NEW.lon, NEW.lon);
+END;
+CREATE TRIGGER IF NOT EXISTS trg_libdoc_rtree_update AFTER UPDATE OF lat, lon ON library_documents
+BEGIN
+    DELETE FROM libdoc_rtree WHERE id = OLD.id;
+    INSERT INTO libdoc_rtree SELECT NEW.id, NEW.lat, NEW.lat, NEW.lon, NEW.lon
+    WHERE NEW.lat IS NOT NULL AND NEW.lon IS NOT NULL;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_libdoc_rtree_delete AFTER DELETE ON library_documents
+BEGIN
+    DELETE FROM libdoc_rtree WHERE id = OLD.id;
+END;
+-- Databases created before libdoc_rtree existed: index their located documents once.
+INSERT INTO libdoc_rtree
+SELECT id, lat, lat, lon, lon FROM library_documents
+WHERE lat IS NOT NULL AND lon IS NOT NULL
+AND NOT EXISTS (SELECT 1 FROM continuum_meta WHERE key = 'libdoc_rtree_built');
+INSERT OR IGNORE INTO continuum_meta (key, value) VALUES ('libdoc_rtree_built', '1');
 
 -- Astral bodies catalog (planets, moons, stars, barycenters)
 CREATE TABLE IF NOT EXISTS astral_body_catalog (
@@ -110,6 +142,7 @@ CREATE TABLE IF NOT EXISTS astral_body_catalog (
 CREATE INDEX IF NOT EXISTS idx_astral_body_tenant ON astral_body_catalog(tenant_id);
 CREATE INDEX IF NOT EXISTS idx_astral_body_parent ON astral_body_catalog(parent_body_id);
 CREATE INDEX IF NOT EXISTS idx_astral_body_kind ON astral_body_catalog(kind);
+CREATE INDEX IF NOT EXISTS idx_astral_body_tenant_kind ON astral_body_catalog(tenant_id, kind, body_id);
 
 -- Observer sites (lat/lon/altitude on a body)
 CREATE TABLE IF NOT EXISTS astral_observer_sites (
@@ -143,6 +176,7 @@ CREATE TABLE IF NOT EXISTS nasa_file_registry (
 );
 CREATE INDEX IF NOT EXISTS idx_nasa_file_tenant ON nasa_file_registry(tenant_id);
 CREATE INDEX IF NOT EXISTS idx_nasa_file_type ON nasa_file_registry(file_type);
+CREATE INDEX IF NOT EXISTS idx_nasa_file_tenant_type ON nasa_file_registry(tenant_id, file_type);
 
 -- Ephemeris samples (ingested position/velocity per body per epoch)
 CREATE TABLE IF NOT EXISTS ephemeris_samples (
@@ -163,6 +197,7 @@ CREATE TABLE IF NOT EXISTS ephemeris_samples (
 CREATE INDEX IF NOT EXISTS idx_ephemeris_body ON ephemeris_samples(body_id);
 CREATE INDEX IF NOT EXISTS idx_ephemeris_epoch ON ephemeris_samples(epoch_utc);
 CREATE INDEX IF NOT EXISTS idx_ephemeris_tenant ON ephemeris_samples(tenant_id);
+CREATE INDEX IF NOT EXISTS idx_ephem_body_epoch ON ephemeris_samples(tenant_id, body_id, epoch_utc);
 
 -- Occlusion / eclipse events
 CREATE TABLE IF NOT EXISTS occlusion_events (
@@ -178,6 +213,8 @@ CREATE TABLE IF NOT EXISTS occlusion_events (
 );
 CREATE INDEX IF NOT EXISTS idx_occlusion_epoch ON occlusion_events(epoch_utc);
 CREATE INDEX IF NOT EXISTS idx_occlusion_tenant ON occlusion_events(tenant_id);
+CREATE INDEX IF NOT EXISTS idx_occlusion_tenant_epoch ON occlusion_events(tenant_id, epoch_utc);
+CREATE INDEX IF NOT EXISTS idx_occlusion_tenant_target ON occlusion_events(tenant_id, target_body_id);
 
 -- Ingestion job tracking
 CREATE TABLE IF NOT EXISTS ingestion_jobs (
@@ -196,13 +233,41 @@ CREATE TABLE IF NOT EXISTS ingestion_jobs (
 );
 CREATE INDEX IF NOT EXISTS idx_ingestion_jobs_status ON ingestion_jobs(status);
 CREATE INDEX IF NOT EXISTS idx_ingestion_jobs_tenant ON ingestion_jobs(tenant_id);
+CREATE INDEX IF NOT EXISTS idx_ingestion_jobs_tenant_status ON ingestion_jobs(tenant_id, status);
+CREATE INDEX IF NOT EXISTS idx_ingestion_jobs_tenant_type ON ingestion_jobs(tenant_id, job_type);
 
 -- Indexes for common queries
 CREATE INDEX IF NOT EXISTS idx_spatial_4d_payload ON spatial_4d(payload_type, payload_id);
 CREATE INDEX IF NOT EXISTS idx_semantic_chunks_media ON semantic_chunks(media_type);
 CREATE INDEX IF NOT EXISTS idx_semantic_chunks_parent ON semantic_chunks(parent_id);
 CREATE INDEX IF NOT EXISTS idx_unique_kernels_status ON unique_kernels(status);
-CREATE INDEX IF NOT EXISTS idx_unique_kernels_chunk ON unique_kernels(chunk_id);
+-- One row per (chunk, compressor): re-flagging upserts it. Older files may hold duplicates; fold each
+-- group into its first row (attempts summed, lowest residual, most advanced status) before the index
+-- goes on. The unique index also serves chunk_id lookups.
+UPDATE unique_kernels SET
+    attempt_count = (
+        SELECT SUM(COALESCE(d.attempt_count, 0)) FROM unique_kernels d
+        WHERE d.chunk_id = unique_kernels.chunk_id AND d.source_compressor = unique_kernels.source_compressor
+    ),
+    residual_metric = (
+        SELECT MIN(d.residual_metric) FROM unique_kernels d
+        WHERE d.chunk_id = unique_kernels.chunk_id AND d.source_compressor = unique_kernels.source_compressor
+    ),
+    status = (
+        SELECT d.status FROM unique_kernels d
+        WHERE d.chunk_id = unique_kernels.chunk_id AND d.source_compressor = unique_kernels.source_compressor
+        ORDER BY CASE d.status WHEN 'flagged_research' THEN 2 WHEN 'compressed' THEN 1 ELSE 0 END DESC, d.id DESC
+        LIMIT 1
+    )
+WHERE id IN (
+    SELECT MIN(id) FROM unique_kernels WHERE chunk_id IS NOT NULL
+    GROUP BY chunk_id, source_compressor HAVING COUNT(*) > 1
+);
+DELETE FROM unique_kernels WHERE chunk_id IS NOT NULL AND id NOT IN (
+    SELECT MIN(id) FROM unique_kernels WHERE chunk_id IS NOT NULL GROUP BY chunk_id, source_compressor
+);
+DROP INDEX IF EXISTS idx_unique_kernels_chunk;
+CREATE UNIQUE INDEX IF NOT EXISTS ux_unique_kernels_chunk_source ON unique_kernels(chunk_id, source_compressor);
 
 -- Entropy ring (Entropythief daisy topology)
 CREATE TABLE IF NOT EXISTS entropy_ring_nodes (
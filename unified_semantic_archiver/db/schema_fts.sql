@@ -0,0 +1,26 @@
+-- Optional full-text index for library_document_search(q=...). Applied after schema.sql when the
+-- SQLite build has FTS5 with the trigram tokenizer (3.34+); without it q falls back to LIKE.
+-- trigram matches arbitrary substrings case-insensitively, like the LIKE '%q%' it replaces.
+
+CREATE VIRTUAL TABLE IF NOT EXISTS library_documents_fts USING fts5(
+    type_metadata, url, content='library_documents', content_rowid='id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS trg_libdoc_fts_insert AFTER INSERT ON library_documents
+BEGIN
+    INSERT INTO library_documents_fts (rowid, type_metadata, url) VALUES (NEW.id, NEW.type_metadata, NEW.url);
+END;
+CREATE TRIGGER IF NOT EXISTS trg_libdoc_fts_update AFTER UPDATE OF type_metadata, url ON library_documents
+BEGIN
+    INSERT INTO library_documents_fts (library_documents_fts, rowid, type_metadata, url)
+    VALUES ('delete', OLD.id, OLD.type_metadata, OLD.url);
+    INSERT INTO library_documents_fts (rowid, type_metadata, url) VALUES (NEW.id, NEW.type_metadata, NEW.url);
+END;
+CREATE TRIGGER IF NOT EXISTS trg_libdoc_fts_delete AFTER DELETE ON library_documents
+BEGIN
+    INSERT INTO library_documents_fts (library_documents_fts, rowid, type_metadata, url)
+    VALUES ('delete', OLD.id, OLD.type_metadata, OLD.url);
+END;
+-- Databases with documents from before the index existed: build it once.
+INSERT INTO library_documents_fts (library_documents_fts)
+SELECT 'rebuild' WHERE NOT EXISTS (SELECT 1 FROM continuum_meta WHERE key = 'libdoc_fts_built');
+INSERT OR IGNORE INTO continuum_meta (key, value) VALUES ('libdoc_fts_built', '1');
@@ -0,0 +1,192 @@
+"""
+Optional Numba kernel for JPL Horizons vector tables.
+
+Scans the raw file bytes once and extracts the six state-vector floats per $$SOE block without
+allocating Python objects per field. Used by _parse_horizons_vectors for large files when numba
+is installed; the regex path in nasa_ingestion remains the reference implementation.
+Floats are accumulated as an integer mantissa and scaled once, so values with 16+ significant
+digits can differ from float() in the last ulp.
+"""
+
+from __future__ import annotations
+
+import mmap
+from pathlib import Path
+from typing import Any
+
+try:
+    import numpy as np
+    from numba import njit
+except ImportError:  # pragma: no cover - exercised only without numba
+    np = None  # type: ignore[assignment]
+    njit = None  # type: ignore[assignment]
+
+AVAILABLE = njit is not None
+
+# Files smaller than this parse faster through the regex path than through a cold JIT dispatch.
+MIN_FAST_PATH_BYTES = 1 << 20
+
+_MONTHS = {b"Jan": 1, b"Feb": 2, b"Mar": 3, b"Apr": 4, b"May": 5, b"Jun": 6,
+           b"Jul": 7, b"Aug": 8, b"Sep": 9, b"Oct": 10, b"Nov": 11, b"Dec": 12}
+
+if AVAILABLE:
+
+    @njit(cache=True)
+    def _find(buf, needle, start, end):
+        n = needle.shape[0]
+        i = start
+        while i + n <= end:
+            j = 0
+            while j < n and buf[i + j] == needle[j]:
+                j += 1
+            if j == n:
+                return i
+            i += 1
+        return -1
+
+    @njit(cache=True)
+    def _is_space(c):
+        return c == 32 or c == 9 or c == 10 or c == 13
+
+    @njit(cache=True)
+    def _find_assign(buf, prefix, start, end):
+        """Index just past the first `<prefix>\\s*=\\s*`, or -1."""
+        i = start
+        while True:
+            i = _find(buf, prefix, i, end)
+            if i < 0:
+                return -1
+            k = i + prefix.shape[0]
+            while k < end and _is_space(buf[k]):
+                k += 1
+            if k < end and buf[k] == 61:  # '='
+                k += 1
+                while k < end and _is_space(buf[k]):
+                    k += 1
+                return k
+            i += 1
+
+    @njit(cache=True)
+    def _atof(buf, i, end, out, slot):
+        """Parse [-+]digits[.digits][Ee[-+]digits] at buf[i:]; store in out[slot]. Returns index after."""
+        neg = False
+        if i < end and (buf[i] == 45 or buf[i] == 43):
+            neg = buf[i] == 45
+            i += 1
+        mant = 0
+        scale = 0
+        digits = 0
+        while i < end and 48 <= buf[i] <= 57:
+            if digits < 18:
+                mant = mant * 10 + (buf[i] - 48)
+                digits += 1
+            else:
+                scale += 1
+            i += 1
+        if i < end and buf[i] == 46:  # '.'
+            i += 1
+            while i < end and 48 <= buf[i] <= 57:
+                if digits < 18:
+                    mant = mant * 10 + (buf[i] - 48)
+                    digits += 1
+                    scale -= 1
+                i += 1
+        if i < end and (buf[i] == 69 or buf[i] == 101):  # 'E' / 'e'
+            i += 1
+            eneg = False
+            if i < end and (buf[i] == 45 or buf[i] == 43):
+                eneg = buf[i] == 45
+                i += 1
+            e = 0
+            while i < end and 48 <= buf[i] <= 57:
+                e = e * 10 + (buf[i] - 48)
+                i += 1
+            scale += -e if eneg else e
+        value = float(mant)
+        if scale < 0:
+            value = value / 10.0 ** (-scale)
+        elif scale > 0:
+            value = value * 10.0 ** scale
+        out[slot] = -value if neg else value
+        return i
+
+    @njit(cache=True)
+    def _scan_blocks(buf, soe, eoe, ad, keys):
+        """
+        Return (vectors[N, 6], epoch_offsets[N]) for each $$SOE..$$EOE block holding a full record.
+        epoch_offsets point at the calendar date following "A.D.".
+        """
+        cap = 64
+        vecs = np.empty((cap, 6), dtype=np.float64)
+        offs = np.empty(cap, dtype=np.int64)
+        n = 0
+        pos = 0
+        size = buf.shape[0]
+        while True:
+            s = _find(buf, soe, pos, size)
+            if s < 0:
+                break
+            s += soe.shape[0]
+            e = _find(buf, eoe, s, size)
+            if e < 0:
+                break
+            pos = e + eoe.shape[0]
+            a = _find(buf, ad, s, e)
+            if a < 0:
+                continue
+            a += ad.shape[0]
+            while a < e and _is_space(buf[a]):
+                a += 1
+            if n == cap:
+                cap *= 2
+                grown = np.empty((cap, 6), dtype=np.float64)
+                grown[:n] = vecs[:n]
+                vecs = grown
+                grown_offs = np.empty(cap, dtype=np.int64)
+                grown_offs[:n] = offs[:n]
+                offs = grown_offs
+            ok = True
+            for slot in range(6):
+                k = _find_assign(buf, keys[slot], s, e)
+                if k < 0:
+                    ok = False
+                    break
+                _atof(buf, k, e, vecs[n], slot)
+            if ok:
+                offs[n] = a
+                n += 1
+        return vecs[:n], offs[:n]
+
+
+def _epoch_from_bytes(raw: bytes) -> str:
+    """b'2000-Jan-01 12:00:00.0000 TDB' -> '2000-01-01T12:00:00'."""
+    date, _, clock = raw.partition(b" ")
+    y, mon, d = date.split(b"-")
+    return f"{int(y):04d}-{_MONTHS.get(mon, 1):02d}-{int(d):02d}T{clock[:8].decode('ascii')}"
+
+
+def parse_horizons_vectors(path: Path) -> tuple[list[str], Any] | None:
+    """
+    Numba-backed equivalent of nasa_ingestion._parse_horizons_vectors: (epochs, float64 [N, 6]
+    vectors of x, y, z, vx, vy, vz); None when numba is missing.
+    """
+    if not AVAILABLE:
+        return None
+    if Path(path).stat().st_size == 0:
+        return [], np.empty((0, 6), dtype=np.float64)
+    # Position precedes velocity in every record, so the first X/Y/Z match is never VX/VY/VZ.
+    keys = tuple(np.frombuffer(k, dtype=np.uint8) for k in (b"X", b"Y", b"Z", b"VX", b"VY", b"VZ"))
+    # The kernel scans the page cache through a read-only view of the mapping; nothing is copied.
+    # The mapping is not closed explicitly (the JIT may still reference buf); it is unmapped once
+    # mm and buf are both released.
+    with open(path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    buf = np.frombuffer(mm, dtype=np.uint8)
+    vecs, offs = _scan_blocks(
+        buf,
+        np.frombuffer(b"$$SOE", dtype=np.uint8),
+        np.frombuffer(b"$$EOE", dtype=np.uint8),
+        np.frombuffer(b"A.D.", dtype=np.uint8),
+        keys,
+    )
+    return [_epoch_from_bytes(mm[off:off + 32]) for off in offs.tolist()], vecs
@@ -0,0 +1,91 @@
+"""
+Occlusion geometry over ephemeris arrays: fraction of a source body's disk hidden by an occluder,
+as seen from the target body's center. Compiled with Numba (parallel over epochs) when installed;
+otherwise the same kernel runs as plain Python over NumPy arrays.
+"""
+
+from __future__ import annotations
+
+import math
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None  # type: ignore[assignment]
+
+try:
+    from numba import njit, prange
+except ImportError:  # pragma: no cover - exercised only without numba
+    njit = None  # type: ignore[assignment]
+    prange = range
+
+# Codes written to `kind`; map onto occlusion_events.eclipse_type.
+KIND_NONE = 0
+KIND_PARTIAL = 1
+KIND_ANNULAR = 2
+KIND_TOTAL = 3
+ECLIPSE_TYPES = {KIND_PARTIAL: "partial", KIND_ANNULAR: "annular", KIND_TOTAL: "total"}
+
+
+def _batch_occlusion(src_xyz, tgt_xyz, occ_xyz, src_r, occ_r, out, kind):
+    """
+    Fill out[i] with the occluded fraction of the source disk and kind[i] with a KIND_* code.
+    Positions are (N, 3) in the same unit as the radii; disks use the small-angle planar overlap.
+    """
+    for i in prange(out.shape[0]):
+        sx = src_xyz[i, 0] - tgt_xyz[i, 0]
+        sy = src_xyz[i, 1] - tgt_xyz[i, 1]
+        sz = src_xyz[i, 2] - tgt_xyz[i, 2]
+        ox = occ_xyz[i, 0] - tgt_xyz[i, 0]
+        oy = occ_xyz[i, 1] - tgt_xyz[i, 1]
+        oz = occ_xyz[i, 2] - tgt_xyz[i, 2]
+        ds = math.sqrt(sx * sx + sy * sy + sz * sz)
+        do = math.sqrt(ox * ox + oy * oy + oz * oz)
+        out[i] = 0.0
+        kind[i] = KIND_NONE
+        # Occluder must sit between observer and source, both outside their own radii.
+        if ds <= src_r or do <= occ_r or do >= ds:
+            continue
+        r1 = math.asin(src_r / ds)
+        r2 = math.asin(occ_r / do)
+        cos_d = (sx * ox + sy * oy + sz * oz) / (ds * do)
+        d = math.acos(max(-1.0, min(1.0, cos_d)))
+        if d >= r1 + r2:
+            continue
+        if d <= r1 - r2:
+            out[i] = (r2 * r2) / (r1 * r1)
+            kind[i] = KIND_ANNULAR
+        elif d <= r2 - r1:
+            out[i] = 1.0
+            kind[i] = KIND_TOTAL
+        else:
+            a1 = r1 * r1 * math.acos(max(-1.0, min(1.0, (d * d + r1 * r1 - r2 * r2) / (2.0 * d * r1))))
+            a2 = r2 * r2 * math.acos(max(-1.0, min(1.0, (d * d + r2 * r2 - r1 * r1) / (2.0 * d * r2))))
+            a3 = 0.5 * math.sqrt(max(0.0, (-d + r1 + r2) * (d + r1 - r2) * (d - r1 + r2) * (d + r1 + r2)))
+            out[i] = min(1.0, (a1 + a2 - a3) / (math.pi * r1 * r1))
+            kind[i] = KIND_PARTIAL
+
+
+batch_occlusion = (
+    njit(parallel=True, fastmath=True, cache=True)(_batch_occlusion) if njit is not None else _batch_occlusion
+)
+
+
+def occlusion_ratios(src_xyz, tgt_xyz, occ_xyz, src_r: float, occ_r: float):
+    """Allocate outputs and run batch_occlusion; returns (ratios float64[N], kinds int8[N])."""
+    if np is None:
+        raise RuntimeError("numpy is not installed")
+    src_xyz = np.ascontiguousarray(src_xyz, dtype=np.float64)
+    n = src_xyz.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    kind = np.empty(n, dtype=np.int8)
+    batch_occlusion(
+        src_xyz,
+        np.ascontiguousarray(tgt_xyz, dtype=np.float64),
+        np.ascontiguousarray(occ_xyz, dtype=np.float64),
+        float(src_r),
+        float(occ_r),
+        out,
+        kind,
+    )
+    return out, kind
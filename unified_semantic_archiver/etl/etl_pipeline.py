@@ -13,6 +13,11 @@ from pathlib import Path
 
 import luigi
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None  # type: ignore[assignment]
+
 # Ensure parent package is on path when run as luigi --module etl.etl_pipeline
 _SCRIPT_DIR = Path(__file__).resolve().parent
 if str(_SCRIPT_DIR.parent.parent) not in sys.path:
@@ -21,6 +26,21 @@ if str(_SCRIPT_DIR.parent.parent) not in sys.path:
 from unified_semantic_archiver.db import ContinuumDb
 
 
+def _read_json(path: Path) -> dict:
+    """Load a staging JSON file (orjson when installed)."""
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _write_json(path: Path, data: dict) -> None:
+    """Write a staging JSON file indented by two spaces (orjson when installed)."""
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+
+
 class ExtractTask(luigi.Task):
     """Read from file path; output to LocalTarget."""
 
@@ -44,7 +64,7 @@ class ExtractTask(luigi.Task):
         out_dir = self.output().path
         Path(out_dir).parent.mkdir(parents=True, exist_ok=True)
         extract_out = Path(self.source_path) / ".etl_extract.json"
-        extract_out.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        _write_json(extract_out, data)
         Path(self.output().path).touch()
 
 
@@ -66,13 +86,14 @@ class TransformTask(luigi.Task):
             # Extract may have produced nothing; create minimal payload
             data = {"files": [], "source_path": str(Path(self.source_path).resolve()), "extracted_at": datetime.utcnow().isoformat() + "Z"}
         else:
-            data = json.loads(extract_json.read_text(encoding="utf-8"))
+            data = _read_json(extract_json)
         # Identity: add metadata
         data["ingested_at"] = datetime.utcnow().isoformat() + "Z"
+        # Checksum stays on stdlib json so its value doesn't depend on whether orjson is installed.
         content = json.dumps(data, sort_keys=True)
         data["checksum"] = hashlib.sha256(content.encode()).hexdigest()
         transform_out = Path(self.source_path) / ".etl_transform.json"
-        transform_out.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        _write_json(transform_out, data)
         Path(self.output().path).touch()
 
 
@@ -93,16 +114,17 @@ class LoadTask(luigi.Task):
         if not transform_json.exists():
             Path(self.output().path).touch()
             return
-        data = json.loads(transform_json.read_text(encoding="utf-8"))
-        db = ContinuumDb(self.db_path)
-        # Store metadata in continuum_meta
-        db.meta_set("etl_last_source", data.get("source_path", ""))
-        db.meta_set("etl_last_checksum", data.get("checksum", ""))
-        db.meta_set("etl_last_ingested", data.get("ingested_at", ""))
-        # Optionally insert document_blobs for each file (stub: just record path)
-        for f in data.get("files", []):
-            full_path = str(Path(self.source_path) / f)
-            db.document_blob_insert(tar_hash=data.get("checksum", ""), path=full_path, mime_type=None)
+        data = _read_json(transform_json)
+        with ContinuumDb(self.db_path) as db:
+            # Store metadata in continuum_meta
+            db.meta_set("etl_last_source", data.get("source_path", ""))
+            db.meta_set("etl_last_checksum", data.get("checksum", ""))
+            db.meta_set("etl_last_ingested", data.get("ingested_at", ""))
+            # Optionally insert document_blobs for each file (stub: just record path)
+            checksum = data.get("checksum", "")
+            db.document_blob_insert_many(
+                (checksum, str(Path(self.source_path) / f), None) for f in data.get("files", [])
+            )
         Path(self.output().path).touch()
 
 
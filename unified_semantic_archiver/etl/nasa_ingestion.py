@@ -6,12 +6,44 @@ from __future__ import annotations
 
 import hashlib
 import json
+import mmap
 import re
-from dataclasses import dataclass
+from array import array
+from dataclasses import dataclass, field
+from itertools import repeat
 from pathlib import Path
 from typing import Any
 
 from unified_semantic_archiver.db import ContinuumDb
+from unified_semantic_archiver.db.continuum_db import _norm_tenant
+
+from . import _horizons_fast, _occlusion_kernels
+
+AU_M = 149_597_870_700.0
+# Read size for the pre-3.11 checksum fallback; one reused buffer instead of a bytes object per chunk.
+_CHECKSUM_BUF_BYTES = 1 << 20
+
+# One record per match: epoch line, then the first X/Y/Z and VX/VY/VZ triples after it.
+_RECORD_RE = re.compile(
+    rb"\d+\.?\d*\s*=\s*A\.D\.\s+(\d{4})-(\w{3})-(\d{1,2})\s+(\d{2}):(\d{2}):(\d{2})"
+    rb".*?X\s*=\s*([-\d.Ee+]+)\s+Y\s*=\s*([-\d.Ee+]+)\s+Z\s*=\s*([-\d.Ee+]+)"
+    rb".*?VX\s*=\s*([-\d.Ee+]+)\s+VY\s*=\s*([-\d.Ee+]+)\s+VZ\s*=\s*([-\d.Ee+]+)",
+    re.DOTALL,
+)
+_MONTHS = {b"Jan": 1, b"Feb": 2, b"Mar": 3, b"Apr": 4, b"May": 5, b"Jun": 6,
+           b"Jul": 7, b"Aug": 8, b"Sep": 9, b"Oct": 10, b"Nov": 11, b"Dec": 12}
+
+_SQL_ALIGNED_POSITIONS = """
+SELECT s.epoch_utc,
+       s.position_x AS sx, s.position_y AS sy, s.position_z AS sz,
+       t.position_x AS tx, t.position_y AS ty, t.position_z AS tz,
+       o.position_x AS ox, o.position_y AS oy, o.position_z AS oz
+FROM ephemeris_samples s
+JOIN ephemeris_samples t ON t.epoch_utc = s.epoch_utc AND t.tenant_id = s.tenant_id AND t.body_id = ?
+JOIN ephemeris_samples o ON o.epoch_utc = s.epoch_utc AND o.tenant_id = s.tenant_id AND o.body_id = ?
+WHERE s.body_id = ? AND s.tenant_id = ?
+ORDER BY s.epoch_utc
+"""
 
 
 @dataclass
@@ -23,63 +55,70 @@ class IngestionResult:
 
 
 def _file_checksum(path: Path, algorithm: str = "sha256") -> str:
-    h = hashlib.new(algorithm)
     with open(path, "rb") as f:
-        for chunk in iter(lambda: f.read(65536), b""):
-            h.update(chunk)
-    return h.hexdigest()
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+: reads into a reused buffer, no per-chunk bytes
+            return hashlib.file_digest(f, algorithm).hexdigest()
+        h = hashlib.new(algorithm)
+        buf = memoryview(bytearray(_CHECKSUM_BUF_BYTES))
+        while n := f.readinto(buf):
+            h.update(buf[:n])
+        return h.hexdigest()
+
 
+@dataclass
+class HorizonsSamples:
+    """
+    Parsed Horizons state vectors as columns (structure of arrays): one epoch string per sample and
+    a flat float64 array of six values per sample (x, y, z, vx, vy, vz), all for one body.
+    """
 
-def _parse_horizons_vectors(path: Path, body_id: str = "earth") -> list[dict[str, Any]]:
+    body_id: str
+    epochs: list[str] = field(default_factory=list)
+    vectors: array = field(default_factory=lambda: array("d"))
+
+    def __len__(self) -> int:
+        return len(self.epochs)
+
+    def column(self, k: int) -> array:
+        """Component k (0-2 position, 3-5 velocity) across all samples."""
+        return self.vectors[k::6]
+
+
+def _parse_horizons_vectors(path: Path, body_id: str = "earth") -> HorizonsSamples:
     """Parse JPL Horizons $$SOE ... $$EOE vector blocks."""
-    text = path.read_text(encoding="utf-8", errors="replace")
-    samples = []
-    soe_blocks = re.findall(r"\$\$SOE\s+(.*?)\s+\$\$EOE", text, re.DOTALL | re.IGNORECASE)
-    for block in soe_blocks:
-        epoch_match = re.search(
-            r"(\d+\.?\d*)\s*=\s*(A\.D\.\s+\d{4}-\w{3}-\d{1,2}\s+\d{2}:\d{2}:\d{2}[^\s]*)",
-            block,
-        )
-        pos_match = re.search(
-            r"X\s*=\s*([-\d.Ee+]+)\s+Y\s*=\s*([-\d.Ee+]+)\s+Z\s*=\s*([-\d.Ee+]+)",
-            block,
-        )
-        vel_match = re.search(
-            r"VX\s*=\s*([-\d.Ee+]+)\s+VY\s*=\s*([-\d.Ee+]+)\s+VZ\s*=\s*([-\d.Ee+]+)",
-            block,
-        )
-        if epoch_match and pos_match and vel_match:
-            months = {"Jan": 1, "Feb": 2, "Mar": 3, "Apr": 4, "May": 5, "Jun": 6,
-                      "Jul": 7, "Aug": 8, "Sep": 9, "Oct": 10, "Nov": 11, "Dec": 12}
-            epoch_str = epoch_match.group(2).strip()
-            m = re.search(r"A\.D\.\s+(\d{4})-(\w{3})-(\d{1,2})\s+(\d{2}):(\d{2}):(\d{2})", epoch_str)
-            if m:
-                y, mon_str, d, hh, mm, ss = m.groups()
-                mon = months.get(mon_str, 1)
-                from datetime import datetime, timezone
-                dt = datetime(int(y), mon, int(d), int(hh), int(mm), int(ss), tzinfo=timezone.utc)
-                epoch_utc = dt.strftime("%Y-%m-%dT%H:%M:%S")
-            else:
-                epoch_utc = epoch_str
-            samples.append({
-                "body_id": body_id,
-                "epoch_utc": epoch_utc,
-                "position_x": float(pos_match.group(1)),
-                "position_y": float(pos_match.group(2)),
-                "position_z": float(pos_match.group(3)),
-                "velocity_x": float(vel_match.group(1)),
-                "velocity_y": float(vel_match.group(2)),
-                "velocity_z": float(vel_match.group(3)),
-            })
+    size = path.stat().st_size
+    if _horizons_fast.AVAILABLE and size >= _horizons_fast.MIN_FAST_PATH_BYTES:
+        epochs, vecs = _horizons_fast.parse_horizons_vectors(path)
+        return HorizonsSamples(body_id, epochs, array("d", vecs.tobytes()))
+    samples = HorizonsSamples(body_id)
+    if size == 0:
+        return samples
+    epochs, vectors = samples.epochs, samples.vectors
+    # Locate $$SOE/$$EOE with plain find() on the mapped bytes; the record search is bounded to the
+    # block with pos/endpos so an incomplete block can't borrow fields from the next one.
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        pos = 0
+        while (lo := mm.find(b"$$SOE", pos)) >= 0:
+            hi = mm.find(b"$$EOE", lo + 5)
+            if hi < 0:
+                break
+            pos = hi + 5
+            record = _RECORD_RE.search(mm, lo + 5, hi)
+            if record is None:
+                continue
+            y, mon_str, d, hh, mm_, ss = record.group(1, 2, 3, 4, 5, 6)
+            # Format the UTC epoch straight from the matched digits; no datetime per sample.
+            epochs.append((b"%s-%02d-%02dT%s:%s:%s" % (y, _MONTHS.get(mon_str, 1), int(d), hh, mm_, ss)).decode())
+            vectors.extend(map(float, record.group(7, 8, 9, 10, 11, 12)))
     return samples
 
 
-def _infer_coverage_from_samples(samples: list[dict]) -> tuple[str | None, str | None]:
+def _infer_coverage_from_samples(samples: HorizonsSamples) -> tuple[str | None, str | None]:
     """Infer valid_from/valid_to from sample epochs."""
     if not samples:
         return None, None
-    epochs = sorted(s["epoch_utc"] for s in samples)
-    return epochs[0], epochs[-1]
+    # ISO-8601 strings of one fixed width order chronologically.
+    return min(samples.epochs), max(samples.epochs)
 
 
 class NasaIngestionRunner:
@@ -119,25 +158,25 @@ class NasaIngestionRunner:
 
     def validate_checksum(self, file_id: int) -> bool:
         """Verify stored checksum matches file on disk."""
-        row = self.db.nasa_file_get(file_id, self.tenant_id)
-        if not row or not row.get("local_path"):
+        row = self.db.nasa_file_get(file_id, self.tenant_id, as_row=True)
+        if not row or not row["local_path"]:
             return False
         path = Path(row["local_path"])
         if not path.is_file():
             return False
-        stored = row.get("checksum") or ""
+        stored = row["checksum"] or ""
         computed = _file_checksum(path)
         return stored == computed
 
     def validate_coverage(self, file_id: int) -> dict[str, Any]:
         """Return coverage info. For horizons, parses file. For binary kernels, returns registry values."""
-        row = self.db.nasa_file_get(file_id, self.tenant_id)
+        row = self.db.nasa_file_get(file_id, self.tenant_id, as_row=True)
         if not row:
             return {"valid": False, "error": "file not found"}
-        path = Path(row.get("local_path", ""))
+        path = Path(row["local_path"] or "")
         if not path.is_file():
             return {"valid": False, "error": "file not on disk"}
-        ft = row.get("file_type", "")
+        ft = row["file_type"]
         if ft == "horizons":
             try:
                 samples = _parse_horizons_vectors(path)
@@ -145,15 +184,15 @@ class NasaIngestionRunner:
                 return {
                     "valid": True,
                     "sample_count": len(samples),
-                    "valid_from": valid_from or row.get("valid_from"),
-                    "valid_to": valid_to or row.get("valid_to"),
+                    "valid_from": valid_from or row["valid_from"],
+                    "valid_to": valid_to or row["valid_to"],
                 }
             except Exception as e:
                 return {"valid": False, "error": str(e)}
         return {
             "valid": True,
-            "valid_from": row.get("valid_from"),
-            "valid_to": row.get("valid_to"),
+            "valid_from": row["valid_from"],
+            "valid_to": row["valid_to"],
         }
 
     def run_ingestion_job(self, job_id: int, body_id: str = "earth") -> IngestionResult:
@@ -162,20 +201,20 @@ class NasaIngestionRunner:
         Updates job status via ingestion_job_start/complete/fail.
         """
         if not self.db.ingestion_job_start(job_id, self.tenant_id):
-            job = self.db.ingestion_job_get(job_id, self.tenant_id)
-            status = job.get("status", "unknown") if job else "not_found"
+            job = self.db.ingestion_job_get(job_id, self.tenant_id, as_row=True)
+            status = job["status"] if job else "not_found"
             return IngestionResult(job_id=job_id, status=status, samples_inserted=0, error_text="Job not startable")
-        job = self.db.ingestion_job_get(job_id, self.tenant_id)
+        job = self.db.ingestion_job_get(job_id, self.tenant_id, as_row=True)
         if not job:
             self.db.ingestion_job_fail(job_id, "Job record not found", self.tenant_id)
             return IngestionResult(job_id=job_id, status="failed", samples_inserted=0, error_text="Job record not found")
-        payload = job.get("payload_json")
+        payload = job["payload_json"]
         if isinstance(payload, str):
             try:
                 payload = json.loads(payload) if payload else {}
             except json.JSONDecodeError:
                 payload = {}
-        source = (payload.get("source") or job.get("source") or "").strip()
+        source = (payload.get("source") or job["source"] or "").strip()
         file_id = payload.get("file_id")
         bid = (payload.get("body_id") or body_id).strip() or "earth"
         if not source:
@@ -197,28 +236,69 @@ class NasaIngestionRunner:
                     if r.get("local_path") == str(path.resolve()):
                         source_file_id = r["id"]
                         break
-            count = 0
-            for s in samples:
-                self.db.ephemeris_sample_insert(
-                    body_id=s["body_id"],
-                    epoch_utc=s["epoch_utc"],
-                    position_x=s["position_x"],
-                    position_y=s["position_y"],
-                    position_z=s["position_z"],
-                    velocity_x=s.get("velocity_x"),
-                    velocity_y=s.get("velocity_y"),
-                    velocity_z=s.get("velocity_z"),
-                    frame_id="J2000",
-                    source_file_id=source_file_id,
+            # Samples and job completion commit together.
+            with self.db.bulk_load():
+                count = self.db.ephemeris_sample_insert_many(
+                    zip(
+                        repeat(samples.body_id),
+                        samples.epochs,
+                        *(samples.column(k) for k in range(6)),
+                        repeat("J2000"),
+                        repeat(source_file_id),
+                    ),
                     tenant_id=self.tenant_id,
                 )
-                count += 1
-            valid_from, valid_to = _infer_coverage_from_samples(samples)
-            if source_file_id and (valid_from or valid_to):
-                # Update registry coverage if we have it
-                pass  # continuum_db doesn't have nasa_file_update; skip for now
-            self.db.ingestion_job_complete(job_id, self.tenant_id)
+                self.db.ingestion_job_complete(job_id, self.tenant_id)
             return IngestionResult(job_id=job_id, status="completed", samples_inserted=count)
         except Exception as e:
             self.db.ingestion_job_fail(job_id, str(e), self.tenant_id)
             return IngestionResult(job_id=job_id, status="failed", samples_inserted=0, error_text=str(e))
+
+    def compute_occlusion_events(
+        self,
+        source_body_id: str,
+        target_body_id: str,
+        occluder_body_id: str,
+        position_unit_m: float = AU_M,
+    ) -> int:
+        """
+        Compute occlusion of source by occluder as seen from target for every epoch where all three
+        bodies have ephemeris samples; insert events with a non-zero ratio. Radii come from
+        astral_body_catalog.radius_m; positions are scaled by position_unit_m (Horizons default: AU).
+        Returns number of events inserted.
+        """
+        if _occlusion_kernels.np is None:
+            raise RuntimeError("numpy is not installed")
+        np = _occlusion_kernels.np
+        radii = {}
+        for bid in (source_body_id, occluder_body_id):
+            body = self.db.astral_body_get(bid, self.tenant_id, as_row=True)
+            if not body or not body["radius_m"]:
+                raise ValueError(f"No radius_m for body: {bid}")
+            radii[bid] = float(body["radius_m"]) / position_unit_m
+        tenant = _norm_tenant(self.tenant_id)
+        rows = self.db.execute_read(
+            _SQL_ALIGNED_POSITIONS, (target_body_id, occluder_body_id, source_body_id, tenant)
+        )
+        if not rows:
+            return 0
+        epochs = [r.pop("epoch_utc") for r in rows]
+        xyz = np.array([tuple(r.values()) for r in rows], dtype=np.float64)
+        ratios, kinds = _occlusion_kernels.occlusion_ratios(
+            xyz[:, 0:3], xyz[:, 3:6], xyz[:, 6:9], radii[source_body_id], radii[occluder_body_id]
+        )
+        hits = np.flatnonzero(kinds).tolist()
+        return self.db.occlusion_event_insert_many(
+            (
+                (
+                    epochs[i],
+                    source_body_id,
+                    target_body_id,
+                    occluder_body_id,
+                    float(ratios[i]),
+                    _occlusion_kernels.ECLIPSE_TYPES[int(kinds[i])],
+                )
+                for i in hits
+            ),
+            tenant_id=self.tenant_id,
+        )
@@ -11,6 +11,9 @@ from .cairn import write_cairn_sidecars
 from .loaders import load_model_from_config
 from .types import Bucket, ExtractedData, MinimizationContext, MinimizationResult, ScoredBucket, TokenizedData
 
+_WORD_RE = re.compile(r"[A-Za-z0-9_]+")
+_SFX_MARKER_RE = re.compile(r"\[audio effects\]|\bsfx\b|\bimpact\b|\bengine\b|\bwind\b")
+
 
 class DefaultExtractAdapter:
     def run(self, ctx: MinimizationContext) -> ExtractedData:
@@ -146,10 +149,10 @@ class DefaultThesaurusTokenizeAdapter:
     }
 
     def run(self, ctx: MinimizationContext, extracted: ExtractedData) -> TokenizedData:
-        words = re.findall(r"[A-Za-z0-9_]+", extracted.script_text.lower())
+        words = _WORD_RE.findall(extracted.script_text.lower())
         normalized = [self._synonyms.get(w, w) for w in words]
         style_text = str(extracted.metadata.get("video_style_description", "")).lower()
-        style_words = re.findall(r"[A-Za-z0-9_]+", style_text)
+        style_words = _WORD_RE.findall(style_text)
         style_set = set(style_words)
         counts = Counter(normalized)
         total = max(1, sum(counts.values()))
@@ -180,7 +183,7 @@ class DefaultThesaurusTokenizeAdapter:
 class CairnAlignedTokenizeAdapter(DefaultThesaurusTokenizeAdapter):
     def run(self, ctx: MinimizationContext, extracted: ExtractedData) -> TokenizedData:
         tok = super().run(ctx, extracted)
-        words = re.findall(r"[A-Za-z0-9_]+", extracted.script_text.lower())
+        words = _WORD_RE.findall(extracted.script_text.lower())
         stones = extracted.metadata.get("cairn_stones", []) or []
         # Lightweight temporal alignment: map token spans proportionally onto stone indices.
         aligned: list[dict[str, Any]] = []
@@ -192,7 +195,7 @@ class CairnAlignedTokenizeAdapter(DefaultThesaurusTokenizeAdapter):
                 s1 = min(len(stones), s0 + span)
                 aligned.append({"token": w, "stone_start": s0, "stone_end": s1})
         tok.metadata["whisper_cairn_alignment"] = aligned
-        sfx_markers = re.findall(r"\[audio effects\]|\bsfx\b|\bimpact\b|\bengine\b|\bwind\b", extracted.script_text.lower())
+        sfx_markers = _SFX_MARKER_RE.findall(extracted.script_text.lower())
         tok.metadata["sfx_caption_density"] = float(len(sfx_markers)) / max(1, len(words))
         unique_words = len(set(words))
         tok.metadata["sfx_caption_novelty"] = float(unique_words) / max(1, len(words))
@@ -1,4 +1,19 @@
-from .unique_chunk_store import add_unique_chunk, get_pending_kernels
-from .unique_kernel_store import record_kernel, get_kernels_for_research
+from .unique_chunk_store import add_unique_chunk, get_pending_kernels, iter_pending_kernels
+from .unique_kernel_store import (
+    UniqueKernelInserter,
+    get_kernels_for_research,
+    iter_kernels_for_research,
+    promote_to_research,
+    record_kernel,
+)
 
-__all__ = ["add_unique_chunk", "get_pending_kernels", "record_kernel", "get_kernels_for_research"]
+__all__ = [
+    "add_unique_chunk",
+    "get_pending_kernels",
+    "iter_pending_kernels",
+    "record_kernel",
+    "get_kernels_for_research",
+    "iter_kernels_for_research",
+    "promote_to_research",
+    "UniqueKernelInserter",
+]
@@ -1,26 +1,42 @@
 """Feed unique chunks to AI/ML pipelines for compressor improvement."""
 
+import hashlib
+import json
 from pathlib import Path
-from typing import Callable
+from typing import Any, Callable, Iterator
 
 from unified_semantic_archiver.db import ContinuumDb
 from .unique_kernel_store import get_kernels_for_research
 
 
+def iter_improvement_context(db: ContinuumDb, limit: int = 20) -> Iterator[tuple[str, Iterator[dict[str, Any]]]]:
+    """
+    The improvement context one section at a time, as (name, rows) in the order unique_kernels,
+    chunks_with_kernels, recent_runs, so writers can emit each row without holding the whole dict.
+    """
+    kernels = get_kernels_for_research(db, status="flagged_research", limit=limit)
+    yield "unique_kernels", iter(kernels)
+    by_id = db.semantic_chunk_get_many({k["chunk_id"] for k in kernels if k.get("chunk_id")})
+    yield "chunks_with_kernels", (
+        {"kernel": k, "chunk": by_id[k["chunk_id"]]} for k in kernels if k.get("chunk_id") in by_id
+    )
+    yield "recent_runs", iter(db.compression_run_list(limit=10))
+
+
+def improvement_context_digest(db: ContinuumDb, limit: int = 20) -> str:
+    """
+    blake2b over every row iter_improvement_context(db, limit) would emit, so it changes exactly
+    when the context would. Runs the context's reads but skips serializing and writing the file.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for name, rows in iter_improvement_context(db, limit):
+        h.update(name.encode("utf-8"))
+        for row in rows:
+            h.update(json.dumps(row, sort_keys=True, default=str).encode("utf-8"))
+    return h.hexdigest()
+
+
 def build_improvement_context(db_path: Path, limit: int = 20) -> dict:
     """Build context dict for Cursor or improvement pipeline."""
-    db = ContinuumDb(db_path)
-    kernels = get_kernels_for_research(db, status="flagged_research", limit=limit)
-    chunks = []
-    for k in kernels:
-        chunk_id = k.get("chunk_id")
-        if chunk_id:
-            rows = db.execute_read("SELECT * FROM semantic_chunks WHERE id = ?", (chunk_id,))
-            if rows:
-                chunks.append({"kernel": k, "chunk": rows[0]})
-    runs = db.compression_run_list(limit=10)
-    return {
-        "unique_kernels": kernels,
-        "chunks_with_kernels": chunks,
-        "recent_runs": runs,
-    }
+    with ContinuumDb(db_path, read_only=True) as db:
+        return {name: list(rows) for name, rows in iter_improvement_context(db, limit)}
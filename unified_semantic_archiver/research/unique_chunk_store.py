@@ -1,14 +1,28 @@
 """Persist chunks that resist compression; feed to research/improvement loop."""
 
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Iterator
 
 if TYPE_CHECKING:
     from unified_semantic_archiver.db import ContinuumDb
 
+    from .unique_kernel_store import UniqueKernelInserter
 
-def add_unique_chunk(db: "ContinuumDb", chunk_id: int, source_compressor: str, residual_metric: float = 1.0) -> int:
-    """Record a chunk that resisted compression; returns unique_kernel id."""
+
+def add_unique_chunk(
+    db: "ContinuumDb",
+    chunk_id: int,
+    source_compressor: str,
+    residual_metric: float = 1.0,
+    inserter: "UniqueKernelInserter | None" = None,
+) -> int | None:
+    """
+    Record a chunk that resisted compression; returns unique_kernel id. With an inserter the row is
+    buffered for its next flush and None is returned instead.
+    """
+    if inserter is not None:
+        inserter.add(chunk_id, source_compressor, residual_metric, 0, "pending")
+        return None
     return db.unique_kernel_insert(
         chunk_id=chunk_id,
         source_compressor=source_compressor,
@@ -20,3 +34,8 @@ def add_unique_chunk(db: "ContinuumDb", chunk_id: int, source_compressor: str, r
 def get_pending_kernels(db: "ContinuumDb", limit: int = 100) -> list:
     """Get pending unique kernels for data compressor or research feed."""
     return db.unique_kernel_list(status="pending", limit=limit)
+
+
+def iter_pending_kernels(db: "ContinuumDb", chunk_size: int = 100) -> Iterator[list]:
+    """All pending unique kernels, newest first, in batches of chunk_size fetched on demand."""
+    yield from db.unique_kernel_iter(status="pending", chunk_size=chunk_size)
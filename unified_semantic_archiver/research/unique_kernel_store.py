@@ -1,13 +1,68 @@
 """High-value incompressible chunks; feed to Cursor call service and improvement loop."""
 
-from typing import TYPE_CHECKING
+import threading
+from typing import TYPE_CHECKING, Any, Iterable, Iterator
 
 if TYPE_CHECKING:
     from unified_semantic_archiver.db import ContinuumDb
 
 
-def record_kernel(db: "ContinuumDb", chunk_id: int, source: str, residual: float, status: str = "flagged_research") -> int:
-    """Record a kernel that remains incompressible after multiple attempts."""
+class UniqueKernelInserter:
+    """
+    Buffer unique_kernel rows and write them with one executemany per batch_size rows instead of a
+    committed insert each. Use as a context manager (flushes on exit) or call flush() yourself;
+    rows still buffered when the inserter is dropped are lost. Safe to share between threads.
+    """
+
+    def __init__(self, db: "ContinuumDb", batch_size: int = 500):
+        self.db = db
+        self.batch_size = batch_size
+        self._rows: list[tuple[Any, ...]] = []
+        self._lock = threading.Lock()
+
+    def add(
+        self,
+        chunk_id: int,
+        source_compressor: str,
+        residual_metric: float | None = None,
+        attempt_count: int = 0,
+        status: str = "pending",
+    ) -> None:
+        with self._lock:
+            self._rows.append((chunk_id, source_compressor, residual_metric, attempt_count, status))
+            if len(self._rows) < self.batch_size:
+                return
+            rows, self._rows = self._rows, []
+        self.db.unique_kernel_insert_many(rows)
+
+    def flush(self) -> int:
+        """Write everything buffered so far; returns number of rows written."""
+        with self._lock:
+            rows, self._rows = self._rows, []
+        return self.db.unique_kernel_insert_many(rows) if rows else 0
+
+    def __enter__(self) -> "UniqueKernelInserter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.flush()
+
+
+def record_kernel(
+    db: "ContinuumDb",
+    chunk_id: int,
+    source: str,
+    residual: float,
+    status: str = "flagged_research",
+    inserter: UniqueKernelInserter | None = None,
+) -> int | None:
+    """
+    Record a kernel that remains incompressible after multiple attempts. With an inserter the row
+    is buffered for its next flush and None is returned instead of the new id.
+    """
+    if inserter is not None:
+        inserter.add(chunk_id, source, residual, 0, status)
+        return None
     return db.unique_kernel_insert(
         chunk_id=chunk_id,
         source_compressor=source,
@@ -17,6 +72,18 @@ def record_kernel(db: "ContinuumDb", chunk_id: int, source: str, residual: float
     )
 
 
+def promote_to_research(db: "ContinuumDb", kernel_ids: Iterable[int]) -> int:
+    """Flag kernels for research (Cursor, improvement feed) in one transaction; returns rows updated."""
+    return db.unique_kernel_set_status(kernel_ids, "flagged_research")
+
+
 def get_kernels_for_research(db: "ContinuumDb", status: str = "flagged_research", limit: int = 50) -> list:
     """Get kernels flagged for research (Cursor, improvement feed)."""
     return db.unique_kernel_list(status=status, limit=limit)
+
+
+def iter_kernels_for_research(
+    db: "ContinuumDb", status: str = "flagged_research", chunk_size: int = 100
+) -> Iterator[list]:
+    """All kernels with the given status, newest first, in batches of chunk_size fetched on demand."""
+    yield from db.unique_kernel_iter(status=status, chunk_size=chunk_size)
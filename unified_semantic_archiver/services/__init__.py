@@ -1,3 +1,15 @@
-from .cursor_call_service import build_context, persist_suggestion, invoke_cursor_workflow
+from .cursor_call_service import (
+    build_context,
+    invoke_cursor_workflow,
+    invoke_cursor_workflow_async,
+    persist_suggestion,
+    persist_suggestions,
+)
 
-__all__ = ["build_context", "persist_suggestion", "invoke_cursor_workflow"]
+__all__ = [
+    "build_context",
+    "persist_suggestion",
+    "persist_suggestions",
+    "invoke_cursor_workflow",
+    "invoke_cursor_workflow_async",
+]
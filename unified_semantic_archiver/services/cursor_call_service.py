@@ -5,27 +5,162 @@ Persists suggestions to research_suggestions table.
 
 from __future__ import annotations
 
+import contextlib
 import json
 import logging
+import os
+import shlex
+import shutil
 import subprocess
-import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Callable
+from typing import IO, Any, Callable, Iterable, Iterator, Sequence
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - exercised only without zstandard
+    zstandard = None  # type: ignore[assignment]
+
+from unified_semantic_archiver.db import ContinuumDb, shared_db
+from unified_semantic_archiver.research.improvement_feed import (
+    improvement_context_digest,
+    iter_improvement_context,
+)
 
 log = logging.getLogger("unified_semantic_archiver.cursor_call_service")
 
+# (db path, context path, compressed) -> (db fingerprint, context file stat, section counts) for the
+# last few contexts written, so an unchanged database reuses the file instead of being re-read.
+_CONTEXT_CACHE_SIZE = 4
+_context_cache: dict[tuple[str, str, bool], tuple[tuple, tuple[int, int], dict[str, int]]] = {}
+_context_cache_lock = threading.Lock()
+# Write buffer for the context file: rows are small, so syscalls go out in 64 KiB blocks.
+_CONTEXT_WRITE_BUFFER = 1 << 16
+
+
+def _stat_key(path: str) -> tuple[int, int] | None:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _db_fingerprint(db_path: Path) -> tuple:
+    """
+    Changes whenever the database content can have: WAL-mode commits land in the -wal file and only
+    reach the main file at checkpoints, so both are stat'ed.
+    """
+    p = str(db_path)
+    return _stat_key(p), _stat_key(p + "-wal")
+
+
+def _clear_context_cache() -> None:
+    with _context_cache_lock:
+        _context_cache.clear()
+
+
+# Process umask, read once at import (os.umask can only be read by setting it).
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+# Output directories already created this process, so repeat builds skip the mkdir; oldest dropped first.
+_ENSURED_DIRS_SIZE = 128
+_ensured_dirs: dict[Path, None] = {}
+_ensured_dirs_lock = threading.Lock()
+
+# Runs invoke_cursor_workflow_async calls; created on first use.
+_workflow_executor: ThreadPoolExecutor | None = None
+_workflow_executor_lock = threading.Lock()
+
+# How long invoke_cursor_workflow waits for a Cursor command to read its stdin and exit.
+_CURSOR_TIMEOUT_S = 300.0
+
+
+def _start_cursor(command: Sequence[str] | None) -> subprocess.Popen | None:
+    """Spawn the configured Cursor command with a stdin pipe, or None when unset or not on PATH."""
+    if not command:
+        return None
+    exe = shutil.which(command[0])
+    if exe is None:
+        log.warning("Cursor command %r not found on PATH; skipping invocation", command[0])
+        return None
+    return subprocess.Popen([exe, *command[1:]], stdin=subprocess.PIPE, stdout=subprocess.DEVNULL)
+
+
+def _feed_cursor(proc: subprocess.Popen, out_path: Path, compressed: bool) -> threading.Thread:
+    """
+    Copy the context file to proc's stdin as plain JSON, then close it, on a daemon thread: a command
+    that never drains its stdin then stalls only that thread, and _finish_cursor's timeout still runs.
+    """
+
+    def feed() -> None:
+        try:
+            with _open_context(out_path, compressed) as f:
+                shutil.copyfileobj(f, proc.stdin)
+        except OSError:
+            log.warning("Cursor command closed its stdin early; context file is still complete")
+        finally:
+            with contextlib.suppress(OSError):
+                proc.stdin.close()
+
+    t = threading.Thread(target=feed, name="cursor-stdin", daemon=True)
+    t.start()
+    return t
+
 
 def build_context(db_path: Path) -> dict:
     """Build research context for Cursor (unique kernels, runs, chunks)."""
-    from unified_semantic_archiver.research.improvement_feed import build_improvement_context
-    return build_improvement_context(Path(db_path))
+    db = shared_db(db_path, read_only=True)
+    return {name: list(rows) for name, rows in iter_improvement_context(db)}
+
+
+def _dumps_row(row: dict[str, Any]) -> bytes:
+    """One compact JSON record as UTF-8 (orjson when installed)."""
+    if orjson is not None:
+        return orjson.dumps(row)
+    return json.dumps(row, separators=(",", ":")).encode("utf-8")
+
+
+def _write_context(
+    f: IO[bytes],
+    sections: Iterable[tuple[str, Iterator[dict[str, Any]]]],
+    on_section: Callable[[int, str, int], None] | None = None,
+) -> dict[str, int]:
+    """
+    Stream the context as one JSON object, one compact record per line, serializing each row as the
+    section iterators produce it. Returns the row count per section; on_section(index, name, count)
+    runs as each section closes.
+    """
+    counts: dict[str, int] = {}
+    f.write(b"{")
+    for i, (name, rows) in enumerate(sections):
+        f.write(b"%s\n%s: [" % (b"," if i else b"", json.dumps(name).encode("utf-8")))
+        n = 0
+        for row in rows:
+            f.write(b",\n" if n else b"\n")
+            f.write(_dumps_row(row))
+            n += 1
+        f.write(b"\n]" if n else b"]")
+        counts[name] = n
+        if on_section is not None:
+            on_section(i, name, n)
+    f.write(b"\n}\n")
+    return counts
 
 
 def persist_suggestion(db_path: Path, source: str, recommendation_text: str, context_json: str | None = None) -> int:
     """Persist a suggestion from Cursor or manual input to research_suggestions."""
-    from unified_semantic_archiver.db import ContinuumDb
-    db = ContinuumDb(db_path)
-    return db.research_suggestion_insert(
+    _clear_context_cache()
+    return shared_db(db_path).research_suggestion_insert(
         source=source,
         recommendation_text=recommendation_text,
         context_json=context_json,
@@ -33,30 +168,245 @@ def persist_suggestion(db_path: Path, source: str, recommendation_text: str, con
     )
 
 
+def persist_suggestions(db_path: Path, rows: Iterable[tuple[str, str, str | None]]) -> int:
+    """
+    Persist a batch of (source, recommendation_text, context_json) suggestions as pending, in one
+    transaction on one connection. Returns number of rows inserted.
+    """
+    _clear_context_cache()
+    return shared_db(db_path).research_suggestion_insert_many(
+        (source, text, context_json, "pending") for source, text, context_json in rows
+    )
+
+
+def _build_context_file(
+    db: ContinuumDb,
+    out_path: Path,
+    cb: Callable[[str, float, str], None],
+    compress: bool = False,
+) -> dict[str, int]:
+    """Write the improvement context to out_path (zstd-compressed if compress); returns the section counts."""
+    cb("build", 0.2, "Building research context…")
+    # Rows go to the file as they are read rather than via one in-memory dict and json.dump. They go
+    # to a temp file renamed over out_path at the end, so readers never see a half-written context.
+    tmp = _temp_file_for(out_path, buffering=_CONTEXT_WRITE_BUFFER)
+    try:
+        with tmp as raw, _context_writer(raw, compress) as f:
+
+            def on_section(i: int, name: str, n: int) -> None:
+                # Flush so the progress reported matches what the file has received.
+                f.flush()
+                cb("context", 0.2 + 0.1 * (i + 1), f"Wrote {n} {name}")
+
+            counts = _write_context(f, iter_improvement_context(db), on_section)
+        os.replace(tmp.name, out_path)
+    except BaseException:
+        os.unlink(tmp.name)
+        raise
+    cb("context", 0.5, f"Context written to {out_path}")
+    return counts
+
+
+def _temp_file_for(path: Path, buffering: int = -1) -> IO[bytes]:
+    """
+    A NamedTemporaryFile (delete=False) beside path, to be os.replace()d over it. The directory is
+    created the first time it is seen and only re-created if it has since been removed. The file gets
+    the 0666-under-umask mode a plain open() would, not NamedTemporaryFile's 0600.
+    """
+    d = path.parent
+    with _ensured_dirs_lock:
+        known = d in _ensured_dirs
+    if not known:
+        d.mkdir(parents=True, exist_ok=True)
+        with _ensured_dirs_lock:
+            _ensured_dirs[d] = None
+            while len(_ensured_dirs) > _ENSURED_DIRS_SIZE:
+                del _ensured_dirs[next(iter(_ensured_dirs))]
+    try:
+        f = tempfile.NamedTemporaryFile(
+            "wb", buffering=buffering, dir=d, prefix=path.name, suffix=".tmp", delete=False
+        )
+    except FileNotFoundError:
+        d.mkdir(parents=True, exist_ok=True)
+        f = tempfile.NamedTemporaryFile(
+            "wb", buffering=buffering, dir=d, prefix=path.name, suffix=".tmp", delete=False
+        )
+    os.chmod(f.name, 0o666 & ~_UMASK)
+    return f
+
+
+def _context_writer(raw: IO[bytes], compress: bool) -> contextlib.AbstractContextManager[IO[bytes]]:
+    """raw itself, or with compress a zstd level-1 stream over it (closed with the frame end)."""
+    if compress:
+        return zstandard.ZstdCompressor(level=1).stream_writer(raw)
+    return contextlib.nullcontext(raw)
+
+
+def _open_context(out_path: Path, compressed: bool) -> contextlib.AbstractContextManager[IO[bytes]]:
+    """A context file opened for reading as plain JSON bytes, decompressing a compressed one."""
+    f = open(out_path, "rb")
+    if compressed:
+        return zstandard.ZstdDecompressor().stream_reader(f, closefd=True)
+    return f
+
+
+def _digest_path(out_path: Path) -> Path:
+    return out_path.with_name(out_path.name + ".digest")
+
+
+def _read_digest_sidecar(out_path: Path, digest: str, compressed: bool) -> dict[str, int] | None:
+    """
+    Section counts recorded with out_path, if it was built from this digest, compressed the same way
+    and is unmodified.
+    """
+    try:
+        with open(_digest_path(out_path), "rb") as f:
+            saved = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if (
+        saved.get("digest") != digest
+        or saved.get("compressed", False) != compressed
+        or saved.get("context") != list(_stat_key(str(out_path)) or ())
+    ):
+        return None
+    return saved.get("counts")
+
+
+def _write_digest_sidecar(out_path: Path, digest: str, compressed: bool, counts: dict[str, int]) -> None:
+    path = _digest_path(out_path)
+    # Unique temp name: concurrent workflows (invoke_cursor_workflow_async) may write the same sidecar.
+    saved = {
+        "digest": digest,
+        "compressed": compressed,
+        "context": list(_stat_key(str(out_path))),
+        "counts": counts,
+    }
+    with _temp_file_for(path) as f:
+        f.write(json.dumps(saved).encode("utf-8"))
+    os.replace(f.name, path)
+
+
 def invoke_cursor_workflow(
     db_path: Path,
     *,
     context_output_path: Path | None = None,
     progress_callback: Callable[[str, float, str], None] | None = None,
+    cursor_command: Sequence[str] | None = None,
 ) -> dict:
     """
     Package context, optionally invoke Cursor.
-    Writes context to JSON file; if cursor CLI available, can trigger agent.
-    Returns dict with context_path, suggestion_count.
+    Writes context to JSON file. When cursor_command (default: USC_CURSOR_COMMAND, shell-split) names
+    an executable on PATH, it is started first and fed the same JSON on stdin once the file is written;
+    it has _CURSOR_TIMEOUT_S from then to read it and exit before it is killed.
+    With USC_CURSOR_CONTEXT_COMPRESS=1 (and zstandard installed) the file is zstd level-1 compressed
+    and gets a .zst suffix; readers need `zstd -d` or zstandard. Cursor's stdin still gets plain JSON.
+    Returns dict with context_path (the file written), kernel_count, cursor_returncode (None when not invoked).
     """
     cb = progress_callback or (lambda _p, _v, _m: None)
-    cb("build", 0.2, "Building research context…")
-    ctx = build_context(db_path)
+
+    if cursor_command is None and os.environ.get("USC_CURSOR_COMMAND"):
+        cursor_command = shlex.split(os.environ["USC_CURSOR_COMMAND"])
     out_path = context_output_path or Path(db_path).parent / "cursor_research_context.json"
     out_path = Path(out_path)
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(out_path, "w", encoding="utf-8") as f:
-        json.dump(ctx, f, indent=2)
-    cb("context", 0.5, f"Context written to {out_path}")
+    # Decided here only: a caller-supplied .zst path doesn't turn compression on by itself.
+    compress = os.environ.get("USC_CURSOR_CONTEXT_COMPRESS") == "1"
+    if compress and zstandard is None:
+        log.warning("USC_CURSOR_CONTEXT_COMPRESS is set but zstandard is not installed; writing plain JSON")
+        compress = False
+    if compress and out_path.suffix != ".zst":
+        out_path = out_path.with_name(out_path.name + ".zst")
+    key = (str(Path(db_path).resolve()), str(out_path.resolve()), compress)
+    with _context_cache_lock:
+        cached = _context_cache.get(key)
+    # Spawn before serializing so process start-up overlaps the context write.
+    proc = _start_cursor(cursor_command)
+    feeder = None
+    try:
+        reused = bool(
+            cached and cached[0] == _db_fingerprint(db_path) and cached[1] == _stat_key(str(out_path))
+        )
+        if reused:
+            counts = cached[2]
+            cb("cache", 0.5, f"Database unchanged; reusing context at {out_path}")
+        else:
+            db = shared_db(db_path, read_only=True)
+            # The sidecar outlives this process, so e.g. a scheduled run skips the rebuild too
+            # when nothing the context reads has changed since the last one.
+            digest = improvement_context_digest(db)
+            counts = _read_digest_sidecar(out_path, digest, compress)
+            reused = counts is not None
+            if reused:
+                cb("cache", 0.5, f"No new research data; reusing context at {out_path}")
+            else:
+                counts = _build_context_file(db, out_path, cb, compress)
+                _write_digest_sidecar(out_path, digest, compress, counts)
+            entry = (_db_fingerprint(db_path), _stat_key(str(out_path)), counts)
+            with _context_cache_lock:
+                _context_cache.pop(key, None)
+                _context_cache[key] = entry
+                while len(_context_cache) > _CONTEXT_CACHE_SIZE:
+                    del _context_cache[next(iter(_context_cache))]
+        if proc is not None:
+            feeder = _feed_cursor(proc, out_path, compress)
+    finally:
+        returncode = _finish_cursor(proc, feeder)
+
+    if proc is None:
+        # Cursor IDE may not expose CLI; document manual workflow
+        cb("cursor", 0.7, "Cursor not invoked: paste context into Cursor Rules or agent.")
+        log.info("Context saved to %s. To use Cursor: open this file, paste into Cursor Rules or agent, request algorithm/model improvements.", out_path)
+    else:
+        cb("cursor", 0.7, f"Cursor command exited with status {returncode}")
+
+    return {
+        "context_path": str(out_path),
+        "kernel_count": counts.get("unique_kernels", 0),
+        "cursor_returncode": returncode,
+    }
+
+
+def invoke_cursor_workflow_async(
+    db_path: Path,
+    *,
+    context_output_path: Path | None = None,
+    progress_callback: Callable[[str, float, str], None] | None = None,
+    cursor_command: Sequence[str] | None = None,
+) -> Future[dict]:
+    """
+    invoke_cursor_workflow on a background thread (at most two run at once); returns at once with a
+    Future for its result dict. progress_callback is called from that worker thread, so it must be
+    thread-safe (e.g. post to the UI's event loop rather than touching widgets directly).
+    """
+    global _workflow_executor
+    with _workflow_executor_lock:
+        if _workflow_executor is None:
+            _workflow_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="cursor-workflow")
+    return _workflow_executor.submit(
+        invoke_cursor_workflow,
+        db_path,
+        context_output_path=context_output_path,
+        progress_callback=progress_callback,
+        cursor_command=cursor_command,
+    )
 
-    # Stub: try to invoke cursor if available (cursor --agent or similar)
-    # Cursor IDE may not expose CLI; document manual workflow
-    cb("cursor", 0.7, "Cursor invocation (stub): paste context into Cursor Rules or agent.")
-    log.info("Context saved to %s. To use Cursor: open this file, paste into Cursor Rules or agent, request algorithm/model improvements.", out_path)
 
-    return {"context_path": str(out_path), "kernel_count": len(ctx.get("unique_kernels", []))}
+def _finish_cursor(proc: subprocess.Popen | None, feeder: threading.Thread | None) -> int | None:
+    """
+    Wait for the Cursor process to take its stdin (closing it here if feeder never started) and exit;
+    kill it after _CURSOR_TIMEOUT_S, which also unblocks a feeder stuck on a full pipe.
+    """
+    if proc is None:
+        return None
+    deadline = time.monotonic() + _CURSOR_TIMEOUT_S
+    if feeder is None:
+        with contextlib.suppress(OSError):
+            proc.stdin.close()
+    else:
+        feeder.join(_CURSOR_TIMEOUT_S)
+    try:
+        return proc.wait(timeout=max(0.0, deadline - time.monotonic()))
+    except subprocess.TimeoutExpired:
+        log.warning("Cursor command still running after %.0fs; killing it", _CURSOR_TIMEOUT_S)
+        proc.kill()
+        return proc.wait()